@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Compare the result encodings of the find module (result_encoding) on a large list of synthetic matches: the time to
+encode them on the target, the size of the JSON result, the time to parse it on the controller and the time to
+expand it with the expand_compact filter.
+
+The paths are generated in the order of a file system walk, i.e. grouped by directory, under a few shared prefixes.
+
+    python3 benchmarks/compact_results.py --paths 100000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+
+COLLECTION_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TOP = ['/var/lib/docker/overlay2', '/var/cache/app', '/srv/www/shop/releases', '/home/deploy/.cache']
+
+
+def import_compact():
+    path = tempfile.mkdtemp(prefix='compact-bench-')
+    os.makedirs(os.path.join(path, 'ansible_collections', 'adfinis'))
+    os.symlink(COLLECTION_ROOT, os.path.join(path, 'ansible_collections', 'adfinis', 'maintenance'))
+    sys.path.insert(0, path)
+    from ansible_collections.adfinis.maintenance.plugins.module_utils import compact
+    return compact
+
+
+def generate_paths(count, rng):
+    paths = []
+    while len(paths) < count:
+        directory = '{}/{:032x}/diff/usr/share/d{:03d}'.format(rng.choice(TOP), rng.getrandbits(128), rng.randrange(500))
+        for i in range(rng.randint(1, 200)):
+            paths.append('{}/file-{:05d}{}'.format(directory, i, rng.choice(['.log', '.dat', '.py', ''])))
+    return paths[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--paths', type=int, default=100000, help='number of synthetic paths')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the random generator')
+    opts = parser.parse_args()
+
+    compact = import_compact()
+    rng = random.Random(opts.seed)
+    paths = generate_paths(opts.paths, rng)
+
+    print('{} paths'.format(len(paths)))
+    print('{:<12} {:>10} {:>10} {:>10} {:>10}'.format('encoding', 'bytes', 'encode', 'parse', 'expand'))
+    baseline = None
+    for encoding in compact.ENCODINGS:
+        start = time.monotonic()
+        payload = json.dumps(dict(found=compact.encode(paths, encoding)))
+        encode_time = time.monotonic() - start
+
+        start = time.monotonic()
+        found = json.loads(payload)['found']
+        parse_time = time.monotonic() - start
+
+        start = time.monotonic()
+        expanded = compact.decode(found)
+        expand_time = time.monotonic() - start
+
+        if expanded != paths:
+            raise RuntimeError('{} does not round-trip'.format(encoding))
+        if baseline is None:
+            baseline = len(payload)
+        print('{:<12} {:>10} {:>9.3f}s {:>9.3f}s {:>9.3f}s  ({:.1f}x smaller)'.format(
+            encoding, len(payload), encode_time, parse_time, expand_time, baseline / len(payload)))
+
+
+if __name__ == '__main__':
+    main()
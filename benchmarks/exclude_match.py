@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Compare matching synthetic paths against an exclude list one regex at a time, as the find module used to, with the
+combined matcher of module_utils.exclude.
+
+The exclude list mixes plain path prefixes, like most entries of linux_allowed_large_files, with real regexes.  The
+number of directories whose subtree is pruned by the matcher is reported as well.
+
+    python3 benchmarks/exclude_match.py --paths 1000000 --patterns 200
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+
+COLLECTION_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TOP = ['var/lib', 'var/cache', 'var/log', 'srv', 'opt', 'home', 'usr/lib', 'boot']
+
+
+def import_matcher():
+    path = tempfile.mkdtemp(prefix='exclude-bench-')
+    os.makedirs(os.path.join(path, 'ansible_collections', 'adfinis'))
+    os.symlink(COLLECTION_ROOT, os.path.join(path, 'ansible_collections', 'adfinis', 'maintenance'))
+    sys.path.insert(0, path)
+    from ansible_collections.adfinis.maintenance.plugins.module_utils.exclude import ExcludeMatcher
+    return ExcludeMatcher
+
+
+def generate_paths(count, rng):
+    paths = []
+    for i in range(count):
+        depth = rng.randint(1, 4)
+        parts = [rng.choice(TOP)] + ['d{:03d}'.format(rng.randrange(500)) for _ in range(depth)]
+        paths.append('/{}/f{:07d}{}'.format('/'.join(parts), i, rng.choice(['.log', '.dat', '.db', ''])))
+    return paths
+
+
+def generate_patterns(count, rng):
+    """
+    Three out of four patterns are plain prefixes of files or directories, the others regexes.
+    """
+    patterns = []
+    for i in range(count):
+        directory = '/{}/d{:03d}'.format(rng.choice(TOP), rng.randrange(500))
+        kind = i % 4
+        if kind == 0:
+            patterns.append(directory + '/')
+        elif kind == 1:
+            patterns.append(directory + '/.*')
+        elif kind == 2:
+            patterns.append(directory + '/d{:03d}/f'.format(rng.randrange(500)))
+        else:
+            patterns.append(re.escape(directory) + r'/.*\.db$')
+    return patterns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--paths', type=int, default=1000000, help='number of synthetic paths')
+    parser.add_argument('--patterns', type=int, default=200, help='number of exclude patterns')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the random generator')
+    opts = parser.parse_args()
+
+    ExcludeMatcher = import_matcher()
+    rng = random.Random(opts.seed)
+    paths = generate_paths(opts.paths, rng)
+    patterns = generate_patterns(opts.patterns, rng)
+
+    start = time.monotonic()
+    compiled = [re.compile(p) for p in patterns]
+    looped = 0
+    for path in paths:
+        for regex in compiled:
+            if regex.match(path) is not None:
+                looped += 1
+                break
+    loop_time = time.monotonic() - start
+
+    start = time.monotonic()
+    matcher = ExcludeMatcher(patterns)
+    match = matcher.match
+    combined = 0
+    for path in paths:
+        if match(path) is not None:
+            combined += 1
+    combined_time = time.monotonic() - start
+
+    if looped != combined:
+        raise RuntimeError('results differ: {} vs {} excluded paths'.format(looped, combined))
+
+    directories = set(os.path.dirname(path) for path in paths)
+    pruned = sum(1 for directory in directories if matcher.prunes(directory))
+
+    print('{} paths, {} patterns, {} excluded'.format(len(paths), len(patterns), combined))
+    print('{:<10} {:>8.2f}s'.format('loop', loop_time))
+    print('{:<10} {:>8.2f}s  ({:.1f}x)'.format('combined', combined_time, loop_time / combined_time))
+    print('{} of {} directories pruned'.format(pruned, len(directories)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Compare the find and native engines of the adfinis.maintenance.find module on a generated file tree.
+
+Each engine runs the module in a separate Python process, so the reported peak RSS is that of the module alone.
+
+    python3 benchmarks/find_engines.py --files 1000000 --tree /var/tmp/find-bench
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+COLLECTION_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULE = os.path.join(COLLECTION_ROOT, 'plugins', 'modules', 'find.py')
+
+
+def generate_tree(root, files, per_dir=1000, fanout=32):
+    """
+    Create files empty files below root, spread over a tree with per_dir files per directory.  Every 10000th file is
+    made a large sparse file, so that size predicates have some matches.
+    """
+    marker = os.path.join(root, '.generated-{}'.format(files))
+    if os.path.exists(marker):
+        return
+    for i in range(0, files, per_dir):
+        n = i // per_dir
+        parts = []
+        while True:
+            parts.append('d{:02d}'.format(n % fanout))
+            n //= fanout
+            if n == 0:
+                break
+        directory = os.path.join(root, *parts)
+        os.makedirs(directory, exist_ok=True)
+        for j in range(i, min(i + per_dir, files)):
+            suffix = '.log' if j % 3 == 0 else '.dat'
+            with open(os.path.join(directory, 'f{:07d}{}'.format(j, suffix)), 'w') as f:
+                if j % 10000 == 0:
+                    f.truncate(32 * 1024 * 1024)
+    open(marker, 'w').close()
+
+
+def collection_path():
+    """
+    Make the repository importable as ansible_collections.adfinis.maintenance, wherever it is checked out.
+    """
+    path = tempfile.mkdtemp(prefix='find-bench-')
+    os.makedirs(os.path.join(path, 'ansible_collections', 'adfinis'))
+    os.symlink(COLLECTION_ROOT, os.path.join(path, 'ansible_collections', 'adfinis', 'maintenance'))
+    return path
+
+
+def run(args, pythonpath):
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+        json.dump({'ANSIBLE_MODULE_ARGS': args}, f)
+    env = dict(os.environ, PYTHONPATH=pythonpath)
+    start = time.monotonic()
+    proc = subprocess.Popen([sys.executable, MODULE, f.name], stdout=subprocess.PIPE, env=env)
+    out = proc.stdout.read()
+    _, _, rusage = os.wait4(proc.pid, 0)
+    elapsed = time.monotonic() - start
+    os.unlink(f.name)
+    result = json.loads(out)
+    if result.get('failed'):
+        raise RuntimeError(result.get('msg'))
+    # ru_maxrss is in KiB on Linux
+    return elapsed, rusage.ru_maxrss / 1024, result['found']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=1000000, help='number of files to generate')
+    parser.add_argument('--tree', default=None, help='where to generate the tree (reused if it already exists)')
+    parser.add_argument('--rounds', type=int, default=3, help='number of runs per engine, the best one is reported')
+    opts = parser.parse_args()
+
+    tree = opts.tree or os.path.join(tempfile.gettempdir(), 'find-bench-{}'.format(opts.files))
+    print('Generating {} files in {} ...'.format(opts.files, tree))
+    generate_tree(tree, opts.files)
+
+    pythonpath = collection_path()
+    queries = {
+        'large files': dict(paths=[tree], xdev=True, type='file', size='+16M', age='-20160',
+                            exclude=['{}/d01/'.format(tree), '.*/f0[0-9]*0000\\.dat$']),
+        'logfiles': dict(paths=[tree], xdev=True, type='file', pattern='*.log'),
+    }
+    print('{:<12} {:<8} {:>10} {:>12} {:>10}'.format('query', 'engine', 'time [s]', 'max RSS [MiB]', 'matches'))
+    for name, query in queries.items():
+        found = {}
+        for engine in ('find', 'native'):
+            best = None
+            for _ in range(opts.rounds):
+                elapsed, rss, found[engine] = run(dict(query, engine=engine), pythonpath)
+                if best is None or elapsed < best[0]:
+                    best = (elapsed, rss)
+            print('{:<12} {:<8} {:>10.2f} {:>12.1f} {:>10}'.format(name, engine, best[0], best[1], len(found[engine])))
+        if found['find'] != found['native']:
+            print('WARNING: the engines returned different results for "{}"'.format(name))
+
+
+if __name__ == '__main__':
+    main()
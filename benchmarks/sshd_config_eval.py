@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Compare resolving the AuthorizedKeysFile of many synthetic users with the in-process sshd_config evaluator used by
+adfinis.maintenance.audit_ssh_authorizedkeys, against running "sshd -T" once per user.
+
+sshd -T is only run for a sample of the users and extrapolated, and is skipped if sshd is not installed.  It usually
+requires root to read the host keys.
+
+    python3 benchmarks/sshd_config_eval.py --users 10000
+"""
+
+import argparse
+import collections
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+
+COLLECTION_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PwdEnt = collections.namedtuple('pwdent', ['pw_name', 'pw_passwd', 'pw_uid', 'pw_gid', 'pw_gecos', 'pw_dir', 'pw_shell'])
+
+CONFIG = '''
+AuthorizedKeysFile .ssh/authorized_keys
+Match User svc-*
+    AuthorizedKeysFile /etc/ssh/keys/%u
+Match User adm-*,!adm-0*
+    AuthorizedKeysFile .ssh/authorized_keys /etc/ssh/keys/admins
+'''
+
+
+def import_evaluator():
+    path = tempfile.mkdtemp(prefix='sshd-bench-')
+    os.makedirs(os.path.join(path, 'ansible_collections', 'adfinis'))
+    os.symlink(COLLECTION_ROOT, os.path.join(path, 'ansible_collections', 'adfinis', 'maintenance'))
+    sys.path.insert(0, path)
+    from ansible_collections.adfinis.maintenance.plugins.module_utils.sshd_config import SshdConfig
+    return SshdConfig
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=10000, help='number of synthetic users')
+    parser.add_argument('--sample', type=int, default=100, help='number of users to run sshd -T for')
+    parser.add_argument('--sshd', default=shutil.which('sshd') or '/usr/sbin/sshd', help='path to the sshd binary')
+    opts = parser.parse_args()
+
+    prefixes = ('user', 'svc-', 'adm-')
+    users = [
+        PwdEnt('{}{:05d}'.format(prefixes[i % 3], i), 'x', str(10000 + i), '100', '', '/home/u{:05d}'.format(i), '/bin/sh')
+        for i in range(opts.users)
+    ]
+    with tempfile.NamedTemporaryFile('w', suffix='.sshd_config', delete=False) as f:
+        f.write(CONFIG)
+
+    SshdConfig = import_evaluator()
+    start = time.monotonic()
+    config = SshdConfig(f.name)
+    for user in users:
+        config.effective(user)
+    evaluator = time.monotonic() - start
+    print('{:<10} {:>8} users {:>10.3f} s'.format('evaluator', opts.users, evaluator))
+
+    if os.path.exists(opts.sshd):
+        sample = users[:opts.sample]
+        start = time.monotonic()
+        for user in sample:
+            subprocess.run([opts.sshd, '-C', 'host=,addr=,user=' + user.pw_name, '-T', '-f', f.name],
+                           stdout=subprocess.DEVNULL, check=True)
+        elapsed = (time.monotonic() - start) * opts.users / len(sample)
+        print('{:<10} {:>8} users {:>10.3f} s (extrapolated from {})'.format('sshd -T', opts.users, elapsed, len(sample)))
+    else:
+        print('sshd not found at {}, skipping sshd -T'.format(opts.sshd))
+    os.unlink(f.name)
+
+
+if __name__ == '__main__':
+    main()
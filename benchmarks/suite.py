@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Benchmark suite for the modules and the report callback of the collection, on generated fixtures.
+
+Every scenario runs in a separate Python process, which calls the module's run_module() (or feeds the callback with
+simulated task results) in-process, so the reported peak RSS is that of the scenario alone.  Per scenario, the wall
+time (best of --rounds), peak RSS and size of the result payload are recorded:
+
+    python3 benchmarks/suite.py --output before.json
+    git checkout my-branch
+    python3 benchmarks/suite.py --output after.json --compare before.json
+
+The report callback is fed --hosts times --taskids results, e.g. a million with:
+
+    python3 benchmarks/suite.py --scenarios report-10000 --hosts 10000 --taskids 100 --rounds 1
+
+With --compare, the suite exits with status 1 if any scenario got slower, or used more memory, by more than
+--threshold percent.  Fixtures are generated below --fixtures and reused by later runs.
+"""
+
+import argparse
+import base64
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from find_engines import COLLECTION_ROOT, collection_path, generate_tree  # noqa: E402
+
+
+SSHD_CONFIG = '''
+AuthorizedKeysFile .ssh/authorized_keys
+Match User svc-*
+    AuthorizedKeysFile /etc/ssh/keys/%u
+Match User adm-*,!adm-0*
+    AuthorizedKeysFile .ssh/authorized_keys .ssh/authorized_keys2
+'''
+
+
+def taskids(count):
+    return ['{:02d}-{:03d}'.format(10 + i // 90, 10 + i % 90) for i in range(count)]
+
+
+def scenarios(opts):
+    """
+    Return the scenarios to run as dict name -> (kind, size).
+    """
+    result = {}
+    for files in opts.files:
+        result['find-native-{}'.format(files)] = ('find-native', files)
+        result['find-find-{}'.format(files)] = ('find-find', files)
+    for users in opts.users:
+        result['audit_ssh_authorizedkeys-{}'.format(users)] = ('audit_ssh_authorizedkeys', users)
+    for hosts in opts.hosts:
+        result['report-{}'.format(hosts)] = ('report', hosts)
+    return result
+
+
+def _executable(path, content):
+    with open(path, 'w') as f:
+        f.write(content)
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+
+def _key(rng):
+    blob = b''.join(len(part).to_bytes(4, 'big') + part
+                    for part in (b'ssh-ed25519', bytes(rng.getrandbits(8) for _ in range(32))))
+    return 'ssh-ed25519 ' + base64.b64encode(blob).decode('ascii')
+
+
+def generate_users(root, users):
+    """
+    Create a passwd file, nsswitch.conf, sshd_config, stub getent and sshd binaries, and home directories with
+    authorized_keys files for users users below root.  Returns the paths and the keys to allow.
+    """
+    marker = os.path.join(root, '.generated')
+    fixture = dict(
+        passwd=os.path.join(root, 'passwd'),
+        nsswitch=os.path.join(root, 'nsswitch.conf'),
+        config=os.path.join(root, 'sshd_config'),
+        getent=os.path.join(root, 'getent'),
+        sshd=os.path.join(root, 'sshd'),
+        allowed=os.path.join(root, 'allowed.json'),
+    )
+    if os.path.exists(marker):
+        return fixture
+    rng = random.Random(users)
+    os.makedirs(root, exist_ok=True)
+    shared = [_key(rng) for _ in range(20)]
+    prefixes = ('user', 'svc-', 'adm-')
+    with open(fixture['passwd'], 'w') as passwd:
+        for i in range(users):
+            name = '{}{:06d}'.format(prefixes[i % 3], i)
+            home = os.path.join(root, 'home', name)
+            passwd.write('{}:x:{}:100::{}:/bin/sh\n'.format(name, 10000 + i, home))
+            if i % 4 == 3:
+                # Not every user has keys
+                continue
+            os.makedirs(os.path.join(home, '.ssh'))
+            with open(os.path.join(home, '.ssh', 'authorized_keys'), 'w') as f:
+                for key in rng.sample(shared, 2) + [_key(rng)]:
+                    f.write('{} {}@example.org\n'.format(key, name))
+    with open(fixture['nsswitch'], 'w') as f:
+        f.write('passwd: files systemd\n')
+    with open(fixture['config'], 'w') as f:
+        f.write(SSHD_CONFIG)
+    # getent only has to list the generated users, and sshd to accept the config
+    _executable(fixture['getent'], '#!/bin/sh\nexec cat {}\n'.format(fixture['passwd']))
+    _executable(fixture['sshd'], '#!/bin/sh\necho "authorizedkeysfile .ssh/authorized_keys"\n')
+    with open(fixture['allowed'], 'w') as f:
+        json.dump(shared[:15], f)
+    open(marker, 'w').close()
+    return fixture
+
+
+def run_module(name, args, patch=None):
+    """
+    Run the run_module() entry point of a module in this process.  Returns the JSON it printed.
+    """
+    from ansible.module_utils import basic
+    module = __import__('ansible_collections.adfinis.maintenance.plugins.modules.' + name, fromlist=['run_module'])
+    for attr, value in (patch or {}).items():
+        setattr(module, attr, value)
+    basic._ANSIBLE_ARGS = json.dumps({'ANSIBLE_MODULE_ARGS': args}).encode('utf-8')
+    if hasattr(basic, '_ANSIBLE_PROFILE'):
+        # ansible-core 2.19 and later also need to know how the arguments were serialized
+        basic._ANSIBLE_PROFILE = 'legacy'
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        try:
+            module.run_module()
+        except SystemExit:
+            pass
+    result = json.loads(out.getvalue())
+    if result.get('failed'):
+        raise RuntimeError(result.get('msg'))
+    return out.getvalue()
+
+
+class _Task:
+    """
+    Stands in for ansible.playbook.task.Task, with the attributes the callback reads.
+    """
+
+    def __init__(self, taskid, uuid):
+        self.vars = dict(taskid=taskid, name='Task {} | subtask'.format(taskid))
+        self._uuid = uuid
+        self._parent = None
+        self.ignore_unreachable = False
+        self.no_log = False
+
+
+def run_report(hosts, ntaskids, workdir):
+    """
+    Feed the report callback with the results of ntaskids tasks on hosts hosts, as ansible-playbook would.
+    Returns the checklist, summaries and output file it wrote.
+    """
+    from ansible.executor.task_result import TaskResult
+    from ansible.inventory.host import Host
+    from ansible.plugins.loader import callback_loader, init_plugin_loader
+
+    # Makes the collection in ANSIBLE_COLLECTIONS_PATH loadable, as ansible-playbook does on startup
+    init_plugin_loader()
+    callback = callback_loader.get('adfinis.maintenance.report')
+    output_file = os.path.join(workdir, 'report.jsonl')
+    callback.set_options(direct=dict(output_file=output_file, fleet_summary=True, timing=True))
+    rng = random.Random(hosts)
+    tasks = [_Task(taskid, str(i)) for i, taskid in enumerate(taskids(ntaskids))]
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        for i in range(hosts):
+            host = Host('host{:05d}.example.org'.format(i))
+            for task in tasks:
+                callback.v2_runner_on_start(host, task)
+                outcome = rng.random()
+                result = TaskResult(host, task, dict(changed=outcome < 0.1, failed=outcome > 0.98), {})
+                if outcome < 0.05:
+                    callback.v2_runner_on_skipped(result)
+                elif outcome > 0.98:
+                    callback.v2_runner_on_failed(result, ignore_errors=True)
+                else:
+                    callback.v2_runner_on_ok(result)
+        callback.v2_playbook_on_stats(None)
+    with open(output_file) as f:
+        return out.getvalue() + f.read()
+
+
+def child(opts):
+    """
+    Run one round of a scenario, and write its wall time and payload size to opts.child_result.
+    """
+    kind, size = scenarios(opts)[opts.child]
+    workdir = tempfile.mkdtemp(prefix='suite-')
+    if kind.startswith('find-'):
+        tree = os.path.join(opts.fixtures, 'tree-{}'.format(size))
+        args = dict(paths=[tree], xdev=True, type='file', size='+16M', age='-20160', engine=kind.split('-', 1)[1],
+                    exclude=['{}/d01/'.format(tree), '.*/f0[0-9]*0000\\.dat$'])
+        start = time.monotonic()
+        payload = run_module('find', args)
+    elif kind == 'audit_ssh_authorizedkeys':
+        fixture = generate_users(os.path.join(opts.fixtures, 'users-{}'.format(size)), size)
+        with open(fixture['allowed']) as f:
+            allowed = json.load(f)
+        # The role runs the audit in check mode, otherwise unknown keys make the module fail
+        args = dict(allowed=allowed, config=fixture['config'], sshd=fixture['sshd'], key_match='fingerprint',
+                    key_format='fingerprint', _ansible_check_mode=True)
+        start = time.monotonic()
+        payload = run_module('audit_ssh_authorizedkeys', args,
+                             patch=dict(NSSWITCH_CONF=fixture['nsswitch'], GETENT=fixture['getent']))
+    else:
+        start = time.monotonic()
+        payload = run_report(size, opts.taskids, workdir)
+    elapsed = time.monotonic() - start
+    with open(opts.child_result, 'w') as f:
+        json.dump(dict(wall=elapsed, payload=len(payload.encode('utf-8'))), f)
+
+
+def run_scenario(name, opts, env):
+    """
+    Run a scenario opts.rounds times in a fresh process each.  Returns the best wall time, and the peak RSS and
+    payload size of that round.
+    """
+    best = None
+    for _ in range(opts.rounds):
+        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+            result_file = f.name
+        cmdline = [sys.executable, os.path.abspath(__file__), '--child', name, '--child-result', result_file,
+                   '--fixtures', opts.fixtures, '--files'] + [str(n) for n in opts.files] + \
+            ['--users'] + [str(n) for n in opts.users] + ['--hosts'] + [str(n) for n in opts.hosts] + \
+            ['--taskids', str(opts.taskids)]
+        proc = subprocess.Popen(cmdline, env=env)
+        _, status, rusage = os.wait4(proc.pid, 0)
+        if status != 0:
+            raise RuntimeError('scenario {} failed'.format(name))
+        with open(result_file) as f:
+            measurement = json.load(f)
+        os.unlink(result_file)
+        # ru_maxrss is in KiB on Linux
+        measurement['rss'] = rusage.ru_maxrss / 1024
+        if best is None or measurement['wall'] < best['wall']:
+            best = measurement
+    return best
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=COLLECTION_ROOT,
+                                       stderr=subprocess.DEVNULL).decode('ascii').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """
+    Print the change of every metric against baseline.  Returns the number of regressions beyond threshold percent.
+    """
+    print('')
+    print('Compared to {} ({}):'.format(baseline.get('commit'), baseline.get('date')))
+    print('{:<36} {:>10} {:>10} {:>10}'.format('scenario', 'wall', 'RSS', 'payload'))
+    regressions = 0
+    for name, current in results['scenarios'].items():
+        previous = baseline['scenarios'].get(name)
+        if previous is None:
+            print('{:<36} {:>10}'.format(name, 'new'))
+            continue
+        changes = []
+        for metric in ('wall', 'rss', 'payload'):
+            change = (current[metric] - previous[metric]) * 100 / previous[metric] if previous[metric] else 0
+            if metric != 'payload' and change > threshold:
+                regressions += 1
+            changes.append('{:+.1f}%'.format(change))
+        print('{:<36} {:>10} {:>10} {:>10}'.format(name, *changes))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, nargs='*', default=[100000],
+                        help='sizes of the file trees for find (e.g. 100000 1000000 10000000)')
+    parser.add_argument('--users', type=int, nargs='*', default=[5000],
+                        help='numbers of users for audit_ssh_authorizedkeys')
+    parser.add_argument('--hosts', type=int, nargs='*', default=[5000], help='numbers of hosts for the report callback')
+    parser.add_argument('--taskids', type=int, default=50,
+                        help='number of taskids per host for the report callback, each reporting one result')
+    parser.add_argument('--scenarios', nargs='*', default=None, help='only run these scenarios')
+    parser.add_argument('--rounds', type=int, default=3, help='number of runs per scenario, the best one is reported')
+    parser.add_argument('--fixtures', default=os.path.join(tempfile.gettempdir(), 'adfinis-maintenance-bench'),
+                        help='where to generate the fixtures (reused if they already exist)')
+    parser.add_argument('--output', default=None, help='write the results to this JSON file')
+    parser.add_argument('--compare', default=None, help='compare the results to those in this JSON file')
+    parser.add_argument('--threshold', type=float, default=10, help='regression threshold in percent')
+    parser.add_argument('--child', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--child-result', default=None, help=argparse.SUPPRESS)
+    opts = parser.parse_args()
+
+    if opts.child is not None:
+        child(opts)
+        return
+
+    selected = scenarios(opts)
+    if opts.scenarios is not None:
+        selected = {name: scenario for name, scenario in selected.items() if name in opts.scenarios}
+    for size in sorted(set(size for kind, size in selected.values() if kind.startswith('find-'))):
+        print('Generating {} files ...'.format(size))
+        generate_tree(os.path.join(opts.fixtures, 'tree-{}'.format(size)), size)
+    for size in sorted(set(size for kind, size in selected.values() if kind == 'audit_ssh_authorizedkeys')):
+        print('Generating {} users ...'.format(size))
+        generate_users(os.path.join(opts.fixtures, 'users-{}'.format(size)), size)
+
+    pythonpath = collection_path()
+    env = dict(os.environ, PYTHONPATH=pythonpath, ANSIBLE_COLLECTIONS_PATH=pythonpath)
+    results = dict(commit=git_commit(), date=time.strftime('%Y-%m-%dT%H:%M:%S'), python=platform.python_version(),
+                   scenarios={})
+    print('{:<36} {:>10} {:>14} {:>14}'.format('scenario', 'time [s]', 'max RSS [MiB]', 'payload [B]'))
+    for name in selected:
+        measurement = run_scenario(name, opts, env)
+        results['scenarios'][name] = measurement
+        print('{:<36} {:>10.2f} {:>14.1f} {:>14}'.format(name, measurement['wall'], measurement['rss'],
+                                                         measurement['payload']))
+
+    if opts.output is not None:
+        with open(opts.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if opts.compare is not None:
+        with open(opts.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, opts.threshold) > 0:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
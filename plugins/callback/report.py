@@ -26,7 +26,116 @@ description:
       - [x] 10-028 A task that reported ok
       - [~] 10-032 This task was skipped
       - [x] 10-034 Another ok task
-options: {}
+  - |
+    Optionally, the results of every run are stored in an SQLite database, so that only the tasks that regressed since
+    the previous run of each host can be shown.
+options:
+  history_db:
+    description:
+      - Path to an SQLite database on the controller, where the state of each task is recorded per host and run.
+      - The database is created if it doesn't exist.  If unset, no history is kept.
+    ini:
+      - section: callback_report
+        key: history_db
+    env:
+      - name: ANSIBLE_CALLBACK_REPORT_HISTORY_DB
+    type: path
+    default: null
+  only_regressions:
+    description:
+      - Only list the tasks that require human interaction now, but didn't in the previous run of the same host (or got
+        worse, e.g. from changed to failed).  Tasks without history are listed as well.
+      - Requires I(history_db).
+    ini:
+      - section: callback_report
+        key: only_regressions
+    env:
+      - name: ANSIBLE_CALLBACK_REPORT_ONLY_REGRESSIONS
+    type: bool
+    default: false
+  output_file:
+    description:
+      - Also write the results to this file on the controller, in the format given by I(output_format).
+      - The results of a host are written as soon as the host is done, i.e. when it becomes unreachable or fails (unless
+        the error is ignored or rescued), and otherwise at the end of its play.  With I(serial), that is at the end of
+        the batch the host is in, so on large fleets the results of the first batches are written while the later
+        ones still run.  A per-taskid fleet summary is written last.
+      - If a host reports more results after it was written, e.g. in a later play, it is written again with all its
+        results, and the later record replaces the earlier one.
+    ini:
+      - section: callback_report
+        key: output_file
+    env:
+      - name: ANSIBLE_CALLBACK_REPORT_OUTPUT_FILE
+    type: path
+    default: null
+  output_format:
+    description:
+      - Format of I(output_file).
+      - C(jsonl) writes one JSON object per host, with the state of each taskid, followed by one object per taskid
+        with the number of hosts in each state.
+      - C(csv) writes one row per host and taskid, followed by one summary row per taskid.
+      - Every record has a C(type) field, which is either C(host) or C(summary).
+    ini:
+      - section: callback_report
+        key: output_format
+    env:
+      - name: ANSIBLE_CALLBACK_REPORT_OUTPUT_FORMAT
+    type: str
+    choices: [jsonl, csv]
+    default: jsonl
+  checklist:
+    description:
+      - Print the Markdown checklist per host.  Disable to only write I(output_file) on large fleets.
+    ini:
+      - section: callback_report
+        key: checklist
+    env:
+      - name: ANSIBLE_CALLBACK_REPORT_CHECKLIST
+    type: bool
+    default: true
+  fleet_summary:
+    description:
+      - Print a Markdown table with the number of hosts per state for every taskid.
+    ini:
+      - section: callback_report
+        key: fleet_summary
+    env:
+      - name: ANSIBLE_CALLBACK_REPORT_FLEET_SUMMARY
+    type: bool
+    default: false
+  timing:
+    description:
+      - Print the wall-clock duration of every taskid across the fleet (50th, 90th and 99th percentile and maximum),
+        and the slowest hosts per taskid.
+      - The duration of a taskid on a host is the sum of all its subtasks.
+    ini:
+      - section: callback_report
+        key: timing
+    env:
+      - name: ANSIBLE_CALLBACK_REPORT_TIMING
+    type: bool
+    default: false
+  slowest_hosts:
+    description: Number of slowest hosts to list per taskid with I(timing) and in I(profile_file).
+    ini:
+      - section: callback_report
+        key: slowest_hosts
+    env:
+      - name: ANSIBLE_CALLBACK_REPORT_SLOWEST_HOSTS
+    type: int
+    default: 3
+  profile_file:
+    description:
+      - Write the durations of every taskid to this JSON file on the controller, with the percentiles, the slowest hosts
+        and the duration on every host in seconds.
+    ini:
+      - section: callback_report
+        key: profile_file
+    env:
+      - name: ANSIBLE_CALLBACK_REPORT_PROFILE_FILE
+    type: path
+    default: null
 #  # Kept around as reference
 #  format_string:
 #    description: format of the string shown to user at play end
@@ -39,7 +148,13 @@ options: {}
 '''
 
 
+import csv
 import json
+import math
+import os
+import sqlite3
+import time
+from array import array
 from datetime import datetime
 from enum import IntEnum
 
@@ -54,6 +169,169 @@ class TaskState(IntEnum):
     FAILED = 3
 
 
+# TaskState by value, and the value stored for taskids without result in the per-host state arrays
+STATES = tuple(TaskState)
+NO_STATE = 0xff
+
+
+class TaskRegistry:
+    """
+    Interned taskids.  Every taskid is assigned an ordinal when it's first seen, and its name and todo flag are stored
+    once, so that the state and duration of a taskid on a host can be kept in compact arrays indexed by ordinal instead
+    of one dict per host.
+    """
+
+    def __init__(self):
+        self.ordinals = {}
+        self.taskids = []
+        self.names = []
+        self.todo = []
+
+    def intern(self, taskid, task_vars):
+        """
+        Return the ordinal of taskid, registering it if it's new.  The name and todo flag of the taskid are those of
+        the subtask reported last, so task_vars overwrite them.
+        """
+        ordinal = self.ordinals.get(taskid)
+        if ordinal is None:
+            ordinal = self.ordinals[taskid] = len(self.taskids)
+            self.taskids.append(taskid)
+            self.names.append('')
+            self.todo.append(False)
+        # Pipe `|` is used as the separator for "subtasks" if one maintenance task is split into multiple ansible tasks
+        self.names[ordinal] = task_vars.get('name', '').split('|', 1)[0].strip()
+        self.todo[ordinal] = bool(task_vars.get('todo'))
+        return ordinal
+
+    def name(self, taskid):
+        ordinal = self.ordinals.get(taskid)
+        return self.names[ordinal] if ordinal is not None else ''
+
+    def is_todo(self, taskid):
+        ordinal = self.ordinals.get(taskid)
+        return self.todo[ordinal] if ordinal is not None else False
+
+    def names_by_taskid(self):
+        return dict(zip(self.taskids, self.names))
+
+
+# Runs are numbered, and each host's results are stored with the number of the run.  The previous results of a host
+# are those of the latest run it took part in, which might not be the latest run overall (e.g. with --limit).
+HISTORY_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    run INTEGER PRIMARY KEY,
+    started TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS host_runs (
+    host TEXT NOT NULL,
+    run INTEGER NOT NULL,
+    PRIMARY KEY (host, run)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS results (
+    host TEXT NOT NULL,
+    run INTEGER NOT NULL,
+    taskid TEXT NOT NULL,
+    state INTEGER NOT NULL,
+    PRIMARY KEY (host, run, taskid)
+) WITHOUT ROWID;
+'''
+
+
+class History:
+    """
+    Task states of previous runs, stored in SQLite.
+    """
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        self.db = sqlite3.connect(path)
+        self.db.executescript(HISTORY_SCHEMA)
+
+    def previous(self, host):
+        """
+        Return the task states of the previous run of host as dict taskid -> TaskState, or None if there is none.
+        """
+        row = self.db.execute('SELECT MAX(run) FROM host_runs WHERE host = ?', (host,)).fetchone()
+        if row[0] is None:
+            return None
+        return {
+            taskid: TaskState(state)
+            for taskid, state in self.db.execute('SELECT taskid, state FROM results WHERE host = ? AND run = ?',
+                                                 (host, row[0]))
+        }
+
+    def record(self, started, hosts, tasks):
+        """
+        Store the task states of this run.  tasks(host) returns the states of each of hosts as dict taskid -> TaskState,
+        so that only the states of one host are expanded at a time.
+        """
+        with self.db:
+            run = self.db.execute('INSERT INTO runs (started) VALUES (?)', (started.isoformat(),)).lastrowid
+            self.db.executemany('INSERT INTO host_runs (host, run) VALUES (?, ?)', ((host, run) for host in hosts))
+            self.db.executemany(
+                'INSERT INTO results (host, run, taskid, state) VALUES (?, ?, ?, ?)',
+                ((host, run, taskid, int(state)) for host in hosts for taskid, state in tasks(host).items()),
+            )
+
+    def close(self):
+        self.db.close()
+
+
+def percentile(values, p):
+    """
+    Nearest-rank percentile of the sorted list values.
+    """
+    return values[max(0, -(-len(values) * p // 100) - 1)]
+
+
+class ResultWriter:
+    """
+    Write the results of each host to a JSON Lines or CSV file as soon as the host is done.
+    """
+
+    CSV_FIELDS = ['type', 'host', 'taskid', 'name', 'state', 'action_required', 'duration'] + \
+        [state.name.lower() for state in TaskState]
+
+    def __init__(self, path, fmt):
+        self.format = fmt
+        self.file = open(path, 'w', newline='')
+        if fmt == 'csv':
+            self.csv = csv.DictWriter(self.file, fieldnames=self.CSV_FIELDS)
+            self.csv.writeheader()
+
+    def write_host(self, host, tasks, names, action_required, durations):
+        if self.format == 'jsonl':
+            record = dict(
+                type='host',
+                host=host,
+                tasks={taskid: state.name.lower() for taskid, state in tasks.items()},
+                action_required=[taskid for taskid, state in tasks.items() if action_required(taskid, state)],
+                durations={taskid: round(duration, 3) for taskid, duration in durations.items()},
+            )
+            self.file.write(json.dumps(record) + '\n')
+        else:
+            for taskid, state in tasks.items():
+                self.csv.writerow(dict(type='host', host=host, taskid=taskid, name=names.get(taskid, ''),
+                                       state=state.name.lower(), action_required=action_required(taskid, state),
+                                       duration=round(durations.get(taskid, 0), 3)))
+        self.file.flush()
+
+    def write_summary(self, summary, names):
+        for taskid, counts in sorted(summary.items()):
+            record = dict(type='summary', taskid=taskid, name=names.get(taskid, ''))
+            record.update((state.name.lower(), counts[state]) for state in TaskState)
+            if self.format == 'jsonl':
+                self.file.write(json.dumps(record) + '\n')
+            else:
+                self.csv.writerow(record)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
 class CallbackModule(CallbackBase):
     """
     Print Markdown checklists indicating which tasks require human interaction.
@@ -65,11 +343,65 @@ class CallbackModule(CallbackBase):
     CALLBACK_NEEDS_ENABLED = True
 
     def __init__(self):
-        self.hosts = {}
-        self.tasknames = {}
-        self.todo = {}
+        self.registry = TaskRegistry()
+        # Per host, the state of every taskid as bytearray indexed by the ordinal of the taskid, NO_STATE if it has none
+        self.states = {}
+        # The ordinals of the taskids of a host in the order the host reported them, only for the hosts that didn't
+        # report them in the order of their ordinals
+        self.order = {}
+        self.started = datetime.now()
+        self.writer = None
+        # Hosts with results that weren't written to output_file yet
+        self.unwritten = set()
+        # Start time per host and task, and the summed duration per host and taskid, as array indexed by the ordinal of
+        # the taskid, NaN if it has none
+        self.running = {}
+        self.durations = {}
         super(CallbackModule, self).__init__()
 
+    def set_options(self, *args, **kwargs):
+        super(CallbackModule, self).set_options(*args, **kwargs)
+        if self.get_option('output_file') and self.writer is None:
+            self.writer = ResultWriter(self.get_option('output_file'), self.get_option('output_format'))
+
+    def _tasks(self, host):
+        """
+        Return the states of host as dict taskid -> TaskState, in the order the host first reported the taskids.
+        """
+        taskids = self.registry.taskids
+        hoststates = self.states.get(host, b'')
+        if host in self.order:
+            return {taskids[i]: STATES[hoststates[i]] for i in self.order[host]}
+        return {taskids[i]: STATES[state] for i, state in enumerate(hoststates) if state != NO_STATE}
+
+    def _durations(self, host):
+        """
+        Return the durations of host as dict taskid -> seconds.
+        """
+        taskids = self.registry.taskids
+        return {taskids[i]: duration for i, duration in enumerate(self.durations.get(host, ()))
+                if not math.isnan(duration)}
+
+    def _write_host(self, host):
+        if self.writer is None or host not in self.unwritten:
+            return
+        self.unwritten.discard(host)
+        self.writer.write_host(host, self._tasks(host), self.registry.names_by_taskid(), self._needs_interaction,
+                               self._durations(host))
+
+    @staticmethod
+    def _rescued(task):
+        # Failures in a block with a rescue section don't end the play for the host
+        parent = task._parent
+        while parent is not None:
+            if getattr(parent, 'rescue', None):
+                return True
+            parent = parent._parent
+        return False
+
+    def _needs_interaction(self, task, result):
+        return result >= TaskState.CHANGED or (result == TaskState.OK and self.registry.is_todo(task))
+
     def _process_task_result(self, result, state):
         if not isinstance(result, TaskResult):
             return
@@ -77,20 +409,64 @@ class CallbackModule(CallbackBase):
         # Unfortunately, some protected members need to be accessed to get the information we need.  If something in
         # this plugin breaks with future ansible versions, it's probably the next 3 lines.
         host = result._host.name
-        taskid = result._task.vars.get('taskid')
-        taskname = result._task.vars.get('name', '')
+        task_vars = result._task.vars
+        # Loops only end up here once, after all items
+        started = self.running.pop((host, result._task._uuid), None)
+        taskid = task_vars.get('taskid')
         if taskid is None or taskid == 'ignore-me':
             return
+        ordinal = self.registry.intern(taskid, task_vars)
+        if started is not None:
+            hostdurations = self.durations.get(host)
+            if hostdurations is None:
+                hostdurations = self.durations[host] = array('d')
+            if len(hostdurations) <= ordinal:
+                hostdurations.extend([math.nan] * (ordinal + 1 - len(hostdurations)))
+            elapsed = time.monotonic() - started
+            previous = hostdurations[ordinal]
+            hostdurations[ordinal] = elapsed if math.isnan(previous) else previous + elapsed
+        # An async task that was only started (poll: 0) says nothing about the check yet, its result is reported by the
+        # async_status task that collects it, with the same taskid.  The result is only looked at for async tasks, as
+        # ansible converts it on first access, which costs more than everything else done here.
+        if state != TaskState.FAILED and getattr(result._task, 'async_val', None) and \
+                result._result.get('ansible_job_id') and not result._result.get('finished'):
+            return
         # Store the "worst" result (max, failed=3, changed=2, ok=1, skipped=0) per host and taskid.
         # E.g. if one subtask failed, consider the entire maintenance task failed.
-        hostdict = self.hosts.setdefault(host, {})
-        hostdict[taskid] = max(hostdict.get(taskid, TaskState.SKIPPED), state)
-        # Pipe `|` is used as the separator for "subtasks" if one maintenance task is split into multiple ansible tasks
-        self.tasknames[taskid] = taskname.split('|', 1)[0].strip()
-        self.todo[taskid] = result._task.vars.get('todo')
+        hoststates = self.states.get(host)
+        if hoststates is None:
+            hoststates = self.states[host] = bytearray()
+        if len(hoststates) <= ordinal:
+            hoststates.extend(bytes([NO_STATE]) * (ordinal + 1 - len(hoststates)))
+            if host in self.order:
+                self.order[host].append(ordinal)
+        elif hoststates[ordinal] == NO_STATE:
+            # A taskid reported after one with a higher ordinal (the last state of a host is always set), e.g. because
+            # the hosts ran different tasks
+            order = self.order.get(host)
+            if order is None:
+                order = self.order[host] = array('I', (i for i, value in enumerate(hoststates) if value != NO_STATE))
+            order.append(ordinal)
+        if hoststates[ordinal] == NO_STATE or state > hoststates[ordinal]:
+            hoststates[ordinal] = state
+        if self.writer is not None:
+            self.unwritten.add(host)
+
+    def v2_runner_on_start(self, host, task):
+        # Only tasks with a taskid are timed, the entry is removed again by the result of the task
+        taskid = task.vars.get('taskid')
+        if taskid is not None and taskid != 'ignore-me':
+            self.running[(host.name, task._uuid)] = time.monotonic()
 
     def v2_runner_on_failed(self, result, ignore_errors=False):
         self._process_task_result(result, TaskState.FAILED)
+        if not ignore_errors and not self._rescued(result._task):
+            self._write_host(result._host.name)
+
+    def v2_runner_on_unreachable(self, result):
+        self.running.pop((result._host.name, result._task._uuid), None)
+        if not result._task.ignore_unreachable:
+            self._write_host(result._host.name)
 
     def v2_runner_on_skipped(self, result):
         self._process_task_result(result, TaskState.SKIPPED)
@@ -101,18 +477,113 @@ class CallbackModule(CallbackBase):
         else:
             self._process_task_result(result, TaskState.OK)
 
+    def v2_playbook_on_play_start(self, play):
+        # The hosts of the previous play (or batch, with serial) are done with it, write them in the order they reported
+        for host in self.states:
+            self._write_host(host)
+
     def v2_playbook_on_stats(self, stats):
+        history = None
+        if self.get_option('history_db'):
+            history = History(self.get_option('history_db'))
+        only_regressions = self.get_option('only_regressions') and history is not None
+
         # Generate checklist report at the end of the playbook run
-        for host, tasks in self.hosts.items():
+        unchanged = 0
+        for host in self.states:
+            self._write_host(host)
+            if not self.get_option('checklist'):
+                continue
+            tasks = self._tasks(host)
+            previous = history.previous(host) if history is not None else None
+            if only_regressions:
+                # Only tasks requiring interaction that didn't in the previous run, or that got worse
+                if previous is not None:
+                    tasks = {
+                        task: result for task, result in tasks.items()
+                        if self._needs_interaction(task, result) and (
+                            task not in previous or not self._needs_interaction(task, previous[task])
+                            or result > previous[task])
+                    }
+                if not tasks:
+                    unchanged += 1
+                    continue
             self._display.display('')
             self._display.display(host)
             for task, result in tasks.items():
                 if result == TaskState.SKIPPED:
-                    self._display.display('- [~] %s: %s' % (task, self.tasknames.get(task, '')))
+                    self._display.display('- [~] %s: %s' % (task, self.registry.name(task)))
                 elif result == TaskState.OK:
-                    if self.todo.get(task, False):
-                        self._display.display('- [ ] %s: %s' % (task, self.tasknames.get(task, '')))
+                    if self.registry.is_todo(task):
+                        self._display.display('- [ ] %s: %s' % (task, self.registry.name(task)))
                     else:
-                        self._display.display('- [x] %s: %s' % (task, self.tasknames.get(task, '')))
+                        self._display.display('- [x] %s: %s' % (task, self.registry.name(task)))
                 else:
-                    self._display.display('- [ ] %s: %s' % (task, self.tasknames.get(task, '')))
+                    self._display.display('- [ ] %s: %s' % (task, self.registry.name(task)))
+
+        if only_regressions and self.get_option('checklist'):
+            self._display.display('')
+            self._display.display('%d host(s) without regressions since their previous run' % unchanged)
+
+        # Number of hosts per state for each taskid
+        counts = [[0] * len(STATES) for _ in self.registry.taskids]
+        for hoststates in self.states.values():
+            for i, state in enumerate(hoststates):
+                if state != NO_STATE:
+                    counts[i][state] += 1
+        summary = {
+            taskid: dict(zip(STATES, counts[i]))
+            for i, taskid in enumerate(self.registry.taskids) if sum(counts[i]) > 0
+        }
+        if self.get_option('fleet_summary'):
+            self._display.display('')
+            self._display.display('| taskid | ok | changed | failed | skipped | task |')
+            self._display.display('|--------|---:|--------:|-------:|--------:|------|')
+            for task, counts in sorted(summary.items()):
+                self._display.display('| %s | %d | %d | %d | %d | %s |' % (
+                    task, counts[TaskState.OK], counts[TaskState.CHANGED], counts[TaskState.FAILED],
+                    counts[TaskState.SKIPPED], self.registry.name(task)))
+        if self.writer is not None:
+            self.writer.write_summary(summary, self.registry.names_by_taskid())
+            self.writer.close()
+
+        if history is not None:
+            history.record(self.started, list(self.states), self._tasks)
+            history.close()
+
+        if self.get_option('timing') or self.get_option('profile_file'):
+            self._report_timing()
+
+    def _report_timing(self):
+        slowest = self.get_option('slowest_hosts')
+        profile = {}
+        for host in self.durations:
+            for task, duration in self._durations(host).items():
+                profile.setdefault(task, {})[host] = duration
+        for task, hosts in profile.items():
+            values = sorted(hosts.values())
+            profile[task] = dict(
+                name=self.registry.name(task),
+                p50=percentile(values, 50),
+                p90=percentile(values, 90),
+                p99=percentile(values, 99),
+                max=values[-1],
+                total=sum(values),
+                slowest=sorted(hosts, key=hosts.get, reverse=True)[:slowest],
+                hosts=hosts,
+            )
+
+        if self.get_option('timing'):
+            self._display.display('')
+            self._display.display('| taskid | p50 [s] | p90 [s] | p99 [s] | max [s] | slowest hosts | task |')
+            self._display.display('|--------|--------:|--------:|--------:|--------:|---------------|------|')
+            # Taskids with the most time spent across the fleet first
+            for task, timing in sorted(profile.items(), key=lambda item: item[1]['total'], reverse=True):
+                self._display.display('| %s | %.1f | %.1f | %.1f | %.1f | %s | %s |' % (
+                    task, timing['p50'], timing['p90'], timing['p99'], timing['max'],
+                    ', '.join('%s (%.1f)' % (host, timing['hosts'][host]) for host in timing['slowest']),
+                    timing['name']))
+
+        if self.get_option('profile_file'):
+            with open(self.get_option('profile_file'), 'w') as f:
+                json.dump(profile, f, indent=2, sort_keys=True)
@@ -0,0 +1,55 @@
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+DOCUMENTATION = '''
+name: expand_compact
+short_description: Expand a list returned with result_encoding front_coded or compressed
+version_added: "0.1.0"
+description:
+  - Return the plain list of paths or keys that adfinis.maintenance.find or adfinis.maintenance.audit_ssh_authorizedkeys
+    returned in the encoding selected by their I(result_encoding) option.
+  - Plain lists, i.e. results returned with I(result_encoding=list), are returned as they are, so the filter can be
+    applied regardless of the encoding.
+  - The list is only expanded where the filter is used, the registered result stays compact.
+options:
+  _input:
+    description: The encoded list, e.g. the I(found) key of a find result.
+    type: raw
+    required: true
+'''
+
+EXAMPLES = '''
+- name: Print the number of matches below /var/log
+  ansible.builtin.debug:
+    msg: "{{ files.found | adfinis.maintenance.expand_compact | select('match', '/var/log/') | length }}"
+'''
+
+RETURN = '''
+_value:
+  description: The plain list.
+  type: list
+  elements: str
+'''
+
+
+from ansible.errors import AnsibleFilterError
+from ansible_collections.adfinis.maintenance.plugins.module_utils.compact import decode
+
+
+def expand_compact(value):
+    try:
+        return decode(value)
+    except (ValueError, TypeError, KeyError, IndexError) as e:
+        raise AnsibleFilterError('expand_compact: {}'.format(e))
+
+
+class FilterModule(object):
+
+    def filters(self):
+        return {
+            'expand_compact': expand_compact,
+        }
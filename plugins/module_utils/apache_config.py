@@ -0,0 +1,177 @@
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Minimal Apache httpd configuration reader, which follows Include directives and expands variables, to collect the
+values of selected directives across the whole configuration.
+
+Conditional sections (<IfModule>, <IfDefine>, ...) are not evaluated, every directive in the configuration counts.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import glob
+import os
+import re
+import shlex
+
+
+# ${VAR} in the configuration, expanded from Define directives and the environment (see Define in the Apache docs)
+CONFIG_VAR_RE = re.compile(r'\$\{([A-Za-z0-9_]+)\}')
+
+# $VAR, ${VAR}, ${VAR:-default} and ${VAR-default} in shell scripts such as Debian's envvars
+SHELL_VAR_RE = re.compile(r'\$(?:\{([A-Za-z0-9_]+)(?:(:?-)([^}]*))?\}|([A-Za-z_][A-Za-z0-9_]*))')
+SHELL_ASSIGNMENT_RE = re.compile(r'^(?:export\s+)?([A-Za-z_][A-Za-z0-9_]*)=(.*)$')
+SHELL_BLOCK_END_RE = re.compile(r'[;\s](fi|esac)\s*;?\s*$')
+
+# Maximum Include depth, same as Apache
+MAX_DEPTH = 128
+
+
+def _expand_shell(value, env):
+    def replace(match):
+        name = match.group(1) or match.group(4)
+        if match.group(2) is not None:
+            current = env.get(name)
+            if current is None or (match.group(2) == ':-' and current == ''):
+                return match.group(3)
+            return current
+        # Unset variables expand to the empty string
+        return env.get(name, '')
+    return SHELL_VAR_RE.sub(replace, value)
+
+
+def read_envvars(path):
+    """
+    Read the variable assignments of a shell script like Debian's /etc/apache2/envvars, without running it.  Only plain
+    (optionally exported) assignments outside of if/case blocks are evaluated, which covers the defaults.
+    """
+    env = {}
+    nesting = 0
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            word = line.split(None, 1)[0].rstrip(';')
+            if word in ('if', 'case') and not SHELL_BLOCK_END_RE.search(line):
+                nesting += 1
+            elif word in ('fi', 'esac'):
+                nesting -= 1
+            if nesting > 0:
+                continue
+            match = SHELL_ASSIGNMENT_RE.match(line)
+            if match is None:
+                continue
+            try:
+                value = ' '.join(shlex.split(match.group(2), comments=True))
+            except ValueError:
+                continue
+            env[match.group(1)] = _expand_shell(value, env)
+    return env
+
+
+class ApacheConfig:
+    """
+    Collect the arguments of the given directives from a configuration file and everything it includes.  Each file is
+    read only once, even if it is included several times.
+    """
+
+    def __init__(self, path, server_root=None, env=None, directives=()):
+        self.server_root = server_root or os.path.dirname(path)
+        self.variables = dict(env or {})
+        self.directives = set(d.lower() for d in directives)
+        self.values = {d: [] for d in self.directives}
+        self.files = []
+        self.errors = []
+        self._seen = set()
+        self._read(path, 0, optional=False)
+
+    def _expand(self, value):
+        # Undefined variables are left as they are, just like Apache does (with a warning)
+        return CONFIG_VAR_RE.sub(lambda m: self.variables.get(m.group(1), m.group(0)), value)
+
+    def _resolve(self, path):
+        path = self._expand(path)
+        if not os.path.isabs(path):
+            path = os.path.join(self.server_root, path)
+        return os.path.normpath(path)
+
+    def _include(self, pattern, depth, optional):
+        pattern = self._resolve(pattern)
+        paths = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        if not paths and not optional and not glob.has_magic(os.path.dirname(pattern)):
+            # Like Apache, only IncludeOptional may match nothing
+            self.errors.append("Include '{}' matches no files".format(pattern))
+        for path in paths:
+            if os.path.isdir(path):
+                for directory, dirs, files in os.walk(path):
+                    dirs.sort()
+                    for name in sorted(files):
+                        self._read(os.path.join(directory, name), depth + 1, optional)
+            else:
+                self._read(path, depth + 1, optional)
+
+    def _lines(self, f):
+        # Lines ending with a backslash are continued on the next line
+        continued = ''
+        for line in f:
+            line = line.rstrip('\n')
+            if line.endswith('\\'):
+                continued += line[:-1]
+                continue
+            yield continued + line
+            continued = ''
+        if continued:
+            yield continued
+
+    def _read(self, path, depth, optional):
+        if depth > MAX_DEPTH:
+            self.errors.append("'{}': includes nested too deeply".format(path))
+            return
+        key = os.path.realpath(path)
+        if key in self._seen:
+            return
+        self._seen.add(key)
+        try:
+            f = open(path, 'r', errors='surrogateescape')
+        except OSError as e:
+            if not optional:
+                self.errors.append("'{}': {}".format(path, e.strerror))
+            return
+        self.files.append(path)
+        with f:
+            for line in self._lines(f):
+                line = line.strip()
+                if not line or line.startswith('#') or line.startswith('<'):
+                    continue
+                try:
+                    words = shlex.split(line, posix=True)
+                except ValueError:
+                    words = line.split()
+                directive, args = words[0].lower(), words[1:]
+                if directive == 'define' and args:
+                    self.variables[args[0]] = self._expand(args[1]) if len(args) > 1 else ''
+                elif directive == 'serverroot' and args:
+                    self.server_root = self._expand(args[0])
+                elif directive in ('include', 'includeoptional') and args:
+                    self._include(args[0], depth, optional or directive == 'includeoptional')
+                if directive in self.directives:
+                    self.values[directive].append([self._expand(a) for a in args])
+
+    def paths(self, directive):
+        """
+        Return the first argument of every occurrence of directive as absolute path, skipping piped and syslog logs.
+        """
+        paths = []
+        seen = set()
+        for args in self.values[directive.lower()]:
+            if not args or args[0].startswith('|') or args[0].startswith('syslog'):
+                continue
+            path = self._resolve(args[0])
+            if path not in seen:
+                seen.add(path)
+                paths.append(path)
+        return paths
@@ -0,0 +1,158 @@
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Reading and parsing of authorized_keys files for the audit_ssh_authorizedkeys module.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import base64
+import binascii
+import collections
+import hashlib
+import os
+import re
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Key types as they appear in authorized_keys, e.g. ssh-ed25519, ecdsa-sha2-nistp256 or
+# sk-ssh-ed25519-cert-v01@openssh.com.  Anything else in front of the key is an options list.
+KEY_TYPE_RE = re.compile(r'^(ssh-[a-z0-9]+|ecdsa-sha2-[a-z0-9]+|sk-[a-z0-9-]+@openssh\.com|[a-z0-9-]+-cert-v01@openssh\.com)$')
+
+# An options list extends to the first whitespace outside of double quotes
+OPTIONS_RE = re.compile(r'^((?:[^\s"]|"(?:[^"\\]|\\.)*")+)\s+(.*)$')
+
+
+class KeyRecord(collections.namedtuple('KeyRecord', ['options', 'type', 'blob', 'fingerprint', 'comment', 'line'])):
+    """
+    One authorized_keys entry.  fingerprint is the SHA256 fingerprint as printed by ssh-keygen -l, or None if the key
+    blob isn't valid base64.
+    """
+    __slots__ = ()
+
+    def match_key(self, key_match):
+        """
+        Identity of the entry when comparing to policy entries: the whole line, the options and the key, or only the key.
+        """
+        if key_match == 'line' or self.fingerprint is None:
+            return self.line
+        if key_match == 'options':
+            return (self.options, self.fingerprint)
+        return self.fingerprint
+
+    def describe(self):
+        return '{} {}'.format(self.fingerprint, self.comment).rstrip() if self.fingerprint else self.line
+
+    def as_dict(self):
+        return dict(options=self.options, type=self.type, fingerprint=self.fingerprint, comment=self.comment)
+
+
+def fingerprint(blob):
+    return 'SHA256:' + base64.b64encode(hashlib.sha256(blob).digest()).decode('ascii').rstrip('=')
+
+
+def parse_key(line):
+    """
+    Parse an authorized_keys line (see AUTHORIZED_KEYS FILE FORMAT in man 8 sshd) into a KeyRecord.
+    """
+    line = line.strip()
+    options = ''
+    fields = line.split(None, 1)
+    if fields and not KEY_TYPE_RE.match(fields[0]):
+        match = OPTIONS_RE.match(line)
+        if match is not None:
+            options, rest = match.groups()
+            fields = rest.split(None, 1)
+    fields = fields[0:1] + (fields[1].split(None, 1) if len(fields) > 1 else [])
+    keytype, blob, comment = (fields + ['', '', ''])[:3]
+    try:
+        decoded = base64.b64decode(blob, validate=True) if blob else None
+    except (binascii.Error, ValueError):
+        decoded = None
+    return KeyRecord(options, keytype, blob, fingerprint(decoded) if decoded else None, comment, line)
+
+
+class KeyIndex:
+    """
+    Set of policy entries, for constant time lookups of KeyRecords.  Entries are either authorized_keys lines or bare
+    SHA256 fingerprints, which match the key regardless of its options and comment.
+    """
+
+    def __init__(self, entries, key_match):
+        self.key_match = key_match
+        self.keys = set()
+        self.fingerprints = set()
+        self.records = []
+        for entry in entries:
+            if entry.startswith('SHA256:'):
+                self.fingerprints.add(entry.strip())
+                self.records.append((entry.strip(), entry.strip()))
+            else:
+                record = parse_key(entry)
+                self.keys.add(record.match_key(key_match))
+                self.records.append((entry, record.match_key(key_match)))
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, record):
+        return record.fingerprint in self.fingerprints or record.match_key(self.key_match) in self.keys
+
+    def missing(self, records):
+        """
+        Return the policy entries not present in records.
+        """
+        present = set(record.match_key(self.key_match) for record in records)
+        present.update(record.fingerprint for record in records)
+        return [entry for entry, key in self.records if key not in present]
+
+
+class KeyFileCache:
+    """
+    Read authorized_keys files, each distinct file only once.
+
+    Many users often resolve to the same file, e.g. service accounts sharing / or /var/lib/nobody as home, or the same
+    file reachable through several paths (symlinks, bind mounts).  Files are therefore cached by device, inode and
+    mtime, and the entries of a cached file are shared by all users it belongs to.
+    """
+
+    def __init__(self, parallelism=1):
+        self.parallelism = parallelism
+        self.files = {}
+        self.reads = 0
+        self._lock = threading.Lock()
+
+    def read(self, path):
+        """
+        Return the entries in path as tuple of KeyRecords, skipping empty lines and comments, or None if it doesn't
+        exist.
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        key = (st.st_dev, st.st_ino, st.st_mtime_ns)
+        entries = self.files.get(key)
+        if entries is None:
+            with open(path, 'r') as f:
+                entries = tuple(parse_key(l) for l in f.read().splitlines() if l and not l.strip().startswith('#'))
+            with self._lock:
+                self.reads += 1
+                entries = self.files.setdefault(key, entries)
+        return entries
+
+    def read_all(self, paths):
+        """
+        Read all paths, and return a dict path -> entries (or None).  With parallelism > 1, the files are opened
+        concurrently, which hides the latency of network file systems such as NFS homes.
+        """
+        paths = list(set(paths))
+        if self.parallelism > 1 and len(paths) > 1:
+            with ThreadPoolExecutor(max_workers=self.parallelism) as executor:
+                return dict(zip(paths, executor.map(self.read, paths)))
+        return {path: self.read(path) for path in paths}
@@ -0,0 +1,126 @@
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Incremental scanner for SELinux AVC denials in the audit log, built on the log scanner of logscan.
+
+Denials are aggregated by source context, target context, target class and permission, with their number and the time
+of the first and last one, instead of keeping the records themselves.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import re
+import time
+
+from ansible_collections.adfinis.maintenance.plugins.module_utils.logscan import MAX_SIGNATURES, OTHER, LogScanner
+
+
+# Kernel (type=AVC) and userspace (type=USER_AVC, e.g. systemd or dbus) denials
+PATTERNS = [r'avc:\s+denied']
+
+# Commands kept per denial
+MAX_COMMS = 5
+
+TIMESTAMP_RE = re.compile(r'msg=audit\((\d+(?:\.\d+)?):')
+PERMISSIONS_RE = re.compile(r'avc:\s+denied\s+\{([^}]*)\}')
+FIELD_RE = re.compile(r'\b(scontext|tcontext|tclass|comm|exe)=("[^"]*"|\S+)')
+HEX_RE = re.compile(r'(?:[0-9A-F]{2})+')
+
+
+class Denial:
+    """
+    Aggregated denials of one permission from one source to one target context.
+    """
+
+    def __init__(self, scontext, tcontext, tclass, permission):
+        self.key = (scontext, tcontext, tclass, permission)
+        self.count = 0
+        self.first = None
+        self.last = None
+        self.comms = []
+
+    def as_dict(self):
+        scontext, tcontext, tclass, permission = self.key
+        return dict(
+            scontext=scontext,
+            tcontext=tcontext,
+            tclass=tclass,
+            permission=permission,
+            count=self.count,
+            first=_isoformat(self.first),
+            last=_isoformat(self.last),
+            comms=self.comms,
+        )
+
+
+def _isoformat(timestamp):
+    if timestamp is None:
+        return None
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(timestamp))
+
+
+def parse(line):
+    """
+    Return the timestamp, permissions and fields (scontext, tcontext, tclass, comm, exe) of an AVC record, or None if line
+    isn't a denial.
+    """
+    m = PERMISSIONS_RE.search(line)
+    if m is None:
+        return None
+    m_time = TIMESTAMP_RE.search(line)
+    timestamp = float(m_time.group(1)) if m_time else None
+    fields = {}
+    for name, value in FIELD_RE.findall(line):
+        if value.startswith('"'):
+            value = value[1:-1]
+        elif name in ('comm', 'exe') and HEX_RE.fullmatch(value):
+            # auditd writes untrusted strings with spaces or special characters hex-encoded
+            value = bytes.fromhex(value).decode('utf-8', 'replace')
+        # Should a field appear twice, the first one belongs to the denial
+        fields.setdefault(name, value)
+    return timestamp, m.group(1).split(), fields
+
+
+class AvcScanner(LogScanner):
+    """
+    Scan audit logs for AVC denials, starting at the checkpoints.  See LogScanner.
+    """
+
+    def __init__(self, checkpoints=None, max_bytes=64 * 1024 * 1024):
+        super(AvcScanner, self).__init__(PATTERNS, checkpoints=checkpoints, max_bytes=max_bytes)
+        self.records = 0
+
+    def _add(self, path, line):
+        record = parse(line.decode('utf-8', 'replace'))
+        if record is None:
+            return
+        self.records += 1
+        timestamp, permissions, fields = record
+        for permission in permissions or ['?']:
+            key = (fields.get('scontext', '?'), fields.get('tcontext', '?'), fields.get('tclass', '?'), permission)
+            denial = self.matches.get(key)
+            if denial is None:
+                if len(self.matches) >= MAX_SIGNATURES:
+                    key = (OTHER, OTHER, OTHER, OTHER)
+                    denial = self.matches.get(key)
+                if denial is None:
+                    denial = self.matches[key] = Denial(*key)
+            denial.count += 1
+            if timestamp is not None:
+                if denial.first is None or timestamp < denial.first:
+                    denial.first = timestamp
+                if denial.last is None or timestamp > denial.last:
+                    denial.last = timestamp
+            # USER_AVC records name the executable instead of the command
+            comm = fields.get('comm', fields.get('exe'))
+            if comm is not None and comm not in denial.comms and len(denial.comms) < MAX_COMMS:
+                denial.comms.append(comm)
+
+    def results(self):
+        """
+        Return the aggregated denials, most frequent first.
+        """
+        return [d.as_dict() for d in sorted(self.matches.values(), key=lambda d: (-d.count, d.key))]
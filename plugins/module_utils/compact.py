@@ -0,0 +1,90 @@
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Compact encodings of large lists of strings (paths, authorized_keys lines) in module results.
+
+front_coded replaces the prefix every string shares with the previous one by its length, e.g.
+[/var/log/a.log, /var/log/b.log] becomes {encoding: front_coded, count: 2, data: [0, /var/log/a.log, 9, b.log]}.
+The order of the list is kept, so the savings depend on how many neighbours share a prefix, which is the case for the
+matches of a file system walk.  compressed additionally deflates the JSON of data and returns it base64 encoded.
+
+The encodings are expanded on the controller with the adfinis.maintenance.expand_compact filter.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import base64
+import json
+import zlib
+
+
+ENCODINGS = ['list', 'front_coded', 'compressed']
+
+
+def _common_prefix(a, b):
+    # Bisect with slice comparisons, which run in C, instead of comparing character by character in Python
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def front_code(items):
+    """
+    Return the flat list of prefix lengths and suffixes of items.
+    """
+    data = []
+    previous = ''
+    for item in items:
+        n = _common_prefix(previous, item)
+        data.append(n)
+        data.append(item[n:])
+        previous = item
+    return data
+
+
+def front_decode(data):
+    items = []
+    previous = ''
+    for i in range(0, len(data), 2):
+        previous = previous[:data[i]] + data[i + 1]
+        items.append(previous)
+    return items
+
+
+def encode(items, encoding):
+    """
+    Return items in the given encoding, a plain list with encoding list.
+    """
+    if encoding == 'list':
+        return list(items)
+    items = list(items)
+    data = front_code(items)
+    if encoding == 'compressed':
+        data = base64.b64encode(zlib.compress(json.dumps(data, separators=(',', ':')).encode('utf-8'))).decode('ascii')
+    elif encoding != 'front_coded':
+        raise ValueError('Unknown encoding: {}'.format(encoding))
+    return dict(encoding=encoding, count=len(items), data=data)
+
+
+def decode(value):
+    """
+    Return the list encoded by encode().  Plain lists are returned as they are.
+    """
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    if not isinstance(value, dict) or 'encoding' not in value:
+        raise ValueError('Not a compact encoded list')
+    data = value['data']
+    if value['encoding'] == 'compressed':
+        data = json.loads(zlib.decompress(base64.b64decode(data)).decode('utf-8'))
+    elif value['encoding'] != 'front_coded':
+        raise ValueError('Unknown encoding: {}'.format(value['encoding']))
+    return front_decode(data)
@@ -0,0 +1,145 @@
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Exclude lists of the find module, compiled into a single matcher.
+
+Matching a path against a list of regexes one by one costs a Python loop iteration per regex and path, which adds up
+with allow lists of a hundred entries and more.  Instead, the regexes are combined into one alternation, so each path
+is matched by a single call into the regex engine.  Plain path prefixes (e.g. "/var/lib/docker/" or "/boot/vmlinuz")
+are merged into a prefix tree first, so paths are compared against their common prefixes only once.
+
+Besides, the matcher tells which directories are excluded together with everything below them, so the walker doesn't
+need to descend into them at all.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import re
+
+
+# Characters with a special meaning in regexes; a backslash followed by a letter or digit is special as well
+SPECIAL = frozenset('.^$*+?{}[]|()')
+
+# Constructs whose outcome depends on the characters following the match, see ExcludeMatcher.prunes
+LOOKAHEAD_RE = re.compile(r'\$|\\[ZbB]|\(\?[=!]')
+
+# Constructs that change their meaning when the regex is embedded into an alternation
+UNCOMBINABLE_RE = re.compile(r'\\[1-9]|\(\?P=|\(\?\(|^\(\?[aiLmsux]+\)')
+
+
+def literal_prefix(pattern):
+    """
+    Split a regex into the literal text it starts with and the rest, e.g. "/var/lib/docker/.*" into "/var/lib/docker/"
+    and ".*".
+    """
+    literal = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        end = i + 1
+        if c == '\\':
+            if end == len(pattern) or pattern[end].isalnum():
+                break
+            c = pattern[end]
+            end += 1
+        elif c in SPECIAL:
+            break
+        if end < len(pattern) and pattern[end] in '*+?{':
+            # The quantifier applies to this character only, so it isn't part of the literal
+            break
+        literal.append(c)
+        i = end
+    return ''.join(literal), pattern[i:]
+
+
+def _trie_regex(literals):
+    """
+    Return a regex matching any of the literals, with common prefixes factored out, e.g. "/boot/(?:vmlinuz|init(?:rd|
+    ramfs))".  A literal that is a prefix of another one ends the tree, as the match only needs a prefix of the path.
+    """
+    trie = {}
+    for literal in literals:
+        node = trie
+        for c in literal:
+            if node.get('') is True:
+                break
+            node = node.setdefault(c, {})
+        else:
+            node.clear()
+            node[''] = True
+
+    def render(node):
+        if node.get('') is True:
+            return ''
+        branches = [re.escape(c) + render(child) for c, child in sorted(node.items())]
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+    return render(trie)
+
+
+def _combine(regexes):
+    if not regexes:
+        return None
+    if len(regexes) == 1:
+        return re.compile(regexes[0]).match
+    try:
+        return re.compile('|'.join('(?:{})'.format(r) for r in regexes)).match
+    except re.error:
+        # e.g. the same group name in several regexes
+        compiled = [re.compile(r).match for r in regexes]
+        return lambda path: any(match(path) is not None for match in compiled) or None
+
+
+class ExcludeMatcher:
+    """
+    A list of regexes, matched with re.match against whole paths.  match(path) returns a true value if any of them
+    matches, prunes(path) tells whether they match every path below the directory path.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        literals = []
+        regexes = []
+        separate = []
+        for pattern in self.patterns:
+            # Fail on invalid regexes just like matching them one by one would
+            re.compile(pattern)
+            literal, rest = literal_prefix(pattern)
+            if rest in ('', '.*'):
+                literals.append(literal)
+            elif UNCOMBINABLE_RE.search(pattern):
+                separate.append(re.compile(pattern).match)
+            else:
+                regexes.append(pattern)
+        if literals:
+            regexes.insert(0, _trie_regex(literals))
+        combined = _combine(regexes)
+        if combined is not None:
+            separate.insert(0, combined)
+
+        if not separate:
+            self.match = lambda path: None
+        elif len(separate) == 1:
+            self.match = separate[0]
+        else:
+            self.match = lambda path: any(match(path) is not None for match in separate) or None
+
+        # A regex that matches the path of a directory followed by a slash, without looking at what comes after, also
+        # matches every path below that directory.
+        prunable = [p for p in self.patterns if not LOOKAHEAD_RE.search(p) and not UNCOMBINABLE_RE.search(p)]
+        self._prune = _combine(prunable)
+
+    def __bool__(self):
+        return bool(self.patterns)
+
+    __nonzero__ = __bool__
+
+    def prunes(self, path):
+        """
+        Tell whether every path below the directory path is excluded, so there is no need to descend into it.
+        """
+        return self._prune is not None and self._prune(path + '/') is not None
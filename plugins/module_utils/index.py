@@ -0,0 +1,205 @@
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Persistent index of directory listings, which lets the native find engine skip reading directories that haven't
+changed since the previous run.
+
+Only the names and types of the directory entries are stored: these can only change by creating, removing or renaming
+entries, which always updates the mtime and ctime of the directory.  Attributes of the entries themselves (size, mtime,
+the target of symlinks, mount points) can change without touching the directory, so they are never taken from the
+index.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import gzip
+import json
+import os
+import stat
+import tempfile
+import threading
+import time
+
+
+INDEX_VERSION = 1
+
+# Directories modified less than this many nanoseconds before the walk started are not stored, since another
+# modification within the same timestamp granularity would go unnoticed.
+RACY_NS = 2 * 10 ** 9
+
+
+class CachedEntry:
+    """
+    Stand-in for os.DirEntry for entries listed from the index.  The type is known from the index, everything else is
+    looked up on demand.
+    """
+
+    def __init__(self, directory, name, dtype):
+        self.name = name
+        self.path = os.path.join(directory, name)
+        self._dtype = dtype
+        self._stat = {}
+
+    def stat(self, follow_symlinks=True):
+        follow_symlinks = follow_symlinks and self._dtype == 'l'
+        if follow_symlinks not in self._stat:
+            self._stat[follow_symlinks] = os.stat(self.path, follow_symlinks=follow_symlinks)
+        return self._stat[follow_symlinks]
+
+    def _is(self, dtype, predicate, follow_symlinks):
+        if self._dtype == 'l' and follow_symlinks:
+            try:
+                return predicate(self.stat().st_mode)
+            except OSError:
+                return False
+        if self._dtype == '?':
+            try:
+                return predicate(self.stat(False).st_mode)
+            except OSError:
+                return False
+        return self._dtype == dtype
+
+    def is_dir(self, follow_symlinks=True):
+        return self._is('d', stat.S_ISDIR, follow_symlinks)
+
+    def is_file(self, follow_symlinks=True):
+        return self._is('f', stat.S_ISREG, follow_symlinks)
+
+    def is_symlink(self):
+        return self._dtype == 'l'
+
+
+def _dtype(entry):
+    # DirEntry answers these from the dirent type, without a stat on most file systems
+    if entry.is_symlink():
+        return 'l'
+    elif entry.is_dir(follow_symlinks=False):
+        return 'd'
+    elif entry.is_file(follow_symlinks=False):
+        return 'f'
+    return '?'
+
+
+def _fadvise(fd, advice):
+    # posix_fadvise is only a hint, and not available on every platform
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(fd, 0, 0, getattr(os, advice))
+        except (OSError, AttributeError):
+            pass
+
+
+class DirectoryIndex:
+    """
+    Directory listings keyed by the device and inode of the directory, and only valid as long as the directory's mtime
+    and ctime are unchanged.
+
+    The index holds at most max_entries directory entries.  When saving, the directories that were used least recently
+    (i.e. in the oldest run) are evicted first, so that subtrees no longer searched drop out of the index.
+
+    With fadvise, the index file is dropped from the page cache after reading and writing it, so that it doesn't evict
+    the pages of other processes.
+    """
+
+    def __init__(self, path, max_entries=1000000, fadvise=False):
+        self.path = path
+        self.max_entries = max_entries
+        self.fadvise = fadvise
+        self.started = time.time_ns()
+        self.directories = {}
+        self.run = 0
+        # Looked up from the threads of a parallel walk
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self.changed = False
+
+    def load(self):
+        try:
+            with open(self.path, 'rb') as raw:
+                if self.fadvise:
+                    _fadvise(raw.fileno(), 'POSIX_FADV_SEQUENTIAL')
+                with gzip.open(raw, 'rt') as f:
+                    data = json.load(f)
+                if self.fadvise:
+                    _fadvise(raw.fileno(), 'POSIX_FADV_DONTNEED')
+        except (OSError, ValueError):
+            # Missing or corrupt index, start over
+            return
+        if data.get('version') != INDEX_VERSION:
+            return
+        self.run = data['run'] + 1
+        self.directories = data['directories']
+
+    def lookup(self, path, dirstat):
+        """
+        Return the entries of path, or None if the directory changed since it was indexed.
+        """
+        record = self.directories.get('{}:{}'.format(dirstat.st_dev, dirstat.st_ino))
+        if record is None or record[0] != dirstat.st_mtime_ns or record[1] != dirstat.st_ctime_ns:
+            with self.lock:
+                self.misses += 1
+            return None
+        with self.lock:
+            self.hits += 1
+        if record[2] != self.run:
+            record[2] = self.run
+            self.changed = True
+        names = record[3].split('/') if record[3] else []
+        return [CachedEntry(path, name, dtype) for name, dtype in zip(names, record[4])]
+
+    def store(self, dirstat, entries):
+        """
+        Index the entries of a directory.  Raises OSError if the type of an entry can't be determined, in which case
+        the directory is not indexed.
+        """
+        if dirstat.st_mtime_ns > self.started - RACY_NS or dirstat.st_ctime_ns > self.started - RACY_NS:
+            return
+        # File names can't contain slashes, which makes for a compact separator
+        self.directories['{}:{}'.format(dirstat.st_dev, dirstat.st_ino)] = [
+            dirstat.st_mtime_ns,
+            dirstat.st_ctime_ns,
+            self.run,
+            '/'.join(entry.name for entry in entries),
+            ''.join(_dtype(entry) for entry in entries),
+        ]
+        self.changed = True
+
+    def _evict(self):
+        size = sum(len(record[4]) for record in self.directories.values())
+        if size <= self.max_entries:
+            return
+        for key, record in sorted(self.directories.items(), key=lambda item: item[1][2]):
+            del self.directories[key]
+            self.evicted += 1
+            size -= len(record[4])
+            if size <= self.max_entries:
+                break
+
+    def save(self):
+        if not self.changed:
+            return
+        self._evict()
+        directory = os.path.dirname(self.path)
+        if not os.path.isdir(directory):
+            # The index reveals file names, keep it private
+            os.makedirs(directory, mode=0o700)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.find-index-')
+        try:
+            with os.fdopen(fd, 'wb') as raw:
+                with gzip.open(raw, 'wt') as f:
+                    json.dump(dict(version=INDEX_VERSION, run=self.run, directories=self.directories), f,
+                              separators=(',', ':'))
+                if self.fadvise:
+                    # Only clean pages can be dropped
+                    raw.flush()
+                    os.fdatasync(raw.fileno())
+                    _fadvise(raw.fileno(), 'POSIX_FADV_DONTNEED')
+            os.rename(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
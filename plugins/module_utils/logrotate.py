@@ -0,0 +1,145 @@
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Parsers for the logrotate state file and configuration, to tell which log files are managed by logrotate.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import glob
+import os
+import shlex
+
+
+# Files in included directories ending with these extensions are skipped by logrotate (see tabooext in man 8 logrotate)
+TABOOEXT = [',v', '.cfsaved', '.disabled', '.dpkg-bak', '.dpkg-del', '.dpkg-dist', '.dpkg-new', '.dpkg-old', '.dpkg-tmp',
+            '.rpmnew', '.rpmorig', '.rpmsave', '.swp', '.ucf-dist', '.ucf-new', '.ucf-old', '~']
+
+# Directives that start a script, which extends up to endscript and may contain braces
+SCRIPTS = ('prerotate', 'postrotate', 'firstaction', 'lastaction', 'preremove')
+
+# Maximum include depth, to stop include loops
+MAX_DEPTH = 16
+
+
+def read_status(path):
+    """
+    Return the set of files recorded in a logrotate state file.  Each line after the header holds a (usually quoted)
+    path, followed by the time it was last rotated.
+    """
+    files = set()
+    with open(path, 'r', errors='surrogateescape') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line or line.startswith('logrotate state'):
+                continue
+            if line.startswith('"'):
+                # Quotes and backslashes in the path are escaped with a backslash
+                name = []
+                escape = False
+                for c in line[1:]:
+                    if escape:
+                        name.append(c)
+                        escape = False
+                    elif c == '\\':
+                        escape = True
+                    elif c == '"':
+                        break
+                    else:
+                        name.append(c)
+                files.add(os.path.normpath(''.join(name)))
+            else:
+                files.add(os.path.normpath(line.split(' ', 1)[0]))
+    return files
+
+
+class LogrotateConfig:
+    """
+    Log file patterns of a logrotate configuration, including the files and directories it includes.
+    """
+
+    def __init__(self, path):
+        self.patterns = []
+        self.tabooext = list(TABOOEXT)
+        self.errors = []
+        self._parse(path, 0)
+
+    def _include(self, path, depth):
+        if os.path.isdir(path):
+            try:
+                names = sorted(os.listdir(path))
+            except OSError as e:
+                self.errors.append("'{}': {}".format(path, e.strerror))
+                return
+            for name in names:
+                included = os.path.join(path, name)
+                if name.startswith('.') or any(name.endswith(ext) for ext in self.tabooext):
+                    continue
+                if os.path.isfile(included):
+                    self._parse(included, depth + 1)
+        else:
+            self._parse(path, depth + 1)
+
+    def _parse(self, path, depth):
+        if depth > MAX_DEPTH:
+            self.errors.append("'{}': includes nested too deeply".format(path))
+            return
+        try:
+            with open(path, 'r', errors='surrogateescape') as f:
+                lines = f.read().splitlines()
+        except OSError as e:
+            self.errors.append("'{}': {}".format(path, e.strerror))
+            return
+
+        in_block = False
+        in_script = False
+        pending = []
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            words = line.split()
+            if in_script:
+                if words[0] == 'endscript':
+                    in_script = False
+                continue
+            if in_block:
+                if words[0] in SCRIPTS:
+                    in_script = True
+                elif line.startswith('}'):
+                    in_block = False
+                continue
+            if line[0].isalpha() and not pending:
+                # Global directive
+                if words[0] == 'include' and len(words) > 1:
+                    self._include(words[1], depth)
+                elif words[0] == 'tabooext' and len(words) > 1:
+                    extensions = [e for w in words[1:] for e in w.split(',') if e and e not in ('+', '-')]
+                    if words[1] == '+':
+                        self.tabooext.extend(extensions)
+                    else:
+                        self.tabooext = extensions
+                continue
+            # File patterns, possibly spanning several lines up to the opening brace
+            head, brace, tail = line.partition('{')
+            try:
+                pending.extend(shlex.split(head))
+            except ValueError:
+                pending.extend(head.split())
+            if brace:
+                self.patterns.extend(pending)
+                pending = []
+                in_block = not tail.strip().startswith('}')
+
+    def files(self):
+        """
+        Return the set of existing files matching the patterns.
+        """
+        files = set()
+        for pattern in self.patterns:
+            for path in glob.glob(os.path.expanduser(pattern)):
+                files.add(os.path.normpath(path))
+        return files
@@ -0,0 +1,256 @@
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Incremental log scanner, which only reads the bytes appended to a log file since the previous run.
+
+The position reached in each file is stored as checkpoint (device, inode and byte offset).  If the inode of a path
+changed, the file was rotated: the remainder of the old file is read from its new name (e.g. error.log.1) if it can be
+found next to the path, then the new file is read from the start.  If a file shrank below the checkpoint, it was
+truncated (e.g. by logrotate's copytruncate) and is read from the start as well.
+
+Files are read in chunks and matched with one precompiled regex per chunk, so memory use doesn't depend on the size
+of the files.  Matching lines are aggregated by signature, i.e. the line with timestamps, numbers, addresses and quoted
+strings masked.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import json
+import os
+import re
+import tempfile
+
+
+CHECKPOINT_VERSION = 1
+
+CHUNK_SIZE = 1024 * 1024
+
+# Distinct signatures kept per scan, further signatures are counted as OTHER
+MAX_SIGNATURES = 1000
+OTHER = '(other)'
+
+# Samples are cut to this many characters
+MAX_SAMPLE = 1000
+
+# Leading timestamps of nginx ("2026/10/18 10:00:00") and apache ("[Sun Oct 18 10:00:00.123456 2026]") error logs
+TIMESTAMP_RE = re.compile(r'^(?:\[[^\]]*\d\d:\d\d:\d\d[^\]]*\]|\d{4}[/-]\d\d[/-]\d\d[ T]\d\d:\d\d:\d\d\S*)\s*')
+
+# Variable parts of log messages, masked in signatures.  Quoted strings first, as they may contain anything.
+MASK_RES = [
+    (re.compile(r'"(?:[^"\\]|\\.)*"'), '"*"'),
+    (re.compile(r"'(?:[^'\\]|\\.)*'"), "'*'"),
+    (re.compile(r'\b(?:\d{1,3}\.){3}\d{1,3}(?::\d+)?\b'), 'IP'),
+    # IPv6 addresses, with a double colon or at least five groups to tell them apart from times
+    (re.compile(r'(?<![\w:])(?=[0-9a-fA-F:]*::|(?:[0-9a-fA-F]{1,4}:){4})[0-9a-fA-F]{0,4}(?::[0-9a-fA-F]{0,4}){2,7}(?![\w:])'),
+     'IP'),
+    (re.compile(r'\b0x[0-9a-fA-F]+\b'), 'N'),
+    (re.compile(r'\d+'), 'N'),
+]
+
+
+def signature(line):
+    """
+    Return line without its leading timestamp and with variable parts masked, to aggregate similar messages.
+    """
+    line = TIMESTAMP_RE.sub('', line)
+    for regex, mask in MASK_RES:
+        line = regex.sub(mask, line)
+    return line
+
+
+class Checkpoints:
+    """
+    Position reached in each log file, persisted as JSON.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.files = {}
+        self.changed = False
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # Missing or corrupt checkpoints, start over
+            return
+        if data.get('version') == CHECKPOINT_VERSION:
+            self.files = data['files']
+
+    def get(self, path):
+        """
+        Return the checkpoint of path as dict with dev, ino and offset, or None.
+        """
+        return self.files.get(path)
+
+    def set(self, path, dev, ino, offset):
+        checkpoint = dict(dev=dev, ino=ino, offset=offset)
+        if self.files.get(path) != checkpoint:
+            self.files[path] = checkpoint
+            self.changed = True
+
+    def save(self):
+        if self.path is None or not self.changed:
+            return
+        directory = os.path.dirname(self.path)
+        if not os.path.isdir(directory):
+            # Log file names may be sensitive, keep them private
+            os.makedirs(directory, mode=0o700)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.checkpoints-')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(dict(version=CHECKPOINT_VERSION, files=self.files), f, separators=(',', ':'))
+            os.rename(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+def _rotated(path, dev, ino):
+    """
+    Find the file that used to be at path by its inode, among the files in the same directory starting with its name.
+    """
+    directory, name = os.path.split(path)
+    try:
+        with os.scandir(directory or '.') as it:
+            for entry in it:
+                if entry.name != name and entry.name.startswith(name) and entry.inode() == ino:
+                    st = entry.stat(follow_symlinks=False)
+                    if st.st_dev == dev:
+                        return entry.path
+    except OSError:
+        pass
+    return None
+
+
+class Match:
+    """
+    Aggregated matches of one signature.
+    """
+
+    def __init__(self, signature):
+        self.signature = signature
+        self.count = 0
+        self.samples = []
+        self.files = []
+
+    def as_dict(self):
+        return dict(signature=self.signature, count=self.count, samples=self.samples, files=self.files)
+
+
+class LogScanner:
+    """
+    Scan log files for lines matching any of the patterns, starting at the checkpoints.  At most max_bytes are read per
+    file; if more were appended, only the newest max_bytes are read and the rest is skipped.
+    """
+
+    def __init__(self, patterns, checkpoints=None, max_bytes=64 * 1024 * 1024, samples=3, signature=signature):
+        # One combined regex searched through whole chunks lets the regex engine skip the non-matching lines, instead of
+        # looping over every line in Python
+        self.regex = re.compile(b'|'.join(b'(?:' + p.encode('utf-8', 'surrogateescape') + b')' for p in patterns))
+        self.checkpoints = checkpoints or Checkpoints()
+        self.max_bytes = max_bytes
+        self.samples = samples
+        self.signature = signature
+        self.matches = {}
+        self.files = []
+
+    def _add(self, path, line):
+        line = line.decode('utf-8', 'replace')
+        key = self.signature(line)
+        match = self.matches.get(key)
+        if match is None:
+            if len(self.matches) >= MAX_SIGNATURES:
+                key = OTHER
+                match = self.matches.get(key)
+            if match is None:
+                match = self.matches[key] = Match(key)
+        match.count += 1
+        if len(match.samples) < self.samples:
+            match.samples.append(line[:MAX_SAMPLE])
+        if path not in match.files:
+            match.files.append(path)
+
+    def _read(self, path, f, start, end, report):
+        """
+        Match the complete lines between start and end.  Returns the offset after the last complete line.
+        """
+        if end - start > self.max_bytes:
+            report['skipped'] += end - self.max_bytes - start
+            start = end - self.max_bytes
+        if start > 0:
+            # Continue at the next line, unless start is already at the beginning of one
+            f.seek(start - 1)
+            if f.read(1) != b'\n':
+                start = min(start + len(f.readline()), end)
+        f.seek(start)
+        offset = start
+        rest = b''
+        while offset < end:
+            chunk = f.read(min(CHUNK_SIZE, end - offset))
+            if not chunk:
+                break
+            offset += len(chunk)
+            chunk = rest + chunk
+            last = chunk.rfind(b'\n')
+            if last == -1:
+                rest = chunk
+                continue
+            rest = chunk[last + 1:]
+            pos = 0
+            while True:
+                m = self.regex.search(chunk, pos, last)
+                if m is None:
+                    break
+                line_start = chunk.rfind(b'\n', 0, m.start()) + 1
+                # The search ends at the last newline, so there always is one after the match
+                pos = chunk.find(b'\n', m.end())
+                self._add(path, chunk[line_start:pos])
+                pos += 1
+        report['scanned'] += offset - start - len(rest)
+        return offset - len(rest)
+
+    def scan(self, path):
+        """
+        Scan the new lines in path, and move its checkpoint past the last complete line.
+        """
+        report = dict(path=path, scanned=0, skipped=0, rotated=False, truncated=False)
+        self.files.append(report)
+        checkpoint = self.checkpoints.get(path)
+        try:
+            f = open(path, 'rb')
+        except OSError as e:
+            report['error'] = e.strerror
+            return report
+        with f:
+            st = os.fstat(f.fileno())
+            start = 0
+            if checkpoint is not None and (checkpoint['dev'], checkpoint['ino']) == (st.st_dev, st.st_ino):
+                start = checkpoint['offset']
+                if st.st_size < start:
+                    report['truncated'] = True
+                    start = 0
+            elif checkpoint is not None:
+                report['rotated'] = True
+                old = _rotated(path, checkpoint['dev'], checkpoint['ino'])
+                if old is not None:
+                    try:
+                        with open(old, 'rb') as r:
+                            size = os.fstat(r.fileno()).st_size
+                            if size >= checkpoint['offset']:
+                                self._read(old, r, checkpoint['offset'], size, report)
+                    except OSError:
+                        pass
+            offset = self._read(path, f, start, st.st_size, report)
+        self.checkpoints.set(path, st.st_dev, st.st_ino, offset)
+        return report
+
+    def results(self):
+        """
+        Return the aggregated matches, most frequent first.
+        """
+        return [m.as_dict() for m in sorted(self.matches.values(), key=lambda m: (-m.count, m.signature))]
@@ -0,0 +1,101 @@
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Cache of the output of read-only commands ("probes") on the target, shared by all roles of a run.
+
+A cached output is reused as long as it is younger than its TTL, the command line is the same and none of the input
+files of the probe (e.g. the unit or configuration files the output is derived from) changed.  Input files are
+compared by mtime and size, and glob patterns by the list of files they match, so added and removed files invalidate
+the output as well.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import glob
+import json
+import os
+import tempfile
+
+
+CACHE_VERSION = 1
+
+
+def input_state(patterns):
+    """
+    Return the state of the input files of a probe, as list of [path, mtime_ns, size].  Shell-style wildcards are
+    expanded, files that don't exist are listed with mtime_ns and size set to None.
+    """
+    paths = []
+    for pattern in patterns:
+        paths.extend(sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern])
+    state = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            state.append([path, None, None])
+            continue
+        state.append([path, st.st_mtime_ns, st.st_size])
+    return state
+
+
+class ProbeCache:
+    """
+    Outputs of probes by name, persisted as JSON.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.probes = {}
+        self.hits = 0
+        self.misses = 0
+        self.changed = False
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # Missing or corrupt cache, start over
+            return
+        if data.get('version') == CACHE_VERSION:
+            self.probes = data['probes']
+
+    def get(self, name, argv, inputs, now):
+        """
+        Return the cached output of a probe as dict with rc, stdout, stderr and time, or None if there is none or it
+        is stale.
+        """
+        record = self.probes.get(name)
+        if record is not None and record['argv'] == argv and record['inputs'] == inputs and now < record['expires']:
+            self.hits += 1
+            return record['output']
+        self.misses += 1
+        return None
+
+    def set(self, name, argv, inputs, ttl, output):
+        self.probes[name] = dict(argv=argv, inputs=inputs, expires=output['time'] + ttl, output=output)
+        self.changed = True
+
+    def save(self, now):
+        # Probes are not necessarily run on every run, so they are dropped once they expired rather than when unused
+        for name in [name for name, record in self.probes.items() if record['expires'] <= now]:
+            del self.probes[name]
+            self.changed = True
+        if self.path is None or not self.changed:
+            return
+        directory = os.path.dirname(self.path)
+        if not os.path.isdir(directory):
+            # The output of the probes may be sensitive, keep it private
+            os.makedirs(directory, mode=0o700)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.probes-')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(dict(version=CACHE_VERSION, probes=self.probes), f, separators=(',', ':'))
+            os.rename(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
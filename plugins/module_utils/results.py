@@ -0,0 +1,152 @@
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Collectors for the matches of the find module, which keep the memory usage bounded regardless of the number of matches.
+
+Every collector has an add(path, stat) method, which is called once per match, and a result() method returning the
+keys to merge into the module result.  needs_stat tells the caller whether add() expects a stat result or None, and
+ordered whether the order of the add() calls matters.
+
+With with_stat, the collectors also return the stat metadata of the matches they return, as list of dicts in files.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import heapq
+import itertools
+import os
+
+
+def stat_info(path, st):
+    """
+    Metadata returned per match with get_stat.
+    """
+    return dict(
+        path=path,
+        size=st.st_size,
+        blocks=st.st_blocks,
+        mtime=st.st_mtime,
+        uid=st.st_uid,
+        inode=st.st_ino,
+    )
+
+
+class FoundList:
+    """
+    Return the matches as list, optionally only the first limit ones.
+    """
+    ordered = True
+
+    def __init__(self, limit=None, with_stat=False):
+        self.limit = limit
+        self.needs_stat = with_stat
+        self.found = []
+        self.files = []
+        self.matched = 0
+
+    def add(self, path, st):
+        self.matched += 1
+        if self.limit is None or len(self.found) < self.limit:
+            self.found.append(path)
+            if self.needs_stat:
+                self.files.append(stat_info(path, st))
+
+    def result(self):
+        result = dict(
+            found=self.found,
+            matched=self.matched,
+            truncated=self.matched > len(self.found),
+        )
+        if self.needs_stat:
+            result['files'] = self.files
+        return result
+
+
+class _Descending:
+    """
+    Wraps a path, which then sorts in descending order.
+    """
+    __slots__ = ('path',)
+
+    def __init__(self, path):
+        self.path = path
+
+    def __eq__(self, other):
+        return self.path == other.path
+
+    def __lt__(self, other):
+        return self.path > other.path
+
+
+class TopN:
+    """
+    Return the n largest or most recently modified matches, sorted in descending order.
+    """
+    needs_stat = True
+    ordered = False
+
+    KEYS = {
+        'size': lambda st: st.st_size,
+        'mtime': lambda st: st.st_mtime,
+    }
+
+    def __init__(self, n, sort_by='size', with_stat=False):
+        self.n = n
+        self.key = self.KEYS[sort_by]
+        self.with_stat = with_stat
+        self.heap = []
+        self.matched = 0
+        # Unique tie breaker for duplicate paths, so that the stat results never need to be compared
+        self.counter = itertools.count()
+
+    def add(self, path, st):
+        self.matched += 1
+        # Ties are broken by keeping the smaller paths, so the result doesn't depend on the order of the matches, and
+        # is the start of the matches sorted by descending value and ascending path.  The heap is a min-heap, so of
+        # the matches with the smallest value, the one with the largest path is replaced first.
+        item = (self.key(st), _Descending(path), next(self.counter), st if self.with_stat else None)
+        if len(self.heap) < self.n:
+            heapq.heappush(self.heap, item)
+        elif item > self.heap[0]:
+            heapq.heapreplace(self.heap, item)
+
+    def result(self):
+        top = sorted(self.heap, key=lambda item: (-item[0], item[1].path))
+        result = dict(
+            found=[path.path for _, path, _, _ in top],
+            matched=self.matched,
+            truncated=self.matched > len(self.heap),
+        )
+        if self.with_stat:
+            result['files'] = [stat_info(path.path, st) for _, path, _, st in top]
+        return result
+
+
+class Summary:
+    """
+    Return only the number and total size of the matches per directory.
+    """
+    needs_stat = True
+    ordered = False
+
+    def __init__(self):
+        self.directories = {}
+        self.matched = 0
+
+    def add(self, path, st):
+        self.matched += 1
+        directory = self.directories.setdefault(os.path.dirname(path), [0, 0])
+        directory[0] += 1
+        directory[1] += st.st_size
+
+    def result(self):
+        return dict(
+            found=[],
+            matched=self.matched,
+            truncated=self.matched > 0,
+            summary={d: dict(count=count, bytes=size) for d, (count, size) in sorted(self.directories.items())},
+            total_bytes=sum(size for _, size in self.directories.values()),
+        )
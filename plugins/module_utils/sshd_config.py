@@ -0,0 +1,196 @@
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Minimal sshd_config evaluator, which resolves the authorized keys settings of many users from a single parse of the
+configuration, instead of running "sshd -T" once per user.
+
+Only the keywords in KEYWORDS are evaluated, and only Match blocks with User, Group and All criteria.  Whenever a user's
+result depends on anything else (e.g. Match Address), effective() raises Unsupported and the caller has to ask sshd.
+The configuration is expected to have been validated with "sshd -t" beforehand.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import fnmatch
+import glob
+import grp
+import os
+import re
+import shlex
+
+
+# Directory relative Include paths are resolved against
+SSHDIR = '/etc/ssh'
+
+# Evaluated keywords (lowercase) and their defaults
+KEYWORDS = {
+    'authorizedkeysfile': ['.ssh/authorized_keys', '.ssh/authorized_keys2'],
+    'authorizedkeyscommand': ['none'],
+    'authorizedkeyscommanduser': ['none'],
+}
+
+# Maximum Include depth, same as sshd
+MAX_DEPTH = 16
+
+
+class Unsupported(Exception):
+    """
+    The configuration uses constructs this evaluator doesn't handle.
+    """
+
+
+# The keyword ends at whitespace or at a single "=", i.e. "Keyword=value" is the same as "Keyword value"
+KEYWORD_RE = re.compile(r'^\s*([^\s=#]+)\s*=?\s*(.*)$')
+
+
+def _split(line):
+    match = KEYWORD_RE.match(line)
+    if match is None:
+        return []
+    lexer = shlex.shlex(match.group(2), posix=True)
+    lexer.whitespace_split = True
+    lexer.commenters = '#'
+    return [match.group(1)] + list(lexer)
+
+
+def _match_list(name, patterns):
+    """
+    Match name against a comma separated list of patterns.  Like match_pattern_list() in OpenSSH, return -1 if a negated
+    pattern matches, 1 if any other pattern matches and 0 otherwise.
+    """
+    found = 0
+    for pattern in patterns.split(','):
+        negated = pattern.startswith('!')
+        if fnmatch.fnmatchcase(name, pattern[1:] if negated else pattern):
+            if negated:
+                return -1
+            found = 1
+    return found
+
+
+class Criteria:
+    """
+    The criteria of a Match line.
+    """
+
+    def __init__(self, args):
+        self.all = False
+        self.users = []
+        self.groups = []
+        self.unsupported = []
+        args = list(args)
+        if [a.lower() for a in args] == ['all']:
+            self.all = True
+            return
+        while args:
+            criterion = args.pop(0).lower()
+            if not args:
+                raise Unsupported('Match {} without argument'.format(criterion))
+            value = args.pop(0)
+            if criterion == 'user':
+                self.users.append(value)
+            elif criterion == 'group':
+                self.groups.append(value)
+            else:
+                self.unsupported.append(criterion)
+
+    def matches(self, user, groups):
+        """
+        Whether the block applies to the user.  groups is a callable returning the names of the user's groups, so that
+        they are only looked up if needed.
+        """
+        if self.all:
+            return True
+        for patterns in self.users:
+            if _match_list(user, patterns) != 1:
+                return False
+        for patterns in self.groups:
+            # A negated pattern matching any of the groups excludes the user
+            matches = [_match_list(name, patterns) for name in groups()]
+            if -1 in matches or 1 not in matches:
+                return False
+        if self.unsupported:
+            raise Unsupported('Match {}'.format(', '.join(self.unsupported)))
+        return True
+
+
+class SshdConfig:
+    """
+    Parsed sshd_config.  settings is a list of (criteria, keyword, args) tuples in file order, with criteria None for
+    global settings.
+    """
+
+    def __init__(self, path):
+        self.settings = []
+        self._gids = {}
+        self._parse(path, None, 0)
+
+    def _parse(self, path, criteria, depth):
+        if depth > MAX_DEPTH:
+            raise Unsupported('Include nested too deeply')
+        # A Match block ends at the end of the included file, the surrounding block applies again afterwards
+        outer = criteria
+        with open(path, 'r') as f:
+            for line in f:
+                tokens = _split(line)
+                if not tokens:
+                    continue
+                keyword, args = tokens[0].lower(), tokens[1:]
+                if keyword == 'match':
+                    if outer is not None:
+                        raise Unsupported('Match in a file included from a Match block')
+                    criteria = Criteria(args)
+                elif keyword == 'include':
+                    for pattern in args:
+                        if not os.path.isabs(pattern):
+                            pattern = os.path.join(SSHDIR, pattern)
+                        for included in sorted(glob.glob(pattern)):
+                            self._parse(included, criteria, depth + 1)
+                elif keyword in KEYWORDS:
+                    self.settings.append((criteria, keyword, args))
+
+    def _groups(self, pwdent):
+        gids = os.getgrouplist(pwdent.pw_name, int(pwdent.pw_gid))
+        names = []
+        for gid in gids:
+            if gid not in self._gids:
+                try:
+                    self._gids[gid] = grp.getgrgid(gid).gr_name
+                except KeyError:
+                    self._gids[gid] = None
+            if self._gids[gid] is not None:
+                names.append(self._gids[gid])
+        return names
+
+    def effective(self, pwdent):
+        """
+        Return the effective value of KEYWORDS for the user, as dict keyword -> list of arguments.
+
+        Like sshd, the first value obtained for a keyword wins, but values from matching Match blocks override global
+        ones.
+        """
+        groups = []
+
+        def lookup_groups():
+            if not groups:
+                groups.append(self._groups(pwdent))
+            return groups[0]
+
+        values = {}
+        matched = {}
+        active = {}
+        for criteria, keyword, args in self.settings:
+            if criteria is None:
+                values.setdefault(keyword, args)
+                continue
+            if keyword in matched:
+                continue
+            if criteria not in active:
+                active[criteria] = criteria.matches(pwdent.pw_name, lookup_groups)
+            if active[criteria]:
+                matched.setdefault(keyword, args)
+        values.update(matched)
+        return {keyword: values.get(keyword, default) for keyword, default in KEYWORDS.items()}
@@ -0,0 +1,596 @@
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+In-process replacement for the subset of find(1) used by the find module.
+
+The predicates mimic GNU find as closely as possible, so the native engine of the find module returns the same result
+set as the subprocess engine, but evaluates everything (including the exclude regexes) during a single walk.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import fnmatch
+import functools
+import itertools
+import os
+import re
+import stat
+import threading
+import time
+
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from ansible_collections.adfinis.maintenance.plugins.module_utils.exclude import ExcludeMatcher
+
+
+# Units accepted by find -size, see man 1 find
+SIZE_UNITS = {
+    'c': 1,
+    'w': 2,
+    'b': 512,
+    'k': 1024,
+    'M': 1024 ** 2,
+    'G': 1024 ** 3,
+}
+
+# Type letters accepted by find -type, mapped to the corresponding stat predicate
+TYPE_PREDICATES = {
+    'f': stat.S_ISREG,
+    'd': stat.S_ISDIR,
+    'l': stat.S_ISLNK,
+    'b': stat.S_ISBLK,
+    'c': stat.S_ISCHR,
+    'p': stat.S_ISFIFO,
+    's': stat.S_ISSOCK,
+    'D': lambda mode: False,  # Doors only exist on Solaris
+}
+
+
+def _split_comparison(spec):
+    if spec[:1] in ('+', '-'):
+        return spec[0], spec[1:]
+    return '', spec
+
+
+def parse_size(spec):
+    """
+    Parse a find -size argument (e.g. "+16M") into a predicate on the apparent file size in bytes.
+
+    Just like find, the size is rounded up to the next unit before comparing, i.e. "-1M" only matches empty files.
+    """
+    comparison, value = _split_comparison(spec)
+    unit = SIZE_UNITS['b']
+    if value[-1:] in SIZE_UNITS:
+        unit = SIZE_UNITS[value[-1]]
+        value = value[:-1]
+    try:
+        n = int(value)
+    except ValueError:
+        raise ValueError('Invalid size "{}"'.format(spec))
+
+    def predicate(size):
+        units = -(-size // unit)
+        if comparison == '+':
+            return units > n
+        elif comparison == '-':
+            return units < n
+        return units == n
+    return predicate
+
+
+def parse_allocated_size(spec):
+    """
+    Like parse_size, but the predicate takes a stat result and compares the space allocated on disk rather than the
+    apparent size, so that sparse files (e.g. /var/log/lastlog) aren't mistaken for large files.
+    """
+    predicate = parse_size(spec)
+    # st_blocks is always in 512 byte units, regardless of the file system block size
+    return lambda st: predicate(st.st_blocks * 512)
+
+
+def parse_age(spec, now):
+    """
+    Parse a find -mmin argument (e.g. "-20160") into a predicate on the modification time.
+    """
+    comparison, value = _split_comparison(spec)
+    try:
+        reftime = now - float(value) * 60
+    except ValueError:
+        raise ValueError('Invalid age "{}"'.format(spec))
+
+    def predicate(mtime):
+        if comparison == '+':
+            return mtime < reftime
+        elif comparison == '-':
+            return mtime > reftime
+        return reftime <= mtime < reftime + 60
+    return predicate
+
+
+class _Root:
+    """
+    Stand-in for os.DirEntry for the starting points of the walk, which are not returned by os.scandir.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path.rstrip('/')) or path
+        self._stat = {}
+
+    def stat(self, follow_symlinks=True):
+        if follow_symlinks not in self._stat:
+            self._stat[follow_symlinks] = os.stat(path=self.path, follow_symlinks=follow_symlinks)
+        return self._stat[follow_symlinks]
+
+    def _is(self, predicate, follow_symlinks):
+        try:
+            return predicate(self.stat(follow_symlinks).st_mode)
+        except OSError:
+            return False
+
+    def is_dir(self, follow_symlinks=True):
+        return self._is(stat.S_ISDIR, follow_symlinks)
+
+    def is_file(self, follow_symlinks=True):
+        return self._is(stat.S_ISREG, follow_symlinks)
+
+    def is_symlink(self):
+        return self._is(stat.S_ISLNK, False)
+
+
+def _key(st):
+    return st.st_dev, st.st_ino
+
+
+def _outermost(paths):
+    """
+    Return the paths that are not below another one of paths, in their order.
+    """
+    return [path for path in paths
+            if not any(path.startswith(other.rstrip('/') + '/') for other in paths if other != path)]
+
+
+def _type_predicate(typ, stat, follow):
+    # Regular files, directories and (unfollowed) symlinks can be told apart from the dirent type without a stat
+    if typ == 'f':
+        return lambda entry: entry.is_file(follow_symlinks=follow)
+    elif typ == 'd':
+        return lambda entry: entry.is_dir(follow_symlinks=follow)
+    elif typ == 'l' and not follow:
+        return lambda entry: entry.is_symlink()
+    predicate = TYPE_PREDICATES[typ]
+    return lambda entry: predicate(stat(entry).st_mode)
+
+
+class Query:
+    """
+    The predicates of one search: an entry is returned if it matches all of them.  prune and xdev limit which
+    subdirectories the query descends into.  With follow, symlinks are followed, both for the predicates and to
+    descend into the directories they point to.  paths are the start points of the query, if it is walked together
+    with others (see Walker.walk_queries).
+    """
+
+    def __init__(self, pattern=None, prune=None, types=None, xdev=False, size=None, age=None, exclude=None,
+                 allocated_size=None, paths=None, now=None, follow=False):
+        self.pattern = re.compile(fnmatch.translate(pattern)).match if pattern is not None else None
+        self.prune = None
+        if prune:
+            # find -path matches the whole path, with wildcards also matching slashes, just like fnmatch does
+            self.prune = re.compile('|'.join(fnmatch.translate(p) for p in prune)).match
+        for typ in types or []:
+            if typ not in TYPE_PREDICATES:
+                raise ValueError('Unknown type "{}"'.format(typ))
+        self.types = types
+        self.xdev = xdev
+        self.follow = follow
+        self.size = parse_size(size) if size is not None else None
+        self.age = parse_age(age, now or time.time()) if age is not None else None
+        self.allocated_size = parse_allocated_size(allocated_size) if allocated_size is not None else None
+        self.exclude = ExcludeMatcher(exclude or [])
+        # Directories whose whole subtree is excluded aren't descended into
+        self.excluded_dir = self.exclude.prunes if self.exclude else None
+        self.paths = paths or []
+
+    def matcher(self, stat):
+        """
+        Return a function telling whether an entry matches all predicates.  stat returns the stat result of an entry,
+        following symlinks if the query follows them.
+        """
+        # Everything the function needs is bound to local variables, which are faster to look up than attributes
+        pattern, size, age, allocated_size = self.pattern, self.size, self.age, self.allocated_size
+        exclude = self.exclude.match if self.exclude else None
+        types = [_type_predicate(t, stat, self.follow) for t in self.types] if self.types else None
+        needs_stat = size is not None or age is not None or allocated_size is not None
+
+        def matches(entry):
+            if pattern is not None and pattern(entry.name) is None:
+                return False
+            if types is not None and not any(predicate(entry) for predicate in types):
+                return False
+            if needs_stat:
+                st = stat(entry)
+                if size is not None and not size(st.st_size):
+                    return False
+                if age is not None and not age(st.st_mtime):
+                    return False
+                if allocated_size is not None and not allocated_size(st):
+                    return False
+            if exclude is not None and exclude(entry.path) is not None:
+                return False
+            return True
+        return matches
+
+
+class Throttle:
+    """
+    Limit the rate of an operation to rate per second, shared by all threads calling it.  Each call reserves the next
+    slot, and sleeps once the reserved slot is at least MIN_SLEEP ahead, so that high rates don't sleep for every call.
+    Time left unused (e.g. while matches are processed) isn't saved up for bursts later on.
+    """
+
+    MIN_SLEEP = 0.01
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self.lock = threading.Lock()
+        self.next = time.monotonic()
+        # Seconds slept, summed over all threads
+        self.slept = 0.0
+
+    def __call__(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next, now)
+            self.next = slot + self.interval
+        delay = slot - now
+        if delay >= self.MIN_SLEEP:
+            time.sleep(delay)
+            with self.lock:
+                self.slept += delay
+
+
+class Walker:
+    """
+    Walk one or more directory trees and yield the paths matching all predicates, in the same order as find would.
+    With with_stat, the stat result of each match (following symlinks if follow is set) is returned as well.
+
+    Instead of a single set of predicates, several queries (see Query) can be given, which are all evaluated during a
+    single walk of the union of their start points, see walk_queries.  follow is then set per query as well.
+
+    Errors that would make find exit with a non-zero status (e.g. unreadable directories or file system loops) don't
+    abort the walk, but are collected in the errors attribute.
+
+    With parallelism > 1, the start points and subdirectories are walked concurrently by a pool of threads.  os.scandir
+    and os.stat release the GIL, so this pays off whenever the walk waits for the disks rather than the CPU.
+
+    If an index (see module_utils.index) is given, unchanged directories are listed from the index instead of being
+    read from disk.
+
+    With max_rate, at most max_rate directories per second are read from disk (see Throttle), to limit the I/O load the
+    walk puts on a busy system.  Directories listed from the index don't count.
+    """
+
+    def __init__(self, pattern=None, prune=None, types=None, xdev=False, size=None, age=None, follow=False,
+                 exclude=None, parallelism=1, with_stat=False, allocated_size=None, index=None, queries=None,
+                 max_rate=None):
+        if queries is None:
+            queries = [Query(pattern=pattern, prune=prune, types=types, xdev=xdev, size=size, age=age, exclude=exclude,
+                             allocated_size=allocated_size, follow=follow)]
+        self.queries = queries
+        # Whether any query follows symlinks, only those descend into the directories symlinks point to
+        self.follow = any(query.follow for query in queries)
+        self._matchers = [query.matcher(functools.partial(self._stat, follow=query.follow)) for query in queries]
+        self._matched = [(i,) for i in range(len(queries))]
+        self.parallelism = parallelism
+        self.with_stat = with_stat
+        self.index = index
+        self.throttle = Throttle(max_rate) if max_rate else None
+        self.errors = []
+        # Start points of the queries by normalized path, only used by walk_queries
+        self._roots = {}
+        self._reached = set()
+
+    def _error(self, path, e):
+        self.errors.append("'{}': {}".format(path, e.strerror or e))
+
+    def _stat(self, entry, follow):
+        # With follow, broken symlinks are reported as the link itself, just like find -L does
+        try:
+            return entry.stat(follow_symlinks=follow)
+        except OSError:
+            if not follow:
+                raise
+            return entry.stat(follow_symlinks=False)
+
+    def _visit(self, entry, ancestors, active):
+        """
+        Evaluate a single entry.  active holds a (query index, device of its start point) pair for every query the
+        entry is subject to.  Returns the stat result of the directory to descend into (or None), the queries to
+        descend with, and the indexes of the queries the entry matches.
+        """
+        try:
+            if entry.path in self._roots:
+                # A start point of some queries inside the tree of others, which is walked as part of it
+                self._reached.add(entry.path)
+                queries = self._roots[entry.path]
+                active = tuple(pair for pair in active if pair[0] not in queries) + \
+                    tuple((q, self._stat(entry, self.queries[q].follow).st_dev) for q in queries)
+            matched = []
+            descend = []
+            for pair in active:
+                query = self.queries[pair[0]]
+                if query.prune is not None and query.prune(entry.path) is not None:
+                    continue
+                if self._matchers[pair[0]](entry):
+                    matched.append(pair[0])
+                descend.append(pair)
+            if not descend:
+                return None, (), matched
+            if not entry.is_dir(follow_symlinks=False):
+                # Symlinks to directories are only descended into by the queries following them
+                if not self.follow or not entry.is_dir():
+                    return None, (), matched
+                descend = [pair for pair in descend if self.queries[pair[0]].follow]
+            descend = [pair for pair in descend
+                       if self.queries[pair[0]].excluded_dir is None or not self.queries[pair[0]].excluded_dir(entry.path)]
+            if not descend:
+                return None, (), matched
+            # The same as lstat for directories, and only the queries following symlinks are left for symlinks
+            st = self._stat(entry, self.follow)
+        except OSError as e:
+            self._error(entry.path, e)
+            return None, (), ()
+        for pair in descend:
+            if self.queries[pair[0]].xdev and st.st_dev != pair[1]:
+                descend = tuple(pair for pair in descend if not self.queries[pair[0]].xdev or st.st_dev == pair[1])
+                if not descend:
+                    return None, (), matched
+                break
+        if _key(st) in ancestors:
+            self.errors.append("File system loop detected; '{}' is part of the same file system loop".format(entry.path))
+            return None, (), matched
+        return st, descend, matched
+
+    def _visit_one(self, entry, ancestors, active):
+        """
+        Same as _visit for a single query, which is by far the most common case, without the bookkeeping for several.
+        """
+        q, rootdev = active[0]
+        query = self.queries[q]
+        if query.prune is not None and query.prune(entry.path) is not None:
+            return None, (), ()
+        try:
+            matched = self._matched[q] if self._matchers[q](entry) else ()
+            if not entry.is_dir(follow_symlinks=query.follow):
+                return None, (), matched
+            if query.excluded_dir is not None and query.excluded_dir(entry.path):
+                return None, (), matched
+            st = self._stat(entry, query.follow)
+        except OSError as e:
+            self._error(entry.path, e)
+            return None, (), ()
+        if query.xdev and st.st_dev != rootdev:
+            return None, (), matched
+        if _key(st) in ancestors:
+            self.errors.append("File system loop detected; '{}' is part of the same file system loop".format(entry.path))
+            return None, (), matched
+        return st, active, matched
+
+    def walk(self, paths):
+        """
+        Return an iterator over (path, stat) tuples for all matches below (and including) paths.  stat is None unless
+        the walker was created with with_stat.
+        """
+        for path, stats, _ in self._walk(paths, True):
+            yield path, stats[0] if stats is not None else None
+
+    def walk_into(self, paths, add, ordered=True):
+        """
+        Walk paths and call add(path, stat) for every match.  If the order of the matches doesn't matter, parallel
+        workers call add (while holding a lock) as soon as they find a match, rather than holding on to their matches
+        until they can be returned in order.
+        """
+        self._walk_into(paths, True, lambda path, stats, matched: add(path, stats[0] if stats is not None else None),
+                        ordered)
+
+    def walk_queries(self, adds, ordered=True):
+        """
+        Walk the start points of all queries at once, and call adds[i](path, stat) for every match of the i-th query.
+
+        Start points below the start point of another query are not walked separately, but the walk of the outer one
+        evaluates their queries too, once it reaches them.  Matches are thus returned only once per query, in the order
+        of the walk, and with the path as reached from the outer start point.
+        """
+        self._roots = {}
+        for i, query in enumerate(self.queries):
+            for path in query.paths:
+                queries = self._roots.setdefault(os.path.normpath(path), [])
+                if i not in queries:
+                    queries.append(i)
+        self._reached = set()
+
+        def emit(path, stats, matched):
+            for n, i in enumerate(matched):
+                adds[i](path, stats[n] if stats is not None else None)
+        missed = list(self._roots)
+        while missed:
+            outer = _outermost(missed)
+            self._walk_into(outer, False, emit, ordered)
+            # Start points the walk didn't reach, e.g. because the outer queries pruned a directory above them.  Only
+            # the outermost of them are walked in the next round, the ones below are reached by that walk, unless it
+            # is pruned above them again.
+            missed = [path for path in missed if path not in outer and path not in self._reached]
+
+    def _walk_into(self, paths, single, emit, ordered):
+        if self.parallelism > 1 and not ordered:
+            for _ in self._walk_parallel(paths, single, emit):
+                pass
+            return
+        for item in self._walk(paths, single):
+            emit(*item)
+
+    def _walk(self, paths, single):
+        if self.parallelism > 1:
+            return self._walk_parallel(paths, single)
+        return self._walk_serial(paths, single)
+
+    def _item(self, entry, matched):
+        """
+        Return the path of a match, the stat results for the queries it matches (following symlinks per query) and the
+        indexes of these queries.
+        """
+        if not self.with_stat:
+            return entry.path, None, matched
+        try:
+            return entry.path, tuple(self._stat(entry, self.queries[i].follow) for i in matched), matched
+        except OSError as e:
+            self._error(entry.path, e)
+            return None
+
+    def _start(self, path, single):
+        """
+        Evaluate a start point.  With single, the start point belongs to the only query, otherwise its queries are
+        looked up by its path.  Returns the start point, the stat result of the directory to descend into (or None),
+        the queries to descend with and the indexes of the queries the start point matches.
+        """
+        root = _Root(path)
+        active = ()
+        if single:
+            try:
+                active = ((0, self._stat(root, self.queries[0].follow).st_dev),)
+            except OSError as e:
+                self._error(path, e)
+                return root, None, (), []
+        # Start points are never followed by queries without follow, find -P behaves the same
+        dirstat, active, matched = self._visit(root, [], active)
+        return root, dirstat, active, matched
+
+    def _walk_serial(self, paths, single):
+        for path in paths:
+            root, dirstat, active, matched = self._start(path, single)
+            entries = [(root, matched)] if matched else []
+            if dirstat is not None:
+                entries = itertools.chain(entries, self._walk_tree(path, dirstat, [_key(dirstat)], active))
+            for entry, matched in entries:
+                item = self._item(entry, matched)
+                if item is not None:
+                    yield item
+
+    def _walk_tree(self, path, dirstat, ancestors, active, offload=None):
+        """
+        Yield the matching entries below path and the queries they match, in the order find would print them.  dirstat
+        is the stat result of path, ancestors must contain the (dev, ino) of path and of all directories above it up to
+        the start point, active the queries to evaluate below path (see _visit).
+
+        If offload is given, it is called for every subdirectory, and may return a placeholder (e.g. a future) that is
+        yielded instead of walking the subdirectory.
+        """
+        # Iterative depth-first walk; each stack frame holds the remaining entries of a directory and its queries
+        stack = [(self._scandir(path, dirstat), active)]
+        while stack:
+            entries, active = stack[-1]
+            visit = self._visit_one if len(active) == 1 and not self._roots else self._visit
+            for entry in entries:
+                dirstat, descend, matched = visit(entry, ancestors, active)
+                if matched:
+                    yield entry, matched
+                if dirstat is not None:
+                    placeholder = None
+                    if offload is not None:
+                        placeholder = offload(entry.path, dirstat, ancestors + [_key(dirstat)], descend)
+                    if placeholder is not None:
+                        yield placeholder, None
+                        continue
+                    ancestors.append(_key(dirstat))
+                    stack.append((self._scandir(entry.path, dirstat), descend))
+                    break
+            else:
+                stack.pop()
+                ancestors.pop()
+
+    def _walk_parallel(self, paths, single, emit=None):
+        """
+        Walk the start points, and subdirectories whenever a worker is idle, in a thread pool.  The workers don't return
+        plain lists of matches, but lists with futures in place of the subtrees walked by other workers, which are
+        flattened at the end.  This keeps the output in the same order as a serial walk.
+
+        If emit is given, the workers pass their matches to emit right away and only return the futures.
+        """
+        lock = threading.Lock()
+        pending = [0]
+
+        def collect(entries):
+            chunks = []
+            for entry, matched in entries:
+                if isinstance(entry, Future):
+                    chunks.append(entry)
+                    continue
+                item = self._item(entry, matched)
+                if item is None:
+                    continue
+                if emit is None:
+                    chunks.append(item)
+                else:
+                    with lock:
+                        emit(*item)
+            return chunks
+
+        def task(path, dirstat, ancestors, active):
+            try:
+                return collect(self._walk_tree(path, dirstat, ancestors, active, offload))
+            finally:
+                with lock:
+                    pending[0] -= 1
+
+        def offload(path, dirstat, ancestors, active):
+            with lock:
+                if pending[0] >= self.parallelism:
+                    return None
+                pending[0] += 1
+            return pool.submit(task, path, dirstat, ancestors, active)
+
+        with ThreadPoolExecutor(max_workers=self.parallelism) as pool:
+            chunks = []
+            for path in paths:
+                root, dirstat, active, matched = self._start(path, single)
+                if matched:
+                    chunks.extend(collect([(root, matched)]))
+                if dirstat is not None:
+                    with lock:
+                        pending[0] += 1
+                    chunks.append(pool.submit(task, path, dirstat, [_key(dirstat)], active))
+
+            stack = [iter(chunks)]
+            while stack:
+                for chunk in stack[-1]:
+                    if isinstance(chunk, Future):
+                        stack.append(iter(chunk.result()))
+                        break
+                    yield chunk
+                else:
+                    stack.pop()
+
+    def _scandir(self, path, dirstat):
+        if self.index is not None:
+            entries = self.index.lookup(path, dirstat)
+            if entries is not None:
+                return iter(entries)
+        if self.throttle is not None:
+            self.throttle()
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError as e:
+            self._error(path, e)
+            return iter(())
+        if self.index is not None:
+            try:
+                self.index.store(dirstat, entries)
+            except OSError:
+                # The type of an entry couldn't be looked up, e.g. because it was removed in the meantime.  The entry
+                # is reported (if at all) when it is visited, and the directory is just not indexed.
+                pass
+        return iter(entries)
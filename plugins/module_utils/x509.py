@@ -0,0 +1,236 @@
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Minimal X.509 certificate reader, which extracts the fields needed to audit certificate expiry without depending on
+openssl or the cryptography library on the target.
+
+Only the outer structure of the certificate is decoded (serial, issuer, validity and subject of the TBSCertificate),
+signatures are not verified.  Parsed certificates are plain dicts, so they can be cached as JSON.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import base64
+import binascii
+import calendar
+import json
+import os
+import re
+import tempfile
+import time
+
+
+PEM_RE = re.compile(r'-----BEGIN (?:X509 |TRUSTED )?CERTIFICATE-----\s*(.*?)-----END (?:X509 |TRUSTED )?CERTIFICATE-----',
+                    re.DOTALL)
+
+# Attribute types commonly found in distinguished names, rendered like openssl does
+NAME_ATTRIBUTES = {
+    '2.5.4.3': 'CN',
+    '2.5.4.5': 'serialNumber',
+    '2.5.4.6': 'C',
+    '2.5.4.7': 'L',
+    '2.5.4.8': 'ST',
+    '2.5.4.10': 'O',
+    '2.5.4.11': 'OU',
+    '1.2.840.113549.1.9.1': 'emailAddress',
+}
+
+CACHE_VERSION = 1
+
+TAG_INTEGER = 0x02
+TAG_UTCTIME = 0x17
+TAG_GENERALIZEDTIME = 0x18
+TAG_BMPSTRING = 0x1e
+TAG_SEQUENCE = 0x30
+
+
+class DERError(ValueError):
+    """
+    The data is not a DER encoded certificate.
+    """
+
+
+def _tlv(data, offset):
+    """
+    Decode the DER element at offset.  Returns its tag, the offset of its value and the offset after it.
+    """
+    try:
+        tag = data[offset]
+        length = data[offset + 1]
+        offset += 2
+        if length & 0x80:
+            count = length & 0x7f
+            if count == 0 or count > 4:
+                raise DERError('unsupported length encoding')
+            length = int.from_bytes(data[offset:offset + count], 'big')
+            offset += count
+    except IndexError:
+        raise DERError('truncated data')
+    if offset + length > len(data):
+        raise DERError('truncated data')
+    return tag, offset, offset + length
+
+
+def _children(data, start, end):
+    while start < end:
+        tag, value, start = _tlv(data, start)
+        yield tag, value, start
+
+
+def _oid(value):
+    first = value[0]
+    parts = [min(first // 40, 2), first - 40 * min(first // 40, 2)]
+    n = 0
+    for byte in value[1:]:
+        n = (n << 7) | (byte & 0x7f)
+        if not byte & 0x80:
+            parts.append(n)
+            n = 0
+    return '.'.join(str(p) for p in parts)
+
+
+def _string(tag, value):
+    if tag == TAG_BMPSTRING:
+        return value.decode('utf-16-be', errors='replace')
+    return value.decode('utf-8', errors='replace')
+
+
+def _name(data, start, end):
+    """
+    Render an X.501 Name as comma separated list of attributes, e.g. "CN=example.org,O=Example".
+    """
+    parts = []
+    for _, rdn_start, rdn_end in _children(data, start, end):
+        for _, atv_start, atv_end in _children(data, rdn_start, rdn_end):
+            (_, oid_start, oid_end), (tag, value_start, value_end) = list(_children(data, atv_start, atv_end))[:2]
+            oid = _oid(data[oid_start:oid_end])
+            parts.append('{}={}'.format(NAME_ATTRIBUTES.get(oid, oid), _string(tag, data[value_start:value_end])))
+    return ','.join(parts)
+
+
+def _time(tag, value):
+    text = value.decode('ascii')
+    if tag == TAG_UTCTIME:
+        # Two digit years 50-99 are 1950-1999 (RFC 5280, 4.1.2.5.1)
+        year = int(text[:2])
+        text = ('19' if year >= 50 else '20') + text
+    elif tag != TAG_GENERALIZEDTIME:
+        raise DERError('invalid time')
+    return calendar.timegm(time.strptime(text[:14], '%Y%m%d%H%M%S'))
+
+
+def parse_der(data):
+    """
+    Parse a DER encoded certificate into a dict with serial (hex), issuer, subject, not_before and not_after (seconds
+    since the epoch).
+    """
+    tag, cert_start, cert_end = _tlv(data, 0)
+    if tag != TAG_SEQUENCE:
+        raise DERError('not a certificate')
+    tag, tbs_start, tbs_end = _tlv(data, cert_start)
+    if tag != TAG_SEQUENCE:
+        raise DERError('not a certificate')
+    fields = list(_children(data, tbs_start, tbs_end))
+    # The version is optional, and tagged [0]
+    if fields and fields[0][0] == 0xa0:
+        fields = fields[1:]
+    if len(fields) < 5 or fields[0][0] != TAG_INTEGER:
+        raise DERError('not a certificate')
+    serial, _, issuer, validity, subject = fields[:5]
+    times = list(_children(data, validity[1], validity[2]))
+    if len(times) != 2:
+        raise DERError('invalid validity')
+    return dict(
+        serial=format(int.from_bytes(data[serial[1]:serial[2]], 'big', signed=True), 'x'),
+        issuer=_name(data, issuer[1], issuer[2]),
+        subject=_name(data, subject[1], subject[2]),
+        not_before=_time(times[0][0], data[times[0][1]:times[0][2]]),
+        not_after=_time(times[1][0], data[times[1][1]:times[1][2]]),
+    )
+
+
+def parse_pem(text):
+    """
+    Parse all certificates in a PEM file, in the order they appear.  Raises DERError if any of them is invalid.
+    """
+    certificates = []
+    for block in PEM_RE.findall(text):
+        try:
+            der = base64.b64decode(''.join(block.split()), validate=True)
+        except (binascii.Error, ValueError):
+            raise DERError('invalid base64')
+        try:
+            certificates.append(parse_der(der))
+        except (IndexError, UnicodeDecodeError, ValueError) as e:
+            raise DERError(str(e))
+    return certificates
+
+
+class CertificateCache:
+    """
+    Parsed certificate files, keyed by inode and invalidated by mtime, ctime and size.  Files reachable by several
+    paths (e.g. symlinks in /etc/ssl/certs) are only parsed once, and if a path is given, the cache is kept across runs.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.files = {}
+        self.hits = 0
+        self.misses = 0
+        self.changed = False
+        self._used = set()
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # Missing or corrupt cache, start over
+            return
+        if data.get('version') == CACHE_VERSION:
+            self.files = data['files']
+
+    def read(self, path):
+        """
+        Return the certificates in path, and the reason they couldn't be parsed (or None).  Raises OSError if the file
+        can't be read.
+        """
+        st = os.stat(path)
+        key = '{}:{}'.format(st.st_dev, st.st_ino)
+        self._used.add(key)
+        record = self.files.get(key)
+        if record is not None and record[:3] == [st.st_mtime_ns, st.st_ctime_ns, st.st_size]:
+            self.hits += 1
+            return record[3], record[4]
+        self.misses += 1
+        with open(path, 'r', errors='replace') as f:
+            text = f.read()
+        try:
+            certificates, error = parse_pem(text), None
+        except DERError as e:
+            certificates, error = [], str(e)
+        self.files[key] = [st.st_mtime_ns, st.st_ctime_ns, st.st_size, certificates, error]
+        self.changed = True
+        return certificates, error
+
+    def save(self):
+        # Only keep the files of this run, so the cache doesn't grow with certificates that were replaced
+        for key in set(self.files) - self._used:
+            del self.files[key]
+            self.changed = True
+        if self.path is None or not self.changed:
+            return
+        directory = os.path.dirname(self.path)
+        if not os.path.isdir(directory):
+            os.makedirs(directory, mode=0o700)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix='.certificates-')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(dict(version=CACHE_VERSION, files=self.files), f, separators=(',', ':'))
+            os.rename(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
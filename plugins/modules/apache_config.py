@@ -0,0 +1,161 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+DOCUMENTATION = r'''
+---
+module: apache_config
+
+short_description: Read log and certificate paths from the Apache httpd configuration
+
+# version_added describes the collection version in which this module was added, don't adjust this value
+version_added: "0.1.0"
+
+description:
+  - Parse the main Apache httpd configuration file, follow its Include and IncludeOptional directives, and return the
+    configured log files and certificates.
+  - Variables (C(${VAR})) are expanded from Define directives and from I(envvars), without running a shell.
+  - Every configuration file is only read once, even if it is matched by several Include directives.
+  - Conditional sections such as <IfModule> are not evaluated, i.e. directives are returned even if they are disabled
+    by a condition.
+
+options:
+    config:
+        description: Path to the main configuration file, e.g. /etc/apache2/apache2.conf
+        required: true
+        type: path
+    server_root:
+        description:
+          - Directory relative paths are resolved against (HTTPD_ROOT in the output of apachectl -V).
+          - Defaults to the directory of I(config), unless the configuration sets ServerRoot.
+        required: false
+        default: null
+        type: path
+    envvars:
+        description:
+          - Shell script defining the environment of Apache, e.g. /etc/apache2/envvars on Debian.  Only plain variable
+            assignments outside of conditionals are evaluated.
+          - Set to an empty string if there is none.
+        required: false
+        default: ""
+        type: path
+
+author:
+    - Adfinis AG (@adfinis)
+'''
+
+
+EXAMPLES = r'''
+- name: Read the log and certificate paths
+  adfinis.maintenance.apache_config:
+    config: /etc/apache2/apache2.conf
+    server_root: /etc/apache2
+    envvars: /etc/apache2/envvars
+  register: apache_config
+'''
+
+
+RETURN = r'''
+files:
+  description: Configuration files that were read, in the order they were included
+  type: list
+  returned: always
+  sample:
+    - /etc/apache2/apache2.conf
+    - /etc/apache2/sites-enabled/000-default.conf
+error_logs:
+  description: Paths of all ErrorLog directives, without piped and syslog logs
+  type: list
+  returned: always
+  sample:
+    - /var/log/apache2/error.log
+custom_logs:
+  description: Paths of all CustomLog and TransferLog directives, without piped logs
+  type: list
+  returned: always
+  sample:
+    - /var/log/apache2/access.log
+log_files:
+  description: Union of error_logs and custom_logs
+  type: list
+  returned: always
+  sample:
+    - /var/log/apache2/error.log
+    - /var/log/apache2/access.log
+certificates:
+  description: Paths of all SSLCertificateFile and SSLCertificateChainFile directives
+  type: list
+  returned: always
+  sample:
+    - /etc/ssl/certs/example.org.pem
+'''
+
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.adfinis.maintenance.plugins.module_utils.apache_config import ApacheConfig, read_envvars
+
+
+DIRECTIVES = ['ErrorLog', 'CustomLog', 'TransferLog', 'SSLCertificateFile', 'SSLCertificateChainFile']
+
+
+def run_module():
+    # define available arguments/parameters a user can pass to the module
+    module_args = dict(
+        config=dict(type='path', required=True),
+        server_root=dict(type='path', required=False, default=None),
+        envvars=dict(type='path', required=False, default=''),
+    )
+
+    # seed the result dict in the object
+    # we primarily care about changed and state
+    # changed is if this module effectively modified the target
+    # state will include any data that you want your module to pass back
+    # for consumption, for example, in a subsequent task
+    result = dict(
+        changed=False,
+    )
+
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True,
+    )
+
+    env = {}
+    if module.params['envvars']:
+        try:
+            env = read_envvars(module.params['envvars'])
+        except OSError as e:
+            module.fail_json(msg='Could not read {}: {}'.format(module.params['envvars'], e), **result)
+
+    config = ApacheConfig(module.params['config'], module.params['server_root'], env, DIRECTIVES)
+    if module.params['config'] not in config.files:
+        module.fail_json(msg='\n'.join(config.errors), **result)
+    for error in config.errors:
+        module.warn(error)
+
+    result['files'] = config.files
+    result['error_logs'] = config.paths('ErrorLog')
+    result['custom_logs'] = list(dict.fromkeys(config.paths('CustomLog') + config.paths('TransferLog')))
+    result['log_files'] = list(dict.fromkeys(result['error_logs'] + result['custom_logs']))
+    result['certificates'] = list(dict.fromkeys(config.paths('SSLCertificateFile') + config.paths('SSLCertificateChainFile')))
+    # in the event of a successful module execution, you will want to
+    # simple AnsibleModule.exit_json(), passing the key/value results
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
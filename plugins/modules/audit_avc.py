@@ -0,0 +1,167 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+DOCUMENTATION = r'''
+---
+module: audit_avc
+
+short_description: Find SELinux AVC denials in the audit log, reading only what was logged since the last run
+
+# version_added describes the collection version in which this module was added, don't adjust this value
+version_added: "0.1.0"
+
+description:
+  - Search the audit log for AVC denials (kernel and userspace), and return them aggregated by source context, target
+    context, target class and permission, with their number, the time of the first and last one, and the commands
+    that were denied.
+  - With I(checkpoint_file), the position reached in each file is stored on the target, and the next run only reads
+    the records logged in between.  Rotated files are detected by their inode, and the rest of the old file is read if
+    it is still next to the log file (e.g. as audit.log.1).
+  - Unlike C(ausearch), only the current log files are read on the first run, not the rotated ones.
+  - Files are read in chunks, so memory use does not depend on their size.
+
+options:
+    paths:
+        description: Audit logs to scan.  Missing files are reported in I(files), but are not an error.
+        required: false
+        default: [/var/log/audit/audit.log]
+        type: list
+        elements: path
+    checkpoint_file:
+        description:
+          - File on the target to store the position reached in every log file in.  Not written in check mode.
+          - Without checkpoint file, the last I(max_bytes) of every file are scanned on each run.
+        required: false
+        default: null
+        type: path
+    max_bytes:
+        description:
+          - Maximum number of bytes to read per file.  If more were logged since the last run, only the last
+            I(max_bytes) are read.
+        required: false
+        default: 67108864
+        type: int
+
+author:
+    - Adfinis AG (@adfinis)
+'''
+
+
+EXAMPLES = r'''
+- name: Were there any SELinux denials since the last run?
+  adfinis.maintenance.audit_avc:
+    checkpoint_file: /var/lib/adfinis-maintenance/audit-avc.json
+'''
+
+
+RETURN = r'''
+denials:
+  description: AVC denials aggregated by source context, target context, target class and permission, most frequent first
+  type: list
+  returned: always
+  sample:
+    - scontext: system_u:system_r:httpd_t:s0
+      tcontext: unconfined_u:object_r:user_home_t:s0
+      tclass: file
+      permission: read
+      count: 1284
+      first: "2026-10-17T02:13:07Z"
+      last: "2026-10-18T09:58:41Z"
+      comms:
+        - httpd
+records:
+  description: Number of AVC denial records read
+  type: int
+  returned: always
+  sample: 1284
+files:
+  description: Bytes scanned and skipped per file, and whether it was rotated or truncated since the last run
+  type: list
+  returned: always
+  sample:
+    - path: /var/log/audit/audit.log
+      scanned: 1048576
+      skipped: 0
+      rotated: false
+      truncated: false
+'''
+
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.adfinis.maintenance.plugins.module_utils.avc import AvcScanner
+from ansible_collections.adfinis.maintenance.plugins.module_utils.logscan import Checkpoints
+
+
+def run_module():
+    # define available arguments/parameters a user can pass to the module
+    module_args = dict(
+        paths=dict(type='list', elements='path', required=False, default=['/var/log/audit/audit.log']),
+        checkpoint_file=dict(type='path', required=False, default=None),
+        max_bytes=dict(type='int', required=False, default=64 * 1024 * 1024),
+    )
+
+    # seed the result dict in the object
+    # we primarily care about changed and state
+    # changed is if this module effectively modified the target
+    # state will include any data that you want your module to pass back
+    # for consumption, for example, in a subsequent task
+    result = dict(
+        changed=False,
+        denials=[],
+        records=0,
+        files=[],
+    )
+
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True,
+    )
+
+    if module.params['max_bytes'] < 1:
+        module.fail_json(msg='max_bytes must be at least 1', **result)
+
+    checkpoints = Checkpoints(module.params['checkpoint_file'])
+    if module.params['checkpoint_file'] is not None:
+        checkpoints.load()
+    scanner = AvcScanner(checkpoints=checkpoints, max_bytes=module.params['max_bytes'])
+
+    for path in dict.fromkeys(module.params['paths']):
+        scanner.scan(path)
+    result['denials'] = scanner.results()
+    result['records'] = scanner.records
+    result['files'] = scanner.files
+
+    if not module.check_mode:
+        try:
+            checkpoints.save()
+        except OSError as e:
+            module.warn('Could not save the checkpoints to {}: {}'.format(checkpoints.path, e))
+
+    result['changed'] = len(result['denials']) > 0
+    result['diff'] = [{
+        'before': '',
+        'after': ''.join('{count}x {permission} on {tclass} {tcontext} by {scontext}\n'.format(**d)
+                         for d in result['denials']),
+    }]
+    # in the event of a successful module execution, you will want to
+    # simple AnsibleModule.exit_json(), passing the key/value results
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
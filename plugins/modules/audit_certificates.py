@@ -0,0 +1,212 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+DOCUMENTATION = r'''
+---
+module: audit_certificates
+
+short_description: Check the expiry and chains of X.509 certificates
+
+# version_added describes the collection version in which this module was added, don't adjust this value
+version_added: "0.1.0"
+
+description:
+  - Parse all PEM certificate files in I(paths) in one go on the target, and report certificates that expire soon, are
+    not valid yet, or whose chain is out of order.
+  - Neither openssl nor the Python cryptography library are required on the target.  Signatures are not verified.
+  - A file may hold a whole chain, which must start with the leaf certificate, each certificate followed by its
+    issuer.  Private keys in the same file are ignored.
+
+options:
+    paths:
+        description:
+          - Certificate files to check.  Shell-style wildcards are expanded, patterns matching no files are ignored.
+        required: true
+        type: list
+        elements: path
+    min_days:
+        description: Report certificates that expire in less than this many days.
+        required: false
+        default: 30
+        type: int
+    cache_dir:
+        description:
+          - Keep the parsed certificates in this directory on the target, and only parse files again if they changed
+            (by inode, mtime, ctime and size).  The cache is not written in check mode.
+        required: false
+        default: null
+        type: path
+
+author:
+    - Adfinis AG (@adfinis)
+'''
+
+
+EXAMPLES = r'''
+- name: Will the certificates be valid in a month?
+  adfinis.maintenance.audit_certificates:
+    paths:
+      - /etc/ssl/certs/example.org.pem
+      - /etc/letsencrypt/live/*/fullchain.pem
+    min_days: 30
+'''
+
+
+RETURN = r'''
+certificates:
+  description: The certificates in every file, leaf first
+  type: list
+  returned: always
+  sample:
+    - path: /etc/letsencrypt/live/example.org/fullchain.pem
+      certificates:
+        - subject: CN=example.org
+          issuer: C=US,O=Let's Encrypt,CN=R11
+          serial: 04a1b2c3d4e5f6
+          not_before: "2026-09-01T08:00:00Z"
+          not_after: "2026-11-30T07:59:59Z"
+          days_left: 42
+      problems: []
+problems:
+  description: Problems found, one line per problem
+  type: list
+  returned: always
+  sample:
+    - "/etc/ssl/certs/example.org.pem: CN=example.org expires in 12 days (2026-10-30T23:59:59Z)"
+cache:
+  description: Number of files that were taken from the cache and that had to be parsed
+  type: dict
+  returned: when cache_dir is set
+  sample:
+    hits: 120
+    misses: 3
+'''
+
+
+import glob
+import os
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.adfinis.maintenance.plugins.module_utils.x509 import CertificateCache
+
+
+DAY = 24 * 60 * 60
+
+
+def _isoformat(timestamp):
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(timestamp))
+
+
+def check(certificates, now, min_days):
+    """
+    Return the problems of a chain of parsed certificates, leaf first.
+    """
+    problems = []
+    for i, cert in enumerate(certificates):
+        if cert['not_before'] > now:
+            problems.append('{} is not valid before {}'.format(cert['subject'], _isoformat(cert['not_before'])))
+        if cert['not_after'] < now:
+            problems.append('{} expired on {}'.format(cert['subject'], _isoformat(cert['not_after'])))
+        elif cert['not_after'] < now + min_days * DAY:
+            problems.append('{} expires in {} days ({})'.format(
+                cert['subject'], (cert['not_after'] - now) // DAY, _isoformat(cert['not_after'])))
+        if i + 1 < len(certificates) and cert['issuer'] != certificates[i + 1]['subject']:
+            problems.append('{} is followed by {}, not by its issuer {}'.format(
+                cert['subject'], certificates[i + 1]['subject'], cert['issuer']))
+    return problems
+
+
+def run_module():
+    # define available arguments/parameters a user can pass to the module
+    module_args = dict(
+        paths=dict(type='list', elements='path', required=True),
+        min_days=dict(type='int', required=False, default=30),
+        cache_dir=dict(type='path', required=False, default=None),
+    )
+
+    # seed the result dict in the object
+    # we primarily care about changed and state
+    # changed is if this module effectively modified the target
+    # state will include any data that you want your module to pass back
+    # for consumption, for example, in a subsequent task
+    result = dict(
+        changed=False,
+        certificates=[],
+        problems=[],
+    )
+
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True,
+    )
+
+    cache = CertificateCache()
+    if module.params['cache_dir'] is not None:
+        cache = CertificateCache(os.path.join(module.params['cache_dir'], 'certificates.json'))
+        cache.load()
+
+    paths = []
+    for pattern in module.params['paths']:
+        paths.extend(sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern])
+
+    now = int(time.time())
+    for path in dict.fromkeys(paths):
+        entry = dict(path=path, certificates=[], problems=[])
+        try:
+            certificates, error = cache.read(path)
+        except OSError as e:
+            certificates, error = [], None
+            entry['problems'].append('could not read: {}'.format(e.strerror))
+        if error is not None:
+            entry['problems'].append('could not parse: {}'.format(error))
+        elif not certificates and not entry['problems']:
+            entry['problems'].append('no certificate found')
+        entry['problems'].extend(check(certificates, now, module.params['min_days']))
+        for cert in certificates:
+            entry['certificates'].append(dict(
+                subject=cert['subject'],
+                issuer=cert['issuer'],
+                serial=cert['serial'],
+                not_before=_isoformat(cert['not_before']),
+                not_after=_isoformat(cert['not_after']),
+                days_left=(cert['not_after'] - now) // DAY,
+            ))
+        result['certificates'].append(entry)
+        result['problems'].extend('{}: {}'.format(path, problem) for problem in entry['problems'])
+
+    if not module.check_mode:
+        try:
+            cache.save()
+        except OSError as e:
+            module.warn('Could not save the cache to {}: {}'.format(cache.path, e))
+    if cache.path is not None:
+        result['cache'] = dict(hits=cache.hits, misses=cache.misses)
+
+    result['changed'] = len(result['problems']) > 0
+    result['diff'] = [{
+        'before': '',
+        'after': ''.join(problem + '\n' for problem in result['problems']),
+    }]
+    # in the event of a successful module execution, you will want to
+    # simple AnsibleModule.exit_json(), passing the key/value results
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+DOCUMENTATION = r'''
+---
+module: audit_logrotate
+
+short_description: Find log files that are not managed by logrotate
+
+# version_added describes the collection version in which this module was added, don't adjust this value
+version_added: "0.1.0"
+
+description:
+  - Find log files that are not managed by logrotate, i.e. neither recorded in the logrotate state file nor matched by
+    any of the patterns in the logrotate configuration.
+  - Everything is evaluated on the target, in a single walk of I(paths), so only the unmanaged files are returned.
+
+options:
+    status_file:
+        description: Path to the logrotate state file, e.g. /var/lib/logrotate/status
+        required: true
+        type: path
+    config:
+        description:
+          - Path to the logrotate configuration.  Files matching the patterns in the configuration (including included
+            files and directories) are considered managed, even if logrotate didn't record them in the state file yet.
+          - Set to an empty string to only consider the state file.
+        required: false
+        default: /etc/logrotate.conf
+        type: path
+    paths:
+        description: Paths to search for log files
+        required: false
+        default: [/var/log]
+        type: list
+    pattern:
+        description: Pattern that the names of log files must match
+        required: false
+        default: "*.log"
+        type: str
+    xdev:
+        description: Do not descend directories on other filesystems.
+        required: false
+        default: true
+        type: bool
+    exclude:
+        description: Python regexes for log files that are allowed to be unmanaged.  Matches start of path.
+        required: false
+        default: []
+        type: list
+
+author:
+    - Adfinis AG (@adfinis)
+'''
+
+
+EXAMPLES = r'''
+- name: Are all log files in /var/log managed by logrotate?
+  adfinis.maintenance.audit_logrotate:
+    status_file: /var/lib/logrotate/status
+    exclude:
+      - /var/log/audit/audit.log
+      - /var/log/azure/
+'''
+
+
+RETURN = r'''
+unmanaged:
+  description: Log files that are not managed by logrotate
+  type: list
+  returned: always
+  sample:
+    - /var/log/myapp/debug.log
+managed:
+  description: Number of distinct files known to logrotate, from the state file and the configuration
+  type: int
+  returned: always
+  sample: 42
+'''
+
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.adfinis.maintenance.plugins.module_utils.logrotate import LogrotateConfig, read_status
+from ansible_collections.adfinis.maintenance.plugins.module_utils.walk import Walker
+
+
+def run_module():
+    # define available arguments/parameters a user can pass to the module
+    module_args = dict(
+        status_file=dict(type='path', required=True),
+        config=dict(type='path', required=False, default='/etc/logrotate.conf'),
+        paths=dict(type='list', required=False, default=['/var/log']),
+        pattern=dict(type='str', required=False, default='*.log'),
+        xdev=dict(type='bool', required=False, default=True),
+        exclude=dict(type='list', required=False, default=[]),
+    )
+
+    # seed the result dict in the object
+    # we primarily care about changed and state
+    # changed is if this module effectively modified the target
+    # state will include any data that you want your module to pass back
+    # for consumption, for example, in a subsequent task
+    result = dict(
+        changed=False,
+        unmanaged=[],
+        managed=0,
+    )
+
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True,
+    )
+
+    try:
+        managed = read_status(module.params['status_file'])
+    except OSError as e:
+        module.fail_json(msg='Could not read the logrotate state file {}: {}'.format(module.params['status_file'], e),
+                         **result)
+    if module.params['config']:
+        config = LogrotateConfig(module.params['config'])
+        for error in config.errors:
+            module.warn('Could not read logrotate configuration {}'.format(error))
+        managed |= config.files()
+    result['managed'] = len(managed)
+
+    try:
+        walker = Walker(
+            pattern=module.params['pattern'],
+            types=['f'],
+            xdev=module.params['xdev'],
+            exclude=module.params['exclude'],
+        )
+    except ValueError as e:
+        module.fail_json(msg=str(e), **result)
+    result['unmanaged'] = [path for path, _ in walker.walk(module.params['paths']) if path not in managed]
+    if walker.errors:
+        module.fail_json(msg='\n'.join(walker.errors), **result)
+
+    result['changed'] = len(result['unmanaged']) > 0
+    result['diff'] = [{
+        'before': '',
+        'after': ''.join(path + '\n' for path in result['unmanaged']),
+    }]
+    # in the event of a successful module execution, you will want to
+    # simple AnsibleModule.exit_json(), passing the key/value results
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
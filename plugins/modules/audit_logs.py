@@ -0,0 +1,179 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+DOCUMENTATION = r'''
+---
+module: audit_logs
+
+short_description: Find problematic messages in log files, reading only what was logged since the last run
+
+# version_added describes the collection version in which this module was added, don't adjust this value
+version_added: "0.1.0"
+
+description:
+  - Search log files for lines matching any of I(patterns), and return the matches aggregated by message signature,
+    i.e. with timestamps, numbers, addresses and quoted strings masked, with a few samples each.
+  - With I(checkpoint_file), the position reached in each file is stored on the target, and the next run only reads
+    the lines logged in between.  Rotated files are detected by their inode, and the rest of the old file is read if
+    it is still next to the log file (e.g. as error.log.1, but not if it was compressed right away).
+  - Files are read in chunks, so memory use does not depend on their size.
+
+options:
+    paths:
+        description: Log files to scan.  Missing files are reported in I(files), but are not an error.
+        required: true
+        type: list
+        elements: path
+    patterns:
+        description: Python regexes, lines matching any of them are returned.
+        required: false
+        default: ['\[(?:[a-z_]*:)?(?:error|crit|alert|emerg)\]']
+        type: list
+        elements: str
+    checkpoint_file:
+        description:
+          - File on the target to store the position reached in every log file in.  Not written in check mode.
+          - Without checkpoint file, the last I(max_bytes) of every file are scanned on each run.
+        required: false
+        default: null
+        type: path
+    max_bytes:
+        description:
+          - Maximum number of bytes to read per file.  If more were logged since the last run, only the last
+            I(max_bytes) are read.
+        required: false
+        default: 67108864
+        type: int
+    samples:
+        description: Number of sample lines to return per signature.
+        required: false
+        default: 3
+        type: int
+
+author:
+    - Adfinis AG (@adfinis)
+'''
+
+
+EXAMPLES = r'''
+- name: Are there any problematic messages in the error logs?
+  adfinis.maintenance.audit_logs:
+    paths:
+      - /var/log/nginx/error.log
+    checkpoint_file: /var/lib/adfinis-maintenance/nginx-error-log.json
+'''
+
+
+RETURN = r'''
+matches:
+  description: Matching lines aggregated by signature, most frequent first
+  type: list
+  returned: always
+  sample:
+    - signature: '[error] N#N: *N open() "*" failed (N: No such file or directory), client: IP, server: example.org'
+      count: 1284
+      samples:
+        - '2026/10/18 10:00:00 [error] 812#812: *1 open() "/var/www/favicon.ico" failed (2: No such file or
+          directory), client: 192.0.2.1, server: example.org'
+      files:
+        - /var/log/nginx/error.log
+files:
+  description: Bytes scanned and skipped per file, and whether it was rotated or truncated since the last run
+  type: list
+  returned: always
+  sample:
+    - path: /var/log/nginx/error.log
+      scanned: 1048576
+      skipped: 0
+      rotated: false
+      truncated: false
+'''
+
+
+import re
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.adfinis.maintenance.plugins.module_utils.logscan import Checkpoints, LogScanner
+
+
+def run_module():
+    # define available arguments/parameters a user can pass to the module
+    module_args = dict(
+        paths=dict(type='list', elements='path', required=True),
+        patterns=dict(type='list', elements='str', required=False,
+                      default=[r'\[(?:[a-z_]*:)?(?:error|crit|alert|emerg)\]']),
+        checkpoint_file=dict(type='path', required=False, default=None),
+        max_bytes=dict(type='int', required=False, default=64 * 1024 * 1024),
+        samples=dict(type='int', required=False, default=3),
+    )
+
+    # seed the result dict in the object
+    # we primarily care about changed and state
+    # changed is if this module effectively modified the target
+    # state will include any data that you want your module to pass back
+    # for consumption, for example, in a subsequent task
+    result = dict(
+        changed=False,
+        matches=[],
+        files=[],
+    )
+
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True,
+    )
+
+    if module.params['max_bytes'] < 1:
+        module.fail_json(msg='max_bytes must be at least 1', **result)
+
+    checkpoints = Checkpoints(module.params['checkpoint_file'])
+    if module.params['checkpoint_file'] is not None:
+        checkpoints.load()
+    try:
+        scanner = LogScanner(
+            module.params['patterns'],
+            checkpoints=checkpoints,
+            max_bytes=module.params['max_bytes'],
+            samples=module.params['samples'],
+        )
+    except re.error as e:
+        module.fail_json(msg='Invalid pattern: {}'.format(e), **result)
+
+    for path in dict.fromkeys(module.params['paths']):
+        scanner.scan(path)
+    result['matches'] = scanner.results()
+    result['files'] = scanner.files
+
+    if not module.check_mode:
+        try:
+            checkpoints.save()
+        except OSError as e:
+            module.warn('Could not save the checkpoints to {}: {}'.format(checkpoints.path, e))
+
+    result['changed'] = len(result['matches']) > 0
+    result['diff'] = [{
+        'before': '',
+        'after': ''.join('{}x {}\n'.format(m['count'], m['signature']) for m in result['matches']),
+    }]
+    # in the event of a successful module execution, you will want to
+    # simple AnsibleModule.exit_json(), passing the key/value results
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
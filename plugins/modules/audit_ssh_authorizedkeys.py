@@ -32,20 +32,53 @@ options:
         default: ALL
         type: str
     required:
-        description: List of required authorized_keys entries
+        description: List of required authorized_keys entries, or SHA256 fingerprints (C(SHA256:...)) of required keys
         required: false
         default: []
         type: list
     allowed:
-        description: List of optional, allowed authorized_keys entries
+        description: List of optional, allowed authorized_keys entries, or SHA256 fingerprints of allowed keys
         required: false
         default: []
         type: list
     forbidden:
-        description: List of forbidden authorized_keys entries
+        description: List of forbidden authorized_keys entries, or SHA256 fingerprints of forbidden keys
         required: false
         default: []
         type: list
+    key_match:
+        description:
+          - How authorized_keys entries are compared to the entries in I(required), I(allowed) and I(forbidden).
+          - C(line) compares the whole line, including the comment.
+          - C(options) compares the options and the key, but ignores the comment.
+          - C(fingerprint) only compares the key, regardless of its options and comment.
+          - Policy entries given as SHA256 fingerprint always match the key regardless of its options.
+        required: false
+        default: options
+        choices: [line, options, fingerprint]
+        type: str
+    key_format:
+        description:
+          - How the keys are returned in I(authorized_keys) and in the violations.
+          - C(line) returns the lines as they appear in the authorized_keys files.
+          - C(fingerprint) returns the SHA256 fingerprint and comment of each key, which keeps the result small on
+            hosts with many keys.
+          - C(record) returns a dict with the options, type, fingerprint and comment of each key.
+        required: false
+        default: line
+        choices: [line, fingerprint, record]
+        type: str
+    result_encoding:
+        description:
+          - How to return the list of keys of each user in I(authorized_keys), see the option of the same name of
+            adfinis.maintenance.find.  Keys of the same type share a long prefix, which C(front_coded) returns only
+            once per run of keys of that type.
+          - Use the adfinis.maintenance.expand_compact filter to get the plain lists back on the controller.
+          - Requires I(key_format) C(line) or C(fingerprint).
+        required: false
+        default: list
+        choices: [list, front_coded, compressed]
+        type: str
     limit_nss_backends:
         description: Only retrieve users from these NSS backends, and emit a warning if other backends are configured.
         required: false
@@ -66,6 +99,14 @@ options:
         required: false
         default: sshd
         type: str
+    parallelism:
+        description:
+          - Number of authorized_keys files to read concurrently.  Increase on hosts with home directories on network
+            file systems such as NFS, where the audit is dominated by the latency of opening each file.
+          - Regardless of this option, each distinct file is only read once, even if it is shared by several users.
+        required: false
+        default: 1
+        type: int
 
 # Specify this value according to your collection
 # in format of namespace.collection.doc_fragment_name
@@ -97,12 +138,27 @@ EXAMPLES = r'''
       - 'from="2001:db8::42/128" ssh-ed25519 AAAAC3NzaC1lZDI1NTE5AAAAIKBIpR/ccV9KAL5eoyPaT0frG1+moHO2nM2TsRKrdANU root@backup.example.org'
       - 'ssh-ed25519 AAAAC3NzaC1lZDI1NTE5AAAAICZWKDPix+uTd+P+ZdoD3AkrD8cfikji9JKzvrfhczMA'
     ignore_nss_backends: [sss]
+
+- name: Audit the keys of NFS homed users, reading 16 files at a time
+  adfinis.maintenance.audit_ssh_authorizedkeys:
+    allowed:
+      - 'ssh-ed25519 AAAAC3NzaC1lZDI1NTE5AAAAICZWKDPix+uTd+P+ZdoD3AkrD8cfikji9JKzvrfhczMA'
+    limit_nss_backends: [files, compat, db, systemd, sss]
+    parallelism: 16
+
+- name: Forbid a leaked key regardless of its options and comment, and only return fingerprints
+  adfinis.maintenance.audit_ssh_authorizedkeys:
+    forbidden:
+      - 'SHA256:ZSYVavN8Qf611tj3NPAX/7lRiM5H4fmZWbhc8YfDwJU'
+    key_format: fingerprint
 '''
 
 
 RETURN = r'''
 authorized_keys:
-  description: Entries in all authorized_keys files, per user
+  description:
+    - Entries in all authorized_keys files, per user, in the format selected by key_format
+    - Per user a dict in the format selected by result_encoding, unless it is C(list)
   type: dict
   returned: always
   sample:
@@ -112,6 +168,9 @@ authorized_keys:
 
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.adfinis.maintenance.plugins.module_utils.authorized_keys import KeyFileCache, KeyIndex
+from ansible_collections.adfinis.maintenance.plugins.module_utils.compact import ENCODINGS, encode
+from ansible_collections.adfinis.maintenance.plugins.module_utils.sshd_config import SshdConfig, Unsupported
 
 import collections
 import os
@@ -120,9 +179,33 @@ import subprocess
 import shlex
 
 
+NSSWITCH_CONF = '/etc/nsswitch.conf'
+GETENT = '/usr/bin/getent'
+
 # pwdent class conforming to https://docs.python.org/3/library/pwd.html
 GetentPwdEnt = collections.namedtuple('pwdent', ['pw_name', 'pw_passwd', 'pw_uid', 'pw_gid', 'pw_gecos', 'pw_dir', 'pw_shell'])
 
+SSHD_INVALID = 'SSHD configuration invalid (or insufficient privileges, try become_user=root become=yes)'
+
+
+def sshd_query(module, result, pwdent):
+    """
+    Ask sshd for the effective configuration of a user, for configurations SshdConfig can't evaluate.
+    """
+    ufilter = 'host=,addr=,user=' + pwdent.pw_name  # host and addr are required by some implementations
+    sshd_cmdline = [module.params['sshd'], '-C', ufilter, '-T', '-f', module.params['config']]
+    sshd_configtest = subprocess.Popen(sshd_cmdline, stdout=subprocess.PIPE)
+    sshd_stdout, _ = sshd_configtest.communicate()
+    if sshd_configtest.returncode != 0:
+        module.fail_json(msg=SSHD_INVALID, **result)
+
+    config = {}
+    for cline in sshd_stdout.decode('utf-8').splitlines():
+        conf = cline.split(None, 1)
+        if len(conf) == 2:
+            config[conf[0]] = conf[1].split()
+    return config
+
 
 def run_module():
     # define available arguments/parameters a user can pass to the module
@@ -136,6 +219,10 @@ def run_module():
         forbidden=dict(type='list', required=False, default=[]),
         limit_nss_backends=dict(type='list', required=False, default=['files', 'compat', 'db', 'systemd']),
         ignore_nss_backends=dict(type='list', required=False, default=[]),
+        parallelism=dict(type='int', required=False, default=1),
+        key_match=dict(type='str', required=False, default='options', choices=['line', 'options', 'fingerprint']),
+        key_format=dict(type='str', required=False, default='line', choices=['line', 'fingerprint', 'record']),
+        result_encoding=dict(type='str', required=False, default='list', choices=ENCODINGS),
     )
 
     # seed the result dict in the object
@@ -156,11 +243,16 @@ def run_module():
         supports_check_mode=True,
     )
 
+    if module.params['parallelism'] < 1:
+        module.fail_json(msg='parallelism must be at least 1', **result)
+    if module.params['key_format'] == 'record' and module.params['result_encoding'] != 'list':
+        module.fail_json(msg='result_encoding requires key_format line or fingerprint', **result)
+
     warnings = []
 
     getent_backends = []
     # Check NSS passwd db backends against list of limited backends, and emit warnings if additional backends are present
-    with open('/etc/nsswitch.conf', 'r') as nssf:
+    with open(NSSWITCH_CONF, 'r') as nssf:
         for line in nssf.readlines():
             line = line.split('#', 1)[0].strip()
             if not line:
@@ -189,40 +281,52 @@ def run_module():
     else:
         # getpwnam/getpwall don't allow filtering by backends, need to user getent
         for backend in getent_backends:
-            getent = subprocess.Popen(['/usr/bin/getent', 'passwd', '-s', backend], stdout=subprocess.PIPE)
+            getent = subprocess.Popen([GETENT, 'passwd', '-s', backend], stdout=subprocess.PIPE)
             getent_stdout, _ = getent.communicate()
             for line in getent_stdout.decode('utf-8').splitlines():
                 users.add(GetentPwdEnt(*line.split(':', 6)))
 
-    # Read the acutal ssh authorized_keys
-    result['authorized_keys'] = {}
+    # Parse the sshd config once, and evaluate it for every user.  Only if it depends on more than the user and their
+    # groups, sshd has to be asked for each user.
+    sshd_config = None
+    if module.params['file'] is None:
+        sshd_configtest = subprocess.Popen([module.params['sshd'], '-t', '-f', module.params['config']], stdout=subprocess.PIPE)
+        sshd_configtest.communicate()
+        if sshd_configtest.returncode != 0:
+            module.fail_json(msg=SSHD_INVALID, **result)
+        try:
+            sshd_config = SshdConfig(module.params['config'])
+        except (Unsupported, OSError):
+            pass
+
+    # Resolve the authorized_keys paths of every user
+    user_paths = {}
     for pwdent in users:
 
         # Gather sshd config, may differ per user
-        authorized_keys_paths = None
         if module.params['file'] is not None:
             authorized_keys_paths = [module.params['file']]
         else:
-            ufilter = 'host=,addr=,user=' + pwdent.pw_name  # host and addr are required by some implementations
-            sshd_cmdline = [module.params['sshd'], '-C', ufilter, '-T', '-f', module.params['config']]
-            sshd_configtest = subprocess.Popen(sshd_cmdline, stdout=subprocess.PIPE)
-            sshd_stdout, _ = sshd_configtest.communicate()
-            if sshd_configtest.returncode != 0:
-                module.fail_json(msg='SSHD configuration invalid (or insufficient privileges, try become_user=root become=yes)', **result)
-
-            for cline in sshd_stdout.decode('utf-8').splitlines():
-                conf = cline.split(None, 1)
-                if conf[0] == 'authorizedkeyscommand' and conf[1] != 'none':
-                    msg = 'AuthorizedKeysCommand is configured: "{}". Keys returned by this command are not audited.'.format(conf[1])
+            config = None
+            if sshd_config is not None:
+                try:
+                    config = sshd_config.effective(pwdent)
+                except Unsupported:
+                    pass
+            if config is None:
+                config = sshd_query(module, result, pwdent)
+
+            command = ' '.join(config.get('authorizedkeyscommand', ['none']))
+            if command != 'none':
+                msg = 'AuthorizedKeysCommand is configured: "{}". Keys returned by this command are not audited.'.format(command)
+                if msg not in warnings:
                     warnings.append(msg)
-                elif conf[0] == 'authorizedkeysfile':
-                    authorized_keys_paths = conf[1].split()
+            authorized_keys_paths = config.get('authorizedkeysfile', [])
+            if authorized_keys_paths == ['none']:
+                authorized_keys_paths = []
 
-        if authorized_keys_paths is None:
-            authorized_keys_paths = []
-
-        # Parse the % placeholders in the path (see TOKENS section in man 5 sshd_config) and load the config files
-        sshkeys = []
+        # Parse the % placeholders in the path (see TOKENS section in man 5 sshd_config)
+        user_paths[pwdent.pw_name] = []
         for path in authorized_keys_paths:
             resolved = ''
             escape = False
@@ -234,7 +338,7 @@ def run_module():
                     elif c == 'u':
                         resolved += pwdent.pw_name
                     elif c == 'U':
-                        resolved += pwdent.pw_uid
+                        resolved += str(pwdent.pw_uid)
                     elif c == 'h':
                         resolved += pwdent.pw_dir
                     else:
@@ -243,37 +347,53 @@ def run_module():
                     escape = True
                 else:
                     resolved += c
-            # Read the authorized_keys file if it exists
             if not os.path.isabs(resolved):
                 resolved = os.path.join(pwdent.pw_dir, resolved)
-            if not os.path.exists(resolved):
-                continue
-            with open(resolved, 'r') as f:
-                keys = f.read().splitlines()
-                sshkeys.extend(keys)
-        sshkeys = [l for l in sshkeys if l and not l.strip().startswith('#')]
-        result['authorized_keys'][pwdent.pw_name] = sshkeys
+            user_paths[pwdent.pw_name].append(resolved)
+
+    # Read the acutal ssh authorized_keys, every distinct file only once
+    keyfiles = KeyFileCache(module.params['parallelism'])
+    entries = keyfiles.read_all(path for paths in user_paths.values() for path in paths)
+    user_keys = {user: [key for path in paths for key in entries[path] or ()] for user, paths in user_paths.items()}
+
+    key_format = module.params['key_format']
+    encoding = module.params['result_encoding']
+    if key_format == 'line':
+        result['authorized_keys'] = {user: encode([key.line for key in keys], encoding)
+                                     for user, keys in user_keys.items()}
+    elif key_format == 'fingerprint':
+        result['authorized_keys'] = {user: encode([key.describe() for key in keys], encoding)
+                                     for user, keys in user_keys.items()}
+    else:
+        result['authorized_keys'] = {user: [key.as_dict() for key in keys] for user, keys in user_keys.items()}
+
+    def display(key):
+        return key.line if key_format == 'line' else key.describe()
+
+    # Index the policies by key, so that each key is looked up in constant time
+    required = KeyIndex(module.params['required'], module.params['key_match'])
+    allowed = KeyIndex(module.params['allowed'], module.params['key_match'])
+    forbidden = KeyIndex(module.params['forbidden'], module.params['key_match'])
 
     violations = ''
     result['diff'] = []
-    for user, user_keys in result['authorized_keys'].items():
+    for user, keys in user_keys.items():
         diffplus = ''
         diffminus = ''
         # Audit keys
-        if len(module.params['required']) > 0:
-            for key in module.params['required']:
-                if key not in user_keys:
-                    diffplus += key + '\n'
-
-        if len(module.params['allowed']) > 0:
-            for key in user_keys:
-                if key not in module.params['allowed']:
-                    diffminus += key + '\n'
-
-        if len(module.params['forbidden']) > 0:
-            for key in user_keys:
-                if key in module.params['forbidden']:
-                    diffminus += key + '\n'
+        if len(required) > 0:
+            for key in required.missing(keys):
+                diffplus += key + '\n'
+
+        if len(allowed) > 0:
+            for key in keys:
+                if key not in allowed:
+                    diffminus += display(key) + '\n'
+
+        if len(forbidden) > 0:
+            for key in keys:
+                if key in forbidden:
+                    diffminus += display(key) + '\n'
 
         violations += diffplus + diffminus
 
@@ -26,8 +26,8 @@ options:
         default: null
         type: string
     paths:
-        description: Paths to search in
-        required: true
+        description: Paths to search in.  Required unless I(queries) is set.
+        required: false
         type: list
     prune:
         description: Paths to exclude from find (through find -path ... -prune)
@@ -49,13 +49,23 @@ options:
         required: false
         default: null
         type: str
+    allocated_size:
+        description:
+          - Like I(size), but compares the space allocated on disk rather than the apparent size of the files.
+          - Use this to skip sparse files, e.g. /var/log/lastlog.
+        required: false
+        default: null
+        type: str
     age:
         description: Find files whose data was last modified less than, more than or exactly n minutes ago (through find -mmin ..,.)
         required: false
         default: null
         type: str
     exclude:
-        description: Exclude files from the result set if they match one of these regular expressions.
+        description:
+          - Exclude files from the result set if they match one of these regular expressions.
+          - With the C(native) engine, directories are not descended into if the regular expressions exclude everything
+            below them, e.g. C(/var/lib/docker/) or C(/var/lib/docker/.*).
         required: false
         default: []
         type: list
@@ -64,6 +74,201 @@ options:
         required: false
         default: false
         type: bool
+    engine:
+        description:
+          - C(find) runs the UNIX find utility and filters its output.
+          - C(native) walks the file system in-process using os.scandir and applies all predicates (including exclude) during
+            the walk, without buffering and post-processing the entire output of find.
+        required: false
+        default: find
+        choices: [find, native]
+        type: str
+    parallelism:
+        description:
+          - Number of paths or subtrees to search concurrently, which speeds up searches across several disks.
+          - With engine C(find), one find process is started per path.  With engine C(native), a pool of threads walks the
+            paths and, once workers become idle, their subdirectories.
+          - The results are returned in the same order as with a sequential search.
+        required: false
+        default: 1
+        type: int
+    max_results:
+        description:
+          - Only return the first I(max_results) matches.  The search still runs to completion to count all matches.
+          - Mutually exclusive with I(top_n) and I(summary).
+        required: false
+        default: null
+        type: int
+    top_n:
+        description:
+          - Only return the I(top_n) matches with the largest I(sort_by) value, in descending order.  Of matches with
+            the same value, the ones with the smaller paths are returned.
+          - Only these matches are kept in memory during the search.
+          - Mutually exclusive with I(max_results) and I(summary).
+        required: false
+        default: null
+        type: int
+    sort_by:
+        description: Attribute to select the matches by if I(top_n) is set.
+        required: false
+        default: size
+        choices: [size, mtime]
+        type: str
+    get_stat:
+        description:
+          - Also return the metadata of the returned matches in I(files), as collected during the search.
+          - Saves a separate ansible.builtin.stat task per match.
+        required: false
+        default: false
+        type: bool
+    cache_dir:
+        description:
+          - Keep an index of directory listings in this directory on the target, and only read directories from disk
+            that changed since they were indexed.  Requires engine C(native).
+          - Only names and types of directory entries are indexed, as only these are guaranteed to change the mtime of
+            the directory.  Predicates on the entries themselves (e.g. I(size), I(age)), symlink targets with I(follow)
+            and mount points with I(xdev) are always evaluated on the live file system, so the result is the same as
+            without index.
+          - The index reveals file names, so it is only readable by the user running the module.
+          - The index is not written in check mode.
+        required: false
+        default: null
+        type: path
+    cache_size:
+        description:
+          - Maximum number of directory entries kept in the index at I(cache_dir).  If the index grows larger, the
+            directories that were used in the least recent runs are evicted first.
+        required: false
+        default: 1000000
+        type: int
+    max_rate:
+        description:
+          - Read at most I(max_rate) directories per second from disk, to limit the I/O load of the search on busy
+            systems.  The time spent waiting is returned in I(throttled).  C(0) doesn't limit the rate.
+          - Directories listed from the index at I(cache_dir) don't count.  Requires engine C(native).
+        required: false
+        default: 0
+        type: int
+    idle_io:
+        description:
+          - Run the search in the idle I/O scheduling class (C(ionice -c 3)), so that it only gets disk time when no
+            other process needs it.  Applies to the threads and find processes of the search as well.
+          - Only has an effect with I/O schedulers that support priorities, such as bfq and mq-deadline.  Requires
+            ionice on the target.
+        required: false
+        default: false
+        type: bool
+    fadvise:
+        description:
+          - Drop the index at I(cache_dir) from the page cache after reading and writing it (C(posix_fadvise)), so that
+            it doesn't evict the pages of other processes.
+          - The directories and inodes read by the search are cached by the kernel separately from the page cache,
+            and can't be dropped this way.
+        required: false
+        default: false
+        type: bool
+    summary:
+        description:
+          - Don't return the matches, but only their number and total size per directory.
+          - Mutually exclusive with I(max_results) and I(top_n).
+        required: false
+        default: false
+        type: bool
+    queries:
+        description:
+          - Run several searches during a single walk of the file system, instead of one walk per search.  Each query
+            has its own start points and predicates, and the union of all start points is walked once.  The results
+            are returned per query name in I(queries).
+          - Requires engine C(native).  Mutually exclusive with I(paths) and the predicates and output options above,
+            which are set per query instead.  I(prune), I(xdev) and I(follow) apply to all queries that don't set
+            them.
+          - Start points below the start point of another query are reached through the walk of the outer one, so
+            their matches are returned with the path as seen from the outer start point, and each match is returned
+            only once per query.
+        required: false
+        default: null
+        type: list
+        elements: dict
+        suboptions:
+            name:
+                description: Name of the query, the key of its results in I(queries).
+                required: true
+                type: str
+            paths:
+                description: Paths to search in
+                required: true
+                type: list
+                elements: str
+            pattern:
+                description: Same as I(pattern) above.
+                type: str
+            type:
+                description: Same as I(type) above.
+                type: list
+                elements: str
+            prune:
+                description: Same as I(prune) above.
+                type: list
+                elements: str
+            xdev:
+                description: Same as I(xdev) above.
+                type: bool
+            follow:
+                description:
+                  - Same as I(follow) above.  Only the queries that follow symlinks descend into the directories
+                    symlinks point to.
+                type: bool
+            size:
+                description: Same as I(size) above.
+                type: str
+            allocated_size:
+                description: Same as I(allocated_size) above.
+                type: str
+            age:
+                description: Same as I(age) above.
+                type: str
+            exclude:
+                description: Same as I(exclude) above.
+                type: list
+                elements: str
+            max_results:
+                description: Same as I(max_results) above.
+                type: int
+            top_n:
+                description: Same as I(top_n) above.
+                type: int
+            sort_by:
+                description: Same as I(sort_by) above.
+                default: size
+                choices: [size, mtime]
+                type: str
+            summary:
+                description: Same as I(summary) above.
+                default: false
+                type: bool
+            get_stat:
+                description: Same as I(get_stat) above.
+                default: false
+                type: bool
+    result_encoding:
+        description:
+          - How to return the list of matches in I(found), also in the results of I(queries).
+          - C(list) returns a plain list of paths.
+          - C(front_coded) returns a dict with I(encoding), I(count) and I(data), where data is a flat list with the
+            number of characters each path shares with the previous one, followed by the rest of the path.  This keeps
+            the result small if many matches share their directories.
+          - C(compressed) returns I(data) of C(front_coded) deflated and base64 encoded in a string.
+          - Use the adfinis.maintenance.expand_compact filter to get the plain list back on the controller.
+        required: false
+        default: list
+        choices: [list, front_coded, compressed]
+        type: str
+    return_diff:
+        description:
+          - Return the matches in I(diff) as well.  Disable for large results, to not return every path twice.
+        required: false
+        default: true
+        type: bool
 
 
 # Specify this value according to your collection
@@ -86,30 +291,450 @@ EXAMPLES = r'''
     type: file
     size: "+16M"
     age: "-{{ 60*24*7*2 }}"
+
+- name: "Same as above, but without spawning find"
+  adfinis.maintenance.find:
+    paths:
+      - /
+    pattern: "*.log"
+    prune: [/boot, /proc, /sys]
+    type: file
+    size: "+16M"
+    age: "-{{ 60*24*7*2 }}"
+    engine: native
+
+- name: "Search all mounted file systems at the same time"
+  adfinis.maintenance.find:
+    paths: "{{ ansible_facts.mounts | map(attribute='mount') | list }}"
+    xdev: true
+    type: file
+    size: "+16M"
+    engine: native
+    parallelism: 8
+
+- name: "Report the 20 largest log files"
+  adfinis.maintenance.find:
+    paths: /var/log
+    type: file
+    engine: native
+    top_n: 20
+    sort_by: size
+
+- name: "Find log files using more than 16 MiB on disk, and return their size and owner"
+  adfinis.maintenance.find:
+    paths: /var/log
+    allocated_size: "+16M"
+    get_stat: true
+
+- name: "Find log files, and only re-read the directories that changed since the last run"
+  adfinis.maintenance.find:
+    paths: /var/log
+    pattern: "*.log"
+    type: file
+    engine: native
+    cache_dir: /var/cache/adfinis-maintenance
+
+- name: "Count the log files per directory"
+  adfinis.maintenance.find:
+    paths: /var/log
+    type: file
+    pattern: "*.log"
+    summary: true
+
+- name: "Find log files and large files in a single walk"
+  adfinis.maintenance.find:
+    engine: native
+    queries:
+      - name: logs
+        paths: [/var/log]
+        type: file
+        pattern: "*.log"
+        follow: true
+      - name: large
+        paths: "{{ ansible_facts.mounts | map(attribute='mount') | list }}"
+        xdev: true
+        type: file
+        size: "+16M"
+  register: files
+
+- name: "Find all files below /srv, and return them front coded and compressed"
+  adfinis.maintenance.find:
+    engine: native
+    paths: [/srv]
+    type: file
+    result_encoding: compressed
+    return_diff: false
+  register: srv_files
+
+- name: "Count the files in /srv/www"
+  ansible.builtin.debug:
+    msg: "{{ srv_files.found | adfinis.maintenance.expand_compact | select('match', '/srv/www/') | length }}"
 '''
 
 
 RETURN = r'''
 found:
-  description: List of files returned by find
-  type: list
-  returned: always
+  description:
+    - List of files returned by find, limited by I(max_results) or I(top_n), empty with I(summary)
+    - A dict in the format selected by I(result_encoding), unless it is C(list)
+  type: raw
+  returned: unless queries is set
   sample: [/opt/error.log, /opt/access.log]
+files:
+  description: Metadata of the files in I(found), in the same order.  I(blocks) is in 512 byte units.
+  type: list
+  elements: dict
+  returned: when get_stat is true and summary is false
+  sample: [{path: /var/log/lastlog, size: 292292, blocks: 40, mtime: 1700000000.0, uid: 0, inode: 1234}]
+matched:
+  description: Number of matches, including those not returned in I(found)
+  type: int
+  returned: success, unless queries is set
+  sample: 2
+truncated:
+  description: Whether I(found) is missing some of the matches
+  type: bool
+  returned: success, unless queries is set
+  sample: false
+queries:
+  description: The results of every query by name, with the same keys as returned for a single search
+  type: dict
+  returned: when queries is set
+  sample: {logs: {found: [/var/log/syslog.log], matched: 1, truncated: false}, large: {found: [], matched: 0, truncated: false}}
+summary:
+  description: Number and total size in bytes of the matches per directory
+  type: dict
+  returned: when summary is true
+  sample: {/opt: {count: 2, bytes: 4096}}
+index:
+  description: Number of directories listed from the index (hits) and read from disk (misses), and directories evicted
+  type: dict
+  returned: when cache_dir is set
+  sample: {hits: 12000, misses: 42, evicted: 0}
+total_bytes:
+  description: Total size of all matches in bytes
+  type: int
+  returned: when summary is true
+  sample: 4096
+elapsed:
+  description: Duration of the search in seconds
+  type: float
+  returned: unless in check mode
+  sample: 12.5
+throttled:
+  description: Seconds the search waited because of I(max_rate), summed over all threads with I(parallelism)
+  type: float
+  returned: when max_rate is set, unless in check mode
+  sample: 8.2
+cmdline:
+  description: The find command line that was executed
+  type: list
+  returned: when engine is find
+  sample: [find, /opt, -name, "*.log", -print0]
 '''
 
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.adfinis.maintenance.plugins.module_utils.compact import ENCODINGS, encode
+from ansible_collections.adfinis.maintenance.plugins.module_utils.exclude import ExcludeMatcher
+from ansible_collections.adfinis.maintenance.plugins.module_utils.index import DirectoryIndex
+from ansible_collections.adfinis.maintenance.plugins.module_utils.results import FoundList, Summary, TopN
+from ansible_collections.adfinis.maintenance.plugins.module_utils.walk import Query, Walker, parse_allocated_size
 
 import os
-import re
 import subprocess
+import tempfile
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Values of the type option, mapped to the letters used by find -type
+TYPES = {
+    'file': 'f',
+    'block': 'b',
+    'char': 'c',
+    'directory': 'd',
+    'pipe': 'p',
+    'link': 'l',
+    'socket': 's',
+    'door': 'D',
+}
+
+
+def parse_types(types):
+    """
+    Convert the type option to find -type letters, or None if it is not set.
+    """
+    if types is None:
+        return None
+    if isinstance(types, str):
+        types = [types]
+    typeflags = []
+    for typ in types:
+        if typ not in TYPES:
+            raise ValueError('Unknown type "{}"'.format(typ))
+        typeflags.append(TYPES[typ])
+    return typeflags
+
+
+def make_collector(params):
+    """
+    Return the collector for the output options in params, i.e. the module parameters or a query.
+    """
+    if sum([params['max_results'] is not None, params['top_n'] is not None, params['summary']]) > 1:
+        raise ValueError('max_results, top_n and summary are mutually exclusive')
+    if params['max_results'] is not None and params['max_results'] < 0:
+        raise ValueError('max_results must not be negative')
+    if params['top_n'] is not None and params['top_n'] < 1:
+        raise ValueError('top_n must be at least 1')
+    if params['summary']:
+        return Summary()
+    elif params['top_n'] is not None:
+        return TopN(params['top_n'], params['sort_by'], params['get_stat'])
+    return FoundList(params['max_results'], params['get_stat'])
+
+
+def search_paths(paths, prune):
+    """
+    Return the paths to pass to find.  Search paths below a pruned subtree must be removed from the cmdline, otherwise
+    they are not pruned.
+    """
+    result = []
+    for path in paths:
+        if path.startswith('-'):
+            path = './' + path
+        pruned = False
+        for p in prune:
+            abspath = os.path.abspath(p)
+            if os.path.commonprefix([os.path.abspath(path), abspath]) == abspath:
+                pruned = True
+                break
+        if not pruned:
+            result.append(path)
+    return result
+
+
+def diff_lines(result):
+    if 'summary' in result:
+        return ''.join('{}: {} files, {} bytes\n'.format(directory, summary['count'], summary['bytes'])
+                       for directory, summary in result['summary'].items())
+    return '\n'.join(result['found']) + '\n'
+
+
+def run_queries(module, result, index):
+    """
+    Evaluate all queries during a single walk, and return their results by name.
+    """
+    names = []
+    queries = []
+    collectors = []
+    for params in module.params['queries']:
+        if params['name'] in names:
+            module.fail_json(msg='Duplicate query name "{}"'.format(params['name']), **result)
+        prune = params['prune'] if params['prune'] is not None else module.params['prune']
+        try:
+            query = Query(
+                pattern=params['pattern'],
+                prune=prune,
+                types=parse_types(params['type']),
+                xdev=params['xdev'] if params['xdev'] is not None else module.params['xdev'],
+                follow=params['follow'] if params['follow'] is not None else module.params['follow'],
+                size=params['size'],
+                age=params['age'],
+                exclude=params['exclude'],
+                allocated_size=params['allocated_size'],
+                paths=search_paths(params['paths'], prune),
+            )
+            collectors.append(make_collector(params))
+        except ValueError as e:
+            module.fail_json(msg='Query "{}": {}'.format(params['name'], e), **result)
+        names.append(params['name'])
+        queries.append(query)
+
+    walker = Walker(
+        queries=queries,
+        parallelism=module.params['parallelism'],
+        with_stat=any(collector.needs_stat for collector in collectors),
+        index=index,
+        max_rate=module.params['max_rate'],
+    )
+    if not module.check_mode:
+        walker.walk_queries([collector.add for collector in collectors],
+                            any(collector.ordered for collector in collectors))
+    return walker, dict((name, collector.result()) for name, collector in zip(names, collectors))
+
+
+class FindProcess:
+    """
+    Run find and iterate over the paths it prints, without buffering its entire output.
+    """
+
+    def __init__(self, cmdline):
+        # stderr goes to a file, so find can't block on a full stderr pipe while stdout is read
+        self.stderr = tempfile.TemporaryFile()
+        self.proc = subprocess.Popen(cmdline, stdout=subprocess.PIPE, stderr=self.stderr)
+
+    def __iter__(self):
+        rest = b''
+        for chunk in iter(lambda: self.proc.stdout.read(65536), b''):
+            paths = (rest + chunk).split(b'\0')
+            rest = paths.pop()
+            for path in paths:
+                yield path.decode('utf-8')
+        self.proc.wait()
+
+    @property
+    def returncode(self):
+        return self.proc.returncode
+
+    def errors(self):
+        self.stderr.seek(0)
+        return self.stderr.read().decode('utf-8')
+
+
+def run_find(module, result, paths, typeflags, collector):
+    expression = []
+    for path in module.params['prune']:
+        expression.append('-path')
+        expression.append(path)
+        expression.append('-prune')
+        expression.append('-o')
+
+    # -name must come after the prune expressions, otherwise it only applies to the first -prune instead of the output
+    if module.params['pattern'] is not None:
+        expression.append('-name')
+        expression.append(module.params['pattern'])
+
+    if module.params['xdev']:
+        expression.append('-xdev')
+
+    if typeflags is not None:
+        expression.append('-type')
+        expression.append(','.join(typeflags))
+
+    if module.params['size'] is not None:
+        expression.append('-size')
+        expression.append(module.params['size'])
+
+    if module.params['age'] is not None:
+        expression.append('-mmin')
+        expression.append(module.params['age'])
+
+    expression.append('-print0')
+
+    prefix = [module.params['find']]
+    if module.params['follow']:
+        prefix.append('-L')
+    result['cmdline'] = prefix + paths + expression
+
+    if module.check_mode:
+        result['found'] = encode([], module.params['result_encoding'])
+        module.exit_json(**result)
+
+    # All exclude patterns are compiled into one matcher, instead of matching every path against each of them
+    exclude = ExcludeMatcher(module.params['exclude']).match
+    errors = []
+    # find has no predicate for the allocated size, so it needs to be checked here
+    allocated_size = None
+    if module.params['allocated_size'] is not None:
+        try:
+            allocated_size = parse_allocated_size(module.params['allocated_size'])
+        except ValueError as e:
+            module.fail_json(msg=str(e), **result)
+
+    def matches(proc):
+        for found in proc:
+            if exclude(found) is not None:
+                continue
+            st = None
+            if collector.needs_stat or allocated_size is not None:
+                try:
+                    st = os.stat(found, follow_symlinks=module.params['follow'])
+                except OSError:
+                    try:
+                        st = os.lstat(found)
+                    except OSError as e:
+                        errors.append("'{}': {}\n".format(found, e.strerror))
+                        continue
+                if allocated_size is not None and not allocated_size(st):
+                    continue
+            yield found, st
+
+    # Run the find command, or one find command per path in parallel.  The paths are independent of each other, so
+    # this yields exactly the same output.
+    if module.params['parallelism'] > 1 and len(paths) > 1:
+        cmdlines = [prefix + [path] + expression for path in paths]
+    else:
+        cmdlines = [result['cmdline']]
+
+    if len(cmdlines) == 1:
+        procs = [FindProcess(cmdlines[0])]
+        for found, st in matches(procs[0]):
+            collector.add(found, st)
+    else:
+        lock = threading.Lock()
+
+        def run(cmdline):
+            proc = FindProcess(cmdline)
+            if collector.ordered:
+                return proc, list(matches(proc))
+            for found, st in matches(proc):
+                with lock:
+                    collector.add(found, st)
+            return proc, []
+
+        with ThreadPoolExecutor(max_workers=module.params['parallelism']) as pool:
+            outputs = list(pool.map(run, cmdlines))
+        procs = [proc for proc, _ in outputs]
+        for _, items in outputs:
+            for found, st in items:
+                collector.add(found, st)
+
+    if any(proc.returncode != 0 for proc in procs) or errors:
+        result['stderr'] = ''.join(proc.errors() for proc in procs) + ''.join(errors)
+        module.fail_json(msg='find process exited with non-zero returncode.  Run with -vvv to view stderr', **result)
+
+
+def set_idle_io(module):
+    """
+    Move the module into the idle I/O scheduling class.  Threads and processes started afterwards inherit it.
+    """
+    ionice = module.get_bin_path('ionice')
+    if ionice is None:
+        module.warn('ionice not found, searching with the default I/O priority')
+        return
+    rc, stdout, stderr = module.run_command([ionice, '-c', '3', '-p', str(os.getpid())])
+    if rc != 0:
+        module.warn('Could not set the idle I/O priority: {}'.format(stderr.strip() or stdout.strip()))
+
+
+def finish_walk(module, result, walker, index, started):
+    """
+    Save the index (unless in check mode), record how long the walk took, and fail if the native walk ran into errors.
+    """
+    if not module.check_mode:
+        result['elapsed'] = round(time.monotonic() - started, 3)
+        if walker.throttle is not None:
+            result['throttled'] = round(walker.throttle.slept, 3)
+    if index is not None:
+        if not module.check_mode:
+            try:
+                index.save()
+            except OSError as e:
+                module.warn('Could not save the index to {}: {}'.format(index.path, e))
+        result['index'] = dict(hits=index.hits, misses=index.misses, evicted=index.evicted)
+    if walker.errors:
+        result['stderr'] = '\n'.join(walker.errors)
+        module.fail_json(msg='Errors occurred while walking the file system.  Run with -vvv to view stderr', **result)
 
 
 def run_module():
     # define available arguments/parameters a user can pass to the module
     module_args = dict(
         pattern=dict(type='str', required=False),
-        paths=dict(type='list', required=True),
+        paths=dict(type='list', required=False, default=None),
         prune=dict(type='list', required=False, default=[]),
         type=dict(type='str', required=False, default=None),
         xdev=dict(type='bool', required=False, default=False),
@@ -118,6 +743,39 @@ def run_module():
         exclude=dict(type='list', required=False, default=[]),
         find=dict(type='str', required=False, default='find'),
         follow=dict(type='bool', required=False, default=False),
+        engine=dict(type='str', required=False, default='find', choices=['find', 'native']),
+        parallelism=dict(type='int', required=False, default=1),
+        max_results=dict(type='int', required=False, default=None),
+        top_n=dict(type='int', required=False, default=None),
+        sort_by=dict(type='str', required=False, default='size', choices=['size', 'mtime']),
+        summary=dict(type='bool', required=False, default=False),
+        allocated_size=dict(type='str', required=False, default=None),
+        get_stat=dict(type='bool', required=False, default=False),
+        cache_dir=dict(type='path', required=False, default=None),
+        cache_size=dict(type='int', required=False, default=1000000),
+        max_rate=dict(type='int', required=False, default=0),
+        idle_io=dict(type='bool', required=False, default=False),
+        fadvise=dict(type='bool', required=False, default=False),
+        queries=dict(type='list', elements='dict', required=False, default=None, options=dict(
+            name=dict(type='str', required=True),
+            paths=dict(type='list', elements='str', required=True),
+            pattern=dict(type='str', required=False, default=None),
+            type=dict(type='list', elements='str', required=False, default=None),
+            prune=dict(type='list', elements='str', required=False, default=None),
+            xdev=dict(type='bool', required=False, default=None),
+            follow=dict(type='bool', required=False, default=None),
+            size=dict(type='str', required=False, default=None),
+            allocated_size=dict(type='str', required=False, default=None),
+            age=dict(type='str', required=False, default=None),
+            exclude=dict(type='list', elements='str', required=False, default=[]),
+            max_results=dict(type='int', required=False, default=None),
+            top_n=dict(type='int', required=False, default=None),
+            sort_by=dict(type='str', required=False, default='size', choices=['size', 'mtime']),
+            summary=dict(type='bool', required=False, default=False),
+            get_stat=dict(type='bool', required=False, default=False),
+        )),
+        result_encoding=dict(type='str', required=False, default='list', choices=ENCODINGS),
+        return_diff=dict(type='bool', required=False, default=True),
     )
 
     # seed the result dict in the object
@@ -136,109 +794,95 @@ def run_module():
     module = AnsibleModule(
         argument_spec=module_args,
         supports_check_mode=True,
+        required_one_of=[('paths', 'queries')],
+        mutually_exclusive=[('queries', option) for option in (
+            'paths', 'pattern', 'type', 'size', 'allocated_size', 'age', 'exclude', 'max_results', 'top_n', 'sort_by',
+            'summary', 'get_stat')],
     )
 
-    cmdline = [module.params['find']]
-    if module.params['follow']:
-        cmdline.append('-L')
-    for path in module.params['paths']:
-        if path.startswith('-'):
-            path = './' + path
-        # Search paths below a pruned subtree must be removed from the cmdline, otherwise they are not pruned.
-        prune = False
-        for p in module.params['prune']:
-            abspath = os.path.abspath(p)
-            if os.path.commonprefix([os.path.abspath(path), abspath]) == abspath:
-                prune = True
-                break
-        if not prune:
-            cmdline.append(path)
-
-    if module.params['pattern'] is not None:
-        cmdline.append('-name')
-        cmdline.append(module.params['pattern'])
-
-    for path in module.params['prune']:
-        cmdline.append('-path')
-        cmdline.append(path)
-        cmdline.append('-prune')
-        cmdline.append('-o')
-
-    if module.params['xdev']:
-        cmdline.append('-xdev')
-
-    if module.params['type'] is not None:
-        types = module.params['type']
-        if isinstance(types, str):
-            types = [types]
-        typeflags = []
-        for typ in types:
-            if typ == 'file':
-                typeflags.append('f')
-            elif typ == 'block':
-                typeflags.append('b')
-            elif typ == 'char':
-                typeflags.append('c')
-            elif typ == 'directory':
-                typeflags.append('d')
-            elif typ == 'pipe':
-                typeflags.append('p')
-            elif typ == 'link':
-                typeflags.append('l')
-            elif typ == 'socket':
-                typeflags.append('s')
-            elif typ == 'door':
-                typeflags.append('D')
-            else:
-                module.fail_json(msg='Unknown type "{}"'.format(typ), **result)
-        cmdline.append('-type')
-        cmdline.append(','.join(typeflags))
-
-    if module.params['size'] is not None:
-        cmdline.append('-size')
-        cmdline.append(module.params['size'])
-
-    if module.params['age'] is not None:
-        cmdline.append('-mmin')
-        cmdline.append(module.params['age'])
-
-    cmdline.append('-print0')
-
-    result['cmdline'] = cmdline
-
-    if module.check_mode:
-        result['found'] = []
+    if module.params['parallelism'] < 1:
+        module.fail_json(msg='parallelism must be at least 1', **result)
+
+    if module.params['cache_dir'] is not None and module.params['engine'] != 'native':
+        module.fail_json(msg='cache_dir requires engine=native', **result)
+    if module.params['queries'] is not None and module.params['engine'] != 'native':
+        module.fail_json(msg='queries requires engine=native', **result)
+    if module.params['max_rate'] < 0:
+        module.fail_json(msg='max_rate must not be negative', **result)
+    if module.params['max_rate'] > 0 and module.params['engine'] != 'native':
+        module.fail_json(msg='max_rate requires engine=native', **result)
+
+    started = time.monotonic()
+    if module.params['idle_io'] and not module.check_mode:
+        set_idle_io(module)
+
+    index = None
+    if module.params['cache_dir'] is not None:
+        index = DirectoryIndex(
+            os.path.join(module.params['cache_dir'], 'find-index.json.gz'),
+            module.params['cache_size'],
+            module.params['fadvise'],
+        )
+        index.load()
+
+    if module.params['queries'] is not None:
+        walker, result['queries'] = run_queries(module, result, index)
+        finish_walk(module, result, walker, index, started)
+        result['changed'] = any(r['matched'] > 0 for r in result['queries'].values())
+        if module.params['return_diff']:
+            result['diff'] = [{
+                'before': '',
+                'after': ''.join('# {}\n{}'.format(name, diff_lines(r)) for name, r in result['queries'].items()),
+            }]
+        for r in result['queries'].values():
+            r['found'] = encode(r['found'], module.params['result_encoding'])
         module.exit_json(**result)
 
-    # Run the find command
-    findproc = subprocess.Popen(cmdline, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    out, err = findproc.communicate()
-
-    if findproc.returncode != 0:
-        result['stderr'] = err.decode('utf-8')
-        module.fail_json(msg='find process exited with non-zero returncode.  Run with -vvv to view stderr', **result)
-
-    result['found'] = []
-    # Compile regex patterns for faster search
-    patterns = [re.compile(p) for p in module.params['exclude']]
-    
-    for found in out.split(b'\0'):
-        found = found.decode('utf-8')
-        if len(found) == 0:
-            continue
-        exclude = False
-        for pattern in patterns:
-            if pattern.match(found) is not None:
-                exclude = True
-                break
-        if not exclude:
-            result['found'].append(found)
-
-    result['changed'] = len(result['found']) > 0
-    result['diff'] = [{
-        'before': '',
-        'after': '\n'.join(result['found']) + '\n',
-    }]
+    try:
+        collector = make_collector(module.params)
+        typeflags = parse_types(module.params['type'])
+    except ValueError as e:
+        module.fail_json(msg=str(e), **result)
+    paths = search_paths(module.params['paths'], module.params['prune'])
+
+    if module.params['engine'] == 'native':
+        try:
+            walker = Walker(
+                pattern=module.params['pattern'],
+                prune=module.params['prune'],
+                types=typeflags,
+                xdev=module.params['xdev'],
+                size=module.params['size'],
+                age=module.params['age'],
+                follow=module.params['follow'],
+                exclude=module.params['exclude'],
+                parallelism=module.params['parallelism'],
+                with_stat=collector.needs_stat,
+                allocated_size=module.params['allocated_size'],
+                index=index,
+                max_rate=module.params['max_rate'],
+            )
+        except ValueError as e:
+            module.fail_json(msg=str(e), **result)
+
+        if module.check_mode:
+            result['found'] = encode([], module.params['result_encoding'])
+            module.exit_json(**result)
+
+        walker.walk_into(paths, collector.add, collector.ordered)
+        finish_walk(module, result, walker, index, started)
+    else:
+        run_find(module, result, paths, typeflags, collector)
+        result['elapsed'] = round(time.monotonic() - started, 3)
+
+    result.update(collector.result())
+    result['changed'] = result['matched'] > 0
+    if module.params['return_diff']:
+        result['diff'] = [{
+            'before': '',
+            'after': diff_lines(result),
+        }]
+    result['found'] = encode(result['found'], module.params['result_encoding'])
     # in the event of a successful module execution, you will want to
     # simple AnsibleModule.exit_json(), passing the key/value results
     module.exit_json(**result)
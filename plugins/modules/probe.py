@@ -0,0 +1,210 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+DOCUMENTATION = r'''
+---
+module: probe
+
+short_description: Run read-only commands and cache their output on the target
+
+# version_added describes the collection version in which this module was added, don't adjust this value
+version_added: "0.1.0"
+
+description:
+  - Run a set of named commands (probes), e.g. C(systemctl show) or C(apachectl -V), and return their output.
+  - The output is cached in I(cache_file) on the target, and reused by later tasks and runs as long as it is younger
+    than its TTL, and none of the input files of the probe changed (by mtime and size).  Probes are thus only run once
+    per host and run, even if several roles ask for them.
+  - Probes are run in check mode as well, so they must not change anything.  The cache is read in check mode, but
+    only written with I(save_in_check_mode).
+  - Only the output of successful probes (exit status 0) is cached.
+
+options:
+    probes:
+        description: The probes to run.
+        required: true
+        type: list
+        elements: dict
+        suboptions:
+            name:
+                description:
+                  - Name the output is cached and returned under.  The cache is shared by all roles, so the name should
+                    be prefixed with the name of the service, e.g. C(apache_modules).
+                required: true
+                type: str
+            argv:
+                description: Command to run, without shell.
+                required: true
+                type: list
+                elements: str
+            inputs:
+                description:
+                  - Files the output is derived from, e.g. unit and configuration files, or the binary that is run.
+                    Shell-style wildcards are expanded, and the output is run again if the set of matching files
+                    changes.
+                required: false
+                default: []
+                type: list
+                elements: path
+            ttl:
+                description: Maximum age of the cached output in seconds.  Defaults to I(ttl).
+                required: false
+                type: int
+    ttl:
+        description: Default maximum age of the cached outputs in seconds.
+        required: false
+        default: 3600
+        type: int
+    cache_file:
+        description: File on the target to cache the outputs in.  Set to an empty string to disable caching.
+        required: false
+        default: /var/lib/adfinis-maintenance/probes.json
+        type: path
+    save_in_check_mode:
+        description:
+          - Write the outputs of the probes that were run to I(cache_file) in check mode as well, e.g. for runs that
+            are always made with C(--check).
+        required: false
+        default: false
+        type: bool
+
+author:
+    - Adfinis AG (@adfinis)
+'''
+
+
+EXAMPLES = r'''
+- name: Which modules are loaded by apache?
+  adfinis.maintenance.probe:
+    probes:
+      - name: apache_modules
+        argv: [apachectl, -M]
+        inputs:
+          - /usr/sbin/apachectl
+          - /etc/apache2/apache2.conf
+          - /etc/apache2/mods-enabled/*.load
+  register: apache_probes
+'''
+
+
+RETURN = r'''
+probes:
+  description: Output of every probe by name
+  type: dict
+  returned: always
+  sample:
+    apache_modules:
+      rc: 0
+      stdout: "Loaded Modules:\n core_module (static)\n ssl_module (shared)"
+      stdout_lines:
+        - "Loaded Modules:"
+        - " core_module (static)"
+        - " ssl_module (shared)"
+      stderr: ""
+      cached: true
+      age: 42
+cache:
+  description: Number of probes whose output was taken from the cache and that had to be run
+  type: dict
+  returned: when cache_file is set
+  sample:
+    hits: 2
+    misses: 1
+'''
+
+
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.adfinis.maintenance.plugins.module_utils.probes import ProbeCache, input_state
+
+
+def run_module():
+    # define available arguments/parameters a user can pass to the module
+    module_args = dict(
+        probes=dict(type='list', elements='dict', required=True, options=dict(
+            name=dict(type='str', required=True),
+            argv=dict(type='list', elements='str', required=True),
+            inputs=dict(type='list', elements='path', required=False, default=[]),
+            ttl=dict(type='int', required=False, default=None),
+        )),
+        ttl=dict(type='int', required=False, default=3600),
+        cache_file=dict(type='path', required=False, default='/var/lib/adfinis-maintenance/probes.json'),
+        save_in_check_mode=dict(type='bool', required=False, default=False),
+    )
+
+    # seed the result dict in the object
+    # we primarily care about changed and state
+    # changed is if this module effectively modified the target
+    # state will include any data that you want your module to pass back
+    # for consumption, for example, in a subsequent task
+    result = dict(
+        changed=False,
+        probes={},
+    )
+
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True,
+    )
+
+    cache = ProbeCache(module.params['cache_file'] or None)
+    if cache.path is not None:
+        cache.load()
+
+    for probe in module.params['probes']:
+        if not probe['argv']:
+            module.fail_json(msg='Probe "{}": argv must not be empty'.format(probe['name']), **result)
+        ttl = probe['ttl'] if probe['ttl'] is not None else module.params['ttl']
+        inputs = input_state(probe['inputs'])
+        now = time.time()
+        output = cache.get(probe['name'], probe['argv'], inputs, now)
+        cached = output is not None
+        if not cached:
+            try:
+                rc, stdout, stderr = module.run_command(probe['argv'], expand_user_and_vars=False, handle_exceptions=False)
+            except OSError as e:
+                # Just like a shell would report it, e.g. if the command isn't installed
+                rc, stdout, stderr = 127, '', '{}: {}'.format(probe['argv'][0], e.strerror)
+            output = dict(rc=rc, stdout=stdout, stderr=stderr, time=now)
+            if rc == 0 and ttl > 0:
+                cache.set(probe['name'], probe['argv'], inputs, ttl, output)
+        result['probes'][probe['name']] = dict(
+            rc=output['rc'],
+            stdout=output['stdout'],
+            stdout_lines=output['stdout'].splitlines(),
+            stderr=output['stderr'],
+            cached=cached,
+            age=int(now - output['time']),
+        )
+
+    if not module.check_mode or module.params['save_in_check_mode']:
+        try:
+            cache.save(time.time())
+        except OSError as e:
+            module.warn('Could not save the cache to {}: {}'.format(cache.path, e))
+    if cache.path is not None:
+        result['cache'] = dict(hits=cache.hits, misses=cache.misses)
+
+    # in the event of a successful module execution, you will want to
+    # simple AnsibleModule.exit_json(), passing the key/value results
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,276 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+DOCUMENTATION = r'''
+---
+module: varnish_status
+
+short_description: Check the health of a running Varnish instance with a single snapshot
+
+# version_added describes the collection version in which this module was added, don't adjust this value
+version_added: "0.1.0"
+
+description:
+  - Take one snapshot of the Varnish counters (C(varnishstat -j)) and query the child status, the backends and the
+    VCLs in a single C(varnishadm) session, and derive all status indicators from them.
+  - Reports a problem if the child is not running, a backend is sick, or any of I(nonzero_counters) is not zero.
+  - Requires Varnish 6.0 or later, for the JSON output of C(varnishadm).
+
+options:
+    nonzero_counters:
+        description: Counters that indicate a problem if they are not zero, e.g. because the cache or the thread pools
+          overflowed.
+        required: false
+        default: [MAIN.n_lru_nuked, MAIN.sess_dropped, MAIN.threads_limited]
+        type: list
+        elements: str
+    instance:
+        description: Name of the Varnish instance (C(-n) option of varnishstat and varnishadm).
+        required: false
+        default: null
+        type: str
+    varnishstat:
+        description: Path to the varnishstat binary
+        required: false
+        default: varnishstat
+        type: str
+    varnishadm:
+        description: Path to the varnishadm binary
+        required: false
+        default: varnishadm
+        type: str
+
+author:
+    - Adfinis AG (@adfinis)
+'''
+
+
+EXAMPLES = r'''
+- name: Is varnish healthy?
+  adfinis.maintenance.varnish_status:
+  register: varnish_status
+'''
+
+
+RETURN = r'''
+child:
+  description: State of the child process, as reported by varnishadm status
+  type: str
+  returned: always
+  sample: running
+active_vcl:
+  description: Name of the active VCL
+  type: str
+  returned: always
+  sample: boot
+backends:
+  description: Health of each backend
+  type: dict
+  returned: always
+  sample:
+    boot.default: healthy
+    boot.legacy: sick
+hit_ratio:
+  description: Share of cache lookups that were hits since the start of the child, or null if there were none
+  type: float
+  returned: always
+  sample: 0.87
+uptime:
+  description: Uptime of the child in seconds
+  type: int
+  returned: always
+  sample: 1209600
+counters:
+  description: Values of the thread, session and overflow counters, and of I(nonzero_counters)
+  type: dict
+  returned: always
+  sample:
+    MAIN.threads: 200
+    MAIN.threads_limited: 0
+    MAIN.sess_dropped: 0
+    MAIN.n_lru_nuked: 12
+problems:
+  description: Problems found, one line per problem
+  type: list
+  returned: always
+  sample:
+    - "backend boot.legacy is sick"
+    - "MAIN.n_lru_nuked is 12"
+'''
+
+
+import json
+
+from ansible.module_utils.basic import AnsibleModule
+
+
+# Counters returned in any case, besides nonzero_counters
+COUNTERS = [
+    'MAIN.uptime',
+    'MAIN.cache_hit',
+    'MAIN.cache_miss',
+    'MAIN.threads',
+    'MAIN.threads_limited',
+    'MAIN.threads_failed',
+    'MAIN.thread_queue_len',
+    'MAIN.sess_queued',
+    'MAIN.sess_dropped',
+    'MAIN.sess_fail',
+    'MAIN.n_lru_nuked',
+]
+
+# Commands sent to varnishadm, in one session
+VARNISHADM_COMMANDS = 'status -j\nbackend.list -j\nvcl.list -j\n'
+
+
+def parse_counters(text):
+    """
+    Return the values of all counters in the output of varnishstat -j, as dict name -> value.
+    """
+    data = json.loads(text)
+    # Varnish 6.5 and later nest the counters in "counters", older versions put them at the top level
+    counters = data.get('counters', data)
+    return {name: counter['value'] for name, counter in counters.items()
+            if isinstance(counter, dict) and 'value' in counter}
+
+
+def parse_responses(text):
+    """
+    Return the JSON responses of varnishadm by command, e.g. {'status': [2, ['status', '-j'], 1700000000.0, 'running']}.
+    Anything but JSON responses (e.g. errors of commands that don't support -j) is skipped.
+    """
+    decoder = json.JSONDecoder()
+    responses = {}
+    pos = text.find('[')
+    while pos != -1:
+        try:
+            response, end = decoder.raw_decode(text, pos)
+        except ValueError:
+            pos = text.find('[', pos + 1)
+            continue
+        if isinstance(response, list) and len(response) >= 3 and isinstance(response[1], list) and response[1]:
+            responses[response[1][0]] = response
+        pos = text.find('[', end)
+    return responses
+
+
+def backend_health(backend):
+    """
+    Return the health of a backend in the output of backend.list -j: healthy or sick.
+    """
+    if backend.get('admin_health') in ('healthy', 'sick'):
+        # Forced with backend.set_health
+        return backend['admin_health']
+    message = backend.get('probe_message')
+    if isinstance(message, list) and message:
+        message = message[-1]
+    if not isinstance(message, str):
+        return 'healthy'
+    return 'healthy' if message.lower() == 'healthy' else 'sick'
+
+
+def run_module():
+    # define available arguments/parameters a user can pass to the module
+    module_args = dict(
+        nonzero_counters=dict(type='list', elements='str', required=False,
+                              default=['MAIN.n_lru_nuked', 'MAIN.sess_dropped', 'MAIN.threads_limited']),
+        instance=dict(type='str', required=False, default=None),
+        varnishstat=dict(type='str', required=False, default='varnishstat'),
+        varnishadm=dict(type='str', required=False, default='varnishadm'),
+    )
+
+    # seed the result dict in the object
+    # we primarily care about changed and state
+    # changed is if this module effectively modified the target
+    # state will include any data that you want your module to pass back
+    # for consumption, for example, in a subsequent task
+    result = dict(
+        changed=False,
+        child=None,
+        active_vcl=None,
+        backends={},
+        hit_ratio=None,
+        uptime=None,
+        counters={},
+        problems=[],
+    )
+
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True,
+    )
+
+    instance = ['-n', module.params['instance']] if module.params['instance'] else []
+    problems = result['problems']
+
+    rc, stdout, stderr = module.run_command([module.params['varnishstat'], '-j'] + instance)
+    if rc != 0:
+        problems.append('varnishstat failed: {}'.format(stderr.strip() or stdout.strip()))
+    else:
+        try:
+            counters = parse_counters(stdout)
+        except (ValueError, AttributeError) as e:
+            module.fail_json(msg='Could not parse the output of varnishstat -j: {}'.format(e), **result)
+        result['counters'] = {name: counters[name] for name in COUNTERS + module.params['nonzero_counters']
+                              if name in counters}
+        result['uptime'] = counters.get('MAIN.uptime')
+        lookups = counters.get('MAIN.cache_hit', 0) + counters.get('MAIN.cache_miss', 0)
+        if lookups > 0:
+            result['hit_ratio'] = round(counters['MAIN.cache_hit'] / lookups, 4)
+        for name in module.params['nonzero_counters']:
+            if name not in counters:
+                problems.append('{} does not exist'.format(name))
+            elif counters[name] != 0:
+                problems.append('{} is {}'.format(name, counters[name]))
+
+    rc, stdout, stderr = module.run_command([module.params['varnishadm']] + instance, data=VARNISHADM_COMMANDS)
+    responses = parse_responses(stdout)
+    if rc != 0 and not responses:
+        problems.append('varnishadm failed: {}'.format(stderr.strip() or stdout.strip()))
+    else:
+        for command in ('status', 'backend.list', 'vcl.list'):
+            if command not in responses:
+                problems.append('no JSON response to varnishadm {} -j'.format(command))
+        if 'status' in responses:
+            result['child'] = str(responses['status'][3]).strip() if len(responses['status']) > 3 else None
+            if result['child'] is None or 'running' not in result['child'].lower():
+                problems.append('child is not running ({})'.format(result['child']))
+        if 'backend.list' in responses and len(responses['backend.list']) > 3:
+            for name, backend in sorted(responses['backend.list'][3].items()):
+                result['backends'][name] = backend_health(backend)
+                if result['backends'][name] != 'healthy':
+                    problems.append('backend {} is {}'.format(name, result['backends'][name]))
+        if 'vcl.list' in responses:
+            for vcl in responses['vcl.list'][3:]:
+                if isinstance(vcl, dict) and vcl.get('status') == 'active':
+                    result['active_vcl'] = vcl.get('name')
+            if result['active_vcl'] is None:
+                problems.append('no active VCL')
+
+    result['changed'] = len(problems) > 0
+    result['diff'] = [{
+        'before': '',
+        'after': ''.join(problem + '\n' for problem in problems),
+    }]
+    # in the event of a successful module execution, you will want to
+    # simple AnsibleModule.exit_json(), passing the key/value results
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
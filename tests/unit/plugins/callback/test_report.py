@@ -0,0 +1,204 @@
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import json
+
+import pytest
+import yaml
+
+from ansible.executor.task_result import TaskResult
+from ansible.inventory.host import Host
+from ansible.plugins.callback import CallbackBase
+from ansible_collections.adfinis.maintenance.plugins.callback import report as report_plugin
+
+
+# The defaults of all options, which ansible would look up in its configuration
+DEFAULTS = {
+    name: option.get('default') for name, option in yaml.safe_load(report_plugin.DOCUMENTATION)['options'].items()
+}
+
+
+class _Task:
+    """
+    Stands in for ansible.playbook.task.Task, with the attributes the callback reads.
+    """
+
+    def __init__(self, uuid, taskid, name, todo=None):
+        self.vars = dict(name=name)
+        if taskid is not None:
+            self.vars['taskid'] = taskid
+        if todo is not None:
+            self.vars['todo'] = todo
+        self._uuid = uuid
+        self._parent = None
+        self.async_val = 0
+        self.ignore_unreachable = False
+        self.no_log = False
+
+
+class _Display:
+
+    def __init__(self):
+        self.lines = []
+
+    def display(self, msg, *args, **kwargs):
+        self.lines.append(msg)
+
+
+# (host, taskid, name, todo, outcome) in the order ansible-playbook reports them.  Subtasks of a taskid differ in their
+# name and todo flag, and the hosts don't run the same taskids in the same order.
+STREAM = [
+    ('web1', '10-017', 'Fstab: fstab correct? | Run findmnt', None, 'ok'),
+    ('web2', '10-017', 'Fstab: fstab correct? | Run findmnt', None, 'ok'),
+    ('web1', '10-017', 'Fstab: fstab correct? | Report findmnt results', None, 'changed'),
+    ('web2', '10-017', 'Fstab: fstab correct? | Report findmnt results', None, 'ok'),
+    ('web1', '10-034', 'Logrotate: Are there files | Compare', None, 'ok'),
+    ('web2', '10-034', 'Logrotate: Are there files | Compare', None, 'skipped'),
+    ('web1', '10-034', 'Logrotate: list all files not rotated.', None, 'ok'),
+    ('web2', '10-050', 'Mail: serverlogs', True, 'ok'),
+    ('web1', '10-050', 'Mail: serverlogs', True, 'ok'),
+    ('web1', '10-050', 'Mail: serverlogs | Report', None, 'ok'),
+    ('web2', '10-051', 'Mail: aliases.db', None, 'failed'),
+    ('web1', '10-051', 'Mail: aliases.db', True, 'skipped'),
+    ('db1', '10-051', 'Mail: aliases.db | Rebuild', None, 'ok'),
+    ('db1', '10-017', 'Fstab: fstab correct? | Run findmnt', None, 'failed'),
+]
+
+
+def reference_checklist(stream):
+    """
+    The checklist as the callback printed it before the states were kept in compact arrays: the worst state per host
+    and taskid, in the order each host reported its taskids, with the name and todo flag of the subtask reported last.
+    """
+    states = dict(skipped=0, ok=1, changed=2, failed=3)
+    hosts, names, todo = {}, {}, {}
+    for host, taskid, name, flag, outcome in stream:
+        tasks = hosts.setdefault(host, {})
+        tasks[taskid] = max(tasks.get(taskid, 0), states[outcome])
+        names[taskid] = name.split('|', 1)[0].strip()
+        todo[taskid] = flag
+    lines = []
+    for host, tasks in hosts.items():
+        lines += ['', host]
+        for taskid, state in tasks.items():
+            mark = '~' if state == 0 else 'x' if state == 1 and not todo[taskid] else ' '
+            lines.append('- [%s] %s: %s' % (mark, taskid, names[taskid]))
+    return lines
+
+
+@pytest.fixture
+def new_callback(monkeypatch):
+    def set_options(self, task_keys=None, var_options=None, direct=None):
+        self._plugin_options = dict(DEFAULTS, **(direct or {}))
+    monkeypatch.setattr(CallbackBase, 'set_options', set_options)
+
+    def new(**options):
+        callback = report_plugin.CallbackModule()
+        callback.set_options(direct=options)
+        callback._display = _Display()
+        return callback
+    return new
+
+
+def feed(callback, stream):
+    hosts = {}
+    for i, (host, taskid, name, todo, outcome) in enumerate(stream):
+        host = hosts.setdefault(host, Host(host))
+        task = _Task(str(i), taskid, name, todo)
+        callback.v2_runner_on_start(host, task)
+        result = TaskResult(host, task, dict(changed=outcome == 'changed', failed=outcome == 'failed'), {})
+        if outcome == 'skipped':
+            callback.v2_runner_on_skipped(result)
+        elif outcome == 'failed':
+            callback.v2_runner_on_failed(result, ignore_errors=True)
+        elif outcome == 'unreachable':
+            callback.v2_runner_on_unreachable(result)
+        else:
+            callback.v2_runner_on_ok(result)
+
+
+@pytest.fixture
+def report(new_callback):
+    def run(stream, **options):
+        callback = new_callback(**options)
+        feed(callback, stream)
+        callback.v2_playbook_on_stats(None)
+        return callback._display.lines
+    return run
+
+
+def test_checklist_matches_reference(report):
+    assert report(STREAM) == reference_checklist(STREAM)
+
+
+def test_checklist_uses_last_subtask(report):
+    lines = report(STREAM)
+    assert '- [x] 10-034: Logrotate: list all files not rotated.' in lines
+    # The last subtask of 10-050 on web1 isn't marked todo
+    assert '- [x] 10-050: Mail: serverlogs' in lines
+
+
+def test_checklist_order_per_host(report):
+    lines = report(STREAM)
+    web2 = lines[lines.index('web2') + 1:lines.index('db1') - 1]
+    assert [line.split(':')[0] for line in web2] == ['- [x] 10-017', '- [~] 10-034', '- [x] 10-050', '- [ ] 10-051']
+    assert lines[lines.index('db1') + 1:] == ['- [x] 10-051: Mail: aliases.db', '- [ ] 10-017: Fstab: fstab correct?']
+
+
+def test_output_file(report, tmp_path):
+    output_file = str(tmp_path / 'report.jsonl')
+    report(STREAM, output_file=output_file, checklist=False)
+    with open(output_file) as f:
+        records = [json.loads(line) for line in f]
+    hosts = {record['host']: record for record in records if record['type'] == 'host'}
+    assert list(hosts['db1']['tasks'].items()) == [('10-051', 'ok'), ('10-017', 'failed')]
+    assert hosts['web1']['action_required'] == ['10-017']
+    assert hosts['web2']['action_required'] == ['10-051']
+    summary = {record['taskid']: record for record in records if record['type'] == 'summary'}
+    assert [summary['10-017'][state] for state in ['ok', 'changed', 'failed', 'skipped']] == [1, 1, 1, 0]
+    assert summary['10-034']['name'] == 'Logrotate: list all files not rotated.'
+
+
+def test_durations_of_tasks_with_taskid_only(new_callback):
+    callback = new_callback()
+    feed(callback, [
+        ('web1', None, 'Gathering Facts', None, 'ok'),
+        ('web1', 'ignore-me', 'bar', None, 'ok'),
+        ('web1', '10-017', 'Fstab: fstab correct? | Run findmnt', None, 'ok'),
+        ('web2', '10-017', 'Fstab: fstab correct? | Run findmnt', None, 'unreachable'),
+    ])
+    assert callback.running == {}
+    assert list(callback._durations('web1')) == ['10-017']
+    assert callback._durations('web2') == {}
+
+
+def read_records(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_output_file_written_per_play(new_callback, tmp_path):
+    output_file = str(tmp_path / 'report.jsonl')
+    callback = new_callback(output_file=output_file)
+    callback.v2_playbook_on_play_start(None)
+    feed(callback, [
+        ('web1', '10-017', 'Fstab: fstab correct?', None, 'ok'),
+        ('web2', '10-017', 'Fstab: fstab correct?', None, 'changed'),
+    ])
+    assert read_records(output_file) == []
+    # The next batch of serial, the hosts of the first one are done
+    callback.v2_playbook_on_play_start(None)
+    assert [record['host'] for record in read_records(output_file)] == ['web1', 'web2']
+    feed(callback, [
+        ('db1', '10-017', 'Fstab: fstab correct?', None, 'ok'),
+        ('web1', '10-034', 'Logrotate: list all files not rotated.', None, 'changed'),
+    ])
+    callback.v2_playbook_on_stats(None)
+    hosts = [record for record in read_records(output_file) if record['type'] == 'host']
+    assert [record['host'] for record in hosts] == ['web1', 'web2', 'web1', 'db1']
+    # A host with results after it was written is written again, with all its results
+    assert hosts[2]['tasks'] == {'10-017': 'ok', '10-034': 'changed'}
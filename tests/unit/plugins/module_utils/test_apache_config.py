@@ -0,0 +1,119 @@
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import os
+
+import pytest
+
+from ansible_collections.adfinis.maintenance.plugins.module_utils.apache_config import ApacheConfig, read_envvars
+
+
+@pytest.fixture
+def root(tmp_path):
+    def write(name, content):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        return str(path)
+    write.root = str(tmp_path)
+    return write
+
+
+def load(root, content, **kwargs):
+    return ApacheConfig(root('apache2.conf', content), directives=['ErrorLog', 'CustomLog'], **kwargs)
+
+
+def test_include_glob_in_order(root):
+    root('sites-enabled/b.conf', 'CustomLog /var/log/b.log combined\n')
+    root('sites-enabled/a.conf', 'CustomLog /var/log/a.log combined\n')
+    root('sites-enabled/README', 'CustomLog /var/log/readme.log combined\n')
+    config = load(root, 'ErrorLog /var/log/error.log\nIncludeOptional sites-enabled/*.conf\n')
+    assert config.paths('CustomLog') == ['/var/log/a.log', '/var/log/b.log']
+    assert config.files == [root.root + p for p in ['/apache2.conf', '/sites-enabled/a.conf', '/sites-enabled/b.conf']]
+    assert config.errors == []
+
+
+def test_include_directory(root):
+    root('conf.d/b/2.conf', 'CustomLog b2.log common\n')
+    root('conf.d/a.conf', 'CustomLog a.log common\n')
+    root('conf.d/b/1.conf', 'CustomLog b1.log common\n')
+    config = load(root, 'Include conf.d\n')
+    # Relative paths are resolved against the ServerRoot, which defaults to the directory of the configuration
+    assert config.paths('CustomLog') == [root.root + p for p in ['/a.log', '/b1.log', '/b2.log']]
+
+
+def test_include_missing(root):
+    config = load(root, 'Include missing.conf\nInclude missing/*.conf\nIncludeOptional optional.conf\n')
+    assert config.errors == [
+        "'{}': No such file or directory".format(os.path.join(root.root, 'missing.conf')),
+        "Include '{}' matches no files".format(os.path.join(root.root, 'missing/*.conf')),
+    ]
+
+
+def test_include_glob_matches_nothing(root):
+    root('conf.d/README', '')
+    assert load(root, 'IncludeOptional conf.d/*.conf\n').errors == []
+    assert load(root, 'Include conf.d/*.conf\n').errors == \
+        ["Include '{}' matches no files".format(os.path.join(root.root, 'conf.d/*.conf'))]
+
+
+def test_include_read_once(root):
+    root('common.conf', 'ErrorLog /var/log/error.log\nInclude apache2.conf\n')
+    os.symlink('common.conf', os.path.join(root.root, 'link.conf'))
+    config = load(root, 'Include common.conf\nInclude link.conf\n')
+    assert config.values['errorlog'] == [['/var/log/error.log']]
+    assert config.files == [root.root + p for p in ['/apache2.conf', '/common.conf']]
+    assert config.errors == []
+
+
+def test_server_root_and_variables(root):
+    root('etc/httpd/conf.d/vhost.conf', 'CustomLog ${LOGS}/${SITE}_access.log combined\n')
+    config = load(
+        root,
+        'ServerRoot ' + root.root + '/etc/httpd\n'
+        'Define LOGS /srv/logs\n'
+        'Include conf.d/*.conf\n'
+        'ErrorLog ${APACHE_LOG_DIR}/error.log\n',
+        env=dict(APACHE_LOG_DIR='/var/log/apache2'),
+    )
+    assert config.server_root == root.root + '/etc/httpd'
+    # Undefined variables are kept
+    assert config.paths('CustomLog') == ['/srv/logs/${SITE}_access.log']
+    assert config.paths('ErrorLog') == ['/var/log/apache2/error.log']
+
+
+def test_paths_skips_pipes_and_syslog(root):
+    config = load(root, 'ErrorLog syslog:local1\nCustomLog "|/usr/bin/rotatelogs /var/log/%Y.log" combined\n'
+                        'CustomLog /var/log/access.log combined\nCustomLog /var/log/access.log vhost\n')
+    assert config.paths('ErrorLog') == []
+    assert config.paths('CustomLog') == ['/var/log/access.log']
+
+
+def test_continued_lines_and_sections(root):
+    config = load(root, '<VirtualHost *:80>\n    CustomLog \\\n        /var/log/vhost.log combined\n</VirtualHost>\n')
+    assert config.values['customlog'] == [['/var/log/vhost.log', 'combined']]
+
+
+def test_read_envvars(root):
+    path = root('envvars', '\n'.join([
+        'unset HOME',
+        'if [ "${APACHE_CONFDIR##/etc/apache2-}" != "${APACHE_CONFDIR}" ] ; then',
+        '    SUFFIX="-${APACHE_CONFDIR##/etc/apache2-}"',
+        'else',
+        '    SUFFIX=',
+        'fi',
+        'export APACHE_RUN_USER=www-data',
+        ': ${APACHE_LOG_DIR:=/ignored}',
+        'export APACHE_LOG_DIR=/var/log/apache2$SUFFIX',
+        'export APACHE_PID_FILE=${APACHE_RUN_DIR:-/var/run/apache2}/apache2.pid  # comment',
+        '',
+    ]))
+    assert read_envvars(path) == dict(
+        APACHE_RUN_USER='www-data',
+        APACHE_LOG_DIR='/var/log/apache2',
+        APACHE_PID_FILE='/var/run/apache2/apache2.pid',
+    )
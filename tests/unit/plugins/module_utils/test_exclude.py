@@ -0,0 +1,121 @@
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import re
+
+import pytest
+
+from ansible_collections.adfinis.maintenance.plugins.module_utils.exclude import ExcludeMatcher, literal_prefix
+
+
+PATTERNS = [
+    '/var/lib/docker/',
+    '/var/lib/dockerd.log',
+    '/boot/vmlinuz',
+    '/boot/initrd.*',
+    '/boot/initramfs',
+    '/var/log/journal/.*',
+    r'/var/lib/mysql/.*\.ibd$',
+    '.*/node_modules/',
+    r'/srv/(\w+)/backup/\1\.tar$',
+    '/home/[^/]+/.cache/',
+    '(?P<dir>/opt)/app/',
+    '(?P<dir>/usr)/share/doc/',
+]
+
+PATHS = [
+    '/var/lib/docker/overlay2/abc/diff/big',
+    '/var/lib/docker',
+    '/var/lib/dockerd.log',
+    '/var/lib/dockerd.log.1',
+    '/var/lib/dockerX',
+    '/boot/vmlinuz-6.1.0',
+    '/boot/initrd.img-6.1.0',
+    '/boot/initramfs-6.1.0.img',
+    '/boot/grub/grub.cfg',
+    '/var/log/journal/abc/system.journal',
+    '/var/log/journal',
+    '/var/lib/mysql/db/table.ibd',
+    '/var/lib/mysql/db/table.ibd.bak',
+    '/srv/www/node_modules/left-pad/index.js',
+    '/srv/shop/backup/shop.tar',
+    '/srv/shop/backup/www.tar',
+    '/home/alice/.cache/thumbnails/x.png',
+    '/home/alice/.config/x',
+    '/opt/app/data',
+    '/usr/share/doc/README',
+    '/usr/share/man/man1/ls.1.gz',
+]
+
+
+def naive(patterns, path):
+    return any(re.match(pattern, path) is not None for pattern in patterns)
+
+
+@pytest.mark.parametrize('path', PATHS)
+def test_match_same_as_one_by_one(path):
+    assert (ExcludeMatcher(PATTERNS).match(path) is not None) == naive(PATTERNS, path)
+
+
+@pytest.mark.parametrize('count', range(len(PATTERNS) + 1))
+def test_match_subsets(count):
+    matcher = ExcludeMatcher(PATTERNS[:count])
+    assert bool(matcher) == (count > 0)
+    for path in PATHS:
+        assert (matcher.match(path) is not None) == naive(PATTERNS[:count], path), path
+
+
+@pytest.mark.parametrize('directory, prunes', [
+    ('/var/lib/docker', True),
+    ('/var/lib/docker/overlay2', True),
+    ('/var/lib', False),
+    ('/var/log/journal', True),
+    # Only the .ibd files below are excluded
+    ('/var/lib/mysql', False),
+    ('/srv/www/node_modules', True),
+    ('/home/alice/.cache', True),
+    ('/home/alice', False),
+    # Backreferences aren't combined, and never prune
+    ('/srv/shop/backup', False),
+    ('/opt/app', True),
+    ('/usr/share/doc', True),
+])
+def test_prunes(directory, prunes):
+    assert ExcludeMatcher(PATTERNS).prunes(directory) == prunes
+
+
+def test_prunes_only_what_is_matched():
+    matcher = ExcludeMatcher(PATTERNS)
+    # Every path below a pruned directory is excluded
+    for path in PATHS:
+        directory = path.rsplit('/', 1)[0]
+        if matcher.prunes(directory):
+            assert matcher.match(path) is not None, path
+
+
+def test_invalid_pattern():
+    with pytest.raises(re.error):
+        ExcludeMatcher(['/var/log/(unbalanced'])
+
+
+def test_empty():
+    matcher = ExcludeMatcher([])
+    assert not matcher
+    assert matcher.match('/var/log/syslog') is None
+    assert not matcher.prunes('/var/log')
+
+
+@pytest.mark.parametrize('pattern, literal, rest', [
+    ('/var/lib/docker/.*', '/var/lib/docker/', '.*'),
+    (r'/var/lib/mysql/.*\.ibd$', '/var/lib/mysql/', r'.*\.ibd$'),
+    (r'/boot/vmlinuz\-', '/boot/vmlinuz-', ''),
+    ('/var/logs?/', '/var/log', 's?/'),
+    (r'/srv/\w+/', '/srv/', r'\w+/'),
+    ('(?:/a|/b)', '', '(?:/a|/b)'),
+])
+def test_literal_prefix(pattern, literal, rest):
+    assert literal_prefix(pattern) == (literal, rest)
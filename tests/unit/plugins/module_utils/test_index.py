@@ -0,0 +1,79 @@
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import os
+import time
+
+import pytest
+
+from ansible_collections.adfinis.maintenance.plugins.module_utils import index as index_module
+from ansible_collections.adfinis.maintenance.plugins.module_utils.index import DirectoryIndex
+from ansible_collections.adfinis.maintenance.plugins.module_utils.walk import Walker
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """
+    20 directories with a file each.
+    """
+    root = tmp_path / 'tree'
+    directories = [root] + [root / 'd{:02}'.format(i) for i in range(19)]
+    for directory in directories:
+        directory.mkdir()
+        (directory / 'f.log').write_text('')
+    return str(root)
+
+
+def walk(tree, index, parallelism=1):
+    return sorted(path for path, _ in Walker(pattern='*.log', index=index, parallelism=parallelism).walk([tree]))
+
+
+def new_index(tmp_path):
+    index = DirectoryIndex(str(tmp_path / 'cache' / 'find-index.json.gz'))
+    # As if the walk started a minute later, otherwise the directories were modified too recently to be indexed
+    index.started += 60 * 10 ** 9
+    index.load()
+    return index
+
+
+@pytest.mark.parametrize('parallelism', [1, 8])
+def test_index(tree, tmp_path, parallelism):
+    expected = walk(tree, None)
+    index = new_index(tmp_path)
+    assert walk(tree, index, parallelism) == expected
+    assert (index.hits, index.misses) == (0, 20)
+    index.save()
+    index = new_index(tmp_path)
+    assert walk(tree, index, parallelism) == expected
+    assert (index.hits, index.misses) == (20, 0)
+
+
+def test_index_changed_directory(tree, tmp_path):
+    index = new_index(tmp_path)
+    walk(tree, index)
+    index.save()
+    os.utime(os.path.join(tree, 'd07'), (time.time() - 3600,) * 2)
+    index = new_index(tmp_path)
+    walk(tree, index)
+    assert (index.hits, index.misses) == (19, 1)
+
+
+def test_index_entry_type_unknown(tree, tmp_path, monkeypatch):
+    dtype = index_module._dtype
+
+    def failing_dtype(entry):
+        # The entry was removed between reading the directory and looking up its type
+        if entry.path == os.path.join(tree, 'd03', 'f.log'):
+            raise FileNotFoundError(2, 'No such file or directory')
+        return dtype(entry)
+    monkeypatch.setattr(index_module, '_dtype', failing_dtype)
+    index = new_index(tmp_path)
+    walker = Walker(pattern='*.log', index=index)
+    assert len(list(walker.walk([tree]))) == 20
+    assert walker.errors == []
+    # Only that directory isn't indexed
+    assert len(index.directories) == 19
@@ -0,0 +1,70 @@
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import itertools
+import os
+
+import pytest
+
+from ansible_collections.adfinis.maintenance.plugins.module_utils.results import FoundList, Summary, TopN
+
+
+def stat(size=0, mtime=0):
+    return os.stat_result((0o100644, 1, 1, 1, 0, 0, size, mtime, mtime, mtime))
+
+
+MATCHES = [
+    ('/var/log/c', stat(10)),
+    ('/var/log/a', stat(20)),
+    ('/var/log/e', stat(10)),
+    ('/var/log/b', stat(10)),
+    ('/var/log/d', stat(5)),
+]
+
+
+@pytest.mark.parametrize('matches', list(itertools.permutations(MATCHES)))
+def test_top_n_ties_keep_smaller_paths(matches):
+    top = TopN(3)
+    for path, st in matches:
+        top.add(path, st)
+    result = top.result()
+    assert result['found'] == ['/var/log/a', '/var/log/b', '/var/log/c']
+    assert result['matched'] == 5
+    assert result['truncated']
+
+
+def test_top_n_matches_sort_order():
+    top = TopN(len(MATCHES), sort_by='size', with_stat=True)
+    for path, st in MATCHES:
+        top.add(path, st)
+    expected = sorted(MATCHES, key=lambda match: (-match[1].st_size, match[0]))
+    assert top.result()['found'] == [path for path, _ in expected]
+    assert [f['size'] for f in top.result()['files']] == [20, 10, 10, 10, 5]
+
+
+def test_top_n_duplicate_paths():
+    top = TopN(2, with_stat=True)
+    top.add('/var/log/a', stat(10))
+    top.add('/var/log/a', stat(10))
+    top.add('/var/log/a', stat(10))
+    assert top.result()['found'] == ['/var/log/a', '/var/log/a']
+
+
+def test_found_list_limit():
+    found = FoundList(2)
+    for path, st in MATCHES:
+        found.add(path, st)
+    assert found.result() == dict(found=['/var/log/c', '/var/log/a'], matched=5, truncated=True)
+
+
+def test_summary():
+    summary = Summary()
+    for path, st in MATCHES + [('/var/tmp/x', stat(1))]:
+        summary.add(path, st)
+    result = summary.result()
+    assert result['summary'] == {'/var/log': dict(count=5, bytes=55), '/var/tmp': dict(count=1, bytes=1)}
+    assert result['total_bytes'] == 56
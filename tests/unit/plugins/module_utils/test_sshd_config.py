@@ -0,0 +1,144 @@
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import collections
+
+import pytest
+
+from ansible_collections.adfinis.maintenance.plugins.module_utils import sshd_config
+from ansible_collections.adfinis.maintenance.plugins.module_utils.sshd_config import SshdConfig, Unsupported
+
+
+Pwdent = collections.namedtuple('Pwdent', ['pw_name', 'pw_gid'])
+
+GROUPS = {
+    'root': ['root'],
+    'alice': ['alice', 'admins'],
+    'bob': ['bob', 'users'],
+    'svc-web': ['svc'],
+    'svc-db': ['svc', 'db'],
+}
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    monkeypatch.setattr(sshd_config, 'SSHDIR', str(tmp_path))
+    monkeypatch.setattr(SshdConfig, '_groups', lambda self, pwdent: GROUPS[pwdent.pw_name])
+
+    def write(content, name='sshd_config'):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        return str(path)
+
+    def effective(content, user):
+        return SshdConfig(write(content)).effective(Pwdent(user, 0))['authorizedkeysfile']
+    effective.write = write
+    return effective
+
+
+def test_defaults(config):
+    assert config('PasswordAuthentication no\n', 'root') == ['.ssh/authorized_keys', '.ssh/authorized_keys2']
+
+
+def test_first_global_value_wins(config):
+    content = 'AuthorizedKeysFile .ssh/authorized_keys\nAuthorizedKeysFile /etc/ssh/keys/%u\n'
+    assert config(content, 'root') == ['.ssh/authorized_keys']
+
+
+def test_keyword_syntax(config):
+    assert config('  authorizedkeysfile=".ssh/my keys" /etc/ssh/keys/%u # comment\n', 'root') == \
+        ['.ssh/my keys', '/etc/ssh/keys/%u']
+
+
+CONFIG = '''
+AuthorizedKeysFile .ssh/authorized_keys
+Match User svc-*
+    AuthorizedKeysFile /etc/ssh/keys/%u
+Match User svc-*,!svc-db
+    AuthorizedKeysFile /etc/ssh/web/%u
+Match Group admins
+    AuthorizedKeysFile /etc/ssh/admins/%u
+Match Group !users,svc
+    AuthorizedKeysFile /etc/ssh/svc/%u
+Match All
+    AuthorizedKeysFile /etc/ssh/all/%u
+'''
+
+
+@pytest.mark.parametrize('user, expected', [
+    # The first matching Match block wins over the global value
+    ('svc-web', '/etc/ssh/keys/%u'),
+    ('svc-db', '/etc/ssh/keys/%u'),
+    ('alice', '/etc/ssh/admins/%u'),
+    # Excluded from the Group block by the negated pattern
+    ('bob', '/etc/ssh/all/%u'),
+    ('root', '/etc/ssh/all/%u'),
+])
+def test_match(config, user, expected):
+    assert config(CONFIG, user) == [expected]
+
+
+@pytest.mark.parametrize('user, expected', [
+    ('svc-web', '/etc/ssh/web/%u'),
+    # A negated pattern excludes the user, even if another pattern of the list matches
+    ('svc-db', '.ssh/authorized_keys'),
+    ('alice', '.ssh/authorized_keys'),
+])
+def test_match_negated_user(config, user, expected):
+    content = 'AuthorizedKeysFile .ssh/authorized_keys\n' \
+        'Match User svc-*,!svc-db\n' \
+        '    AuthorizedKeysFile /etc/ssh/web/%u\n'
+    assert config(content, user) == [expected]
+
+
+def test_match_all_criteria(config):
+    content = 'Match User svc-* Group db\n    AuthorizedKeysFile /etc/ssh/db/%u\n'
+    assert config(content, 'svc-db') == ['/etc/ssh/db/%u']
+    assert config(content, 'svc-web') == ['.ssh/authorized_keys', '.ssh/authorized_keys2']
+
+
+def test_match_unsupported(config):
+    content = 'Match Address 10.0.0.0/8\n    AuthorizedKeysFile /etc/ssh/internal/%u\n'
+    with pytest.raises(Unsupported):
+        config(content, 'root')
+
+
+def test_match_unsupported_not_evaluated(config):
+    # The User criterion already rules the block out, so the Address criterion doesn't matter
+    content = 'Match User svc-* Address 10.0.0.0/8\n    AuthorizedKeysFile /etc/ssh/internal/%u\n'
+    assert config(content, 'root') == ['.ssh/authorized_keys', '.ssh/authorized_keys2']
+    with pytest.raises(Unsupported):
+        config(content, 'svc-web')
+
+
+def test_include(config):
+    config.write('AuthorizedKeysFile /etc/ssh/included/%u\n', 'sshd_config.d/10-keys.conf')
+    config.write('Match User alice\n    AuthorizedKeysFile /etc/ssh/alice\n', 'sshd_config.d/20-alice.conf')
+    content = 'Include sshd_config.d/*.conf\nAuthorizedKeysFile .ssh/authorized_keys\n'
+    assert config(content, 'root') == ['/etc/ssh/included/%u']
+    assert config(content, 'alice') == ['/etc/ssh/alice']
+
+
+def test_include_ends_match_block(config):
+    # A Match block in an included file ends with the file
+    config.write('Match User alice\n    AuthorizedKeysFile /etc/ssh/alice\n', 'sshd_config.d/alice.conf')
+    content = 'Include sshd_config.d/alice.conf\nAuthorizedKeysFile /etc/ssh/global/%u\n'
+    assert config(content, 'root') == ['/etc/ssh/global/%u']
+
+
+def test_include_in_match_block(config):
+    config.write('AuthorizedKeysFile /etc/ssh/svc/%u\n', 'svc.conf')
+    content = 'Match User svc-*\n    Include svc.conf\n'
+    assert config(content, 'svc-web') == ['/etc/ssh/svc/%u']
+    assert config(content, 'root') == ['.ssh/authorized_keys', '.ssh/authorized_keys2']
+
+
+def test_include_loop(config):
+    config.write('Include loop.conf\n', 'loop.conf')
+    with pytest.raises(Unsupported):
+        config('Include loop.conf\n', 'root')
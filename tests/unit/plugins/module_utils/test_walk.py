@@ -0,0 +1,171 @@
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import os
+import shutil
+import stat
+import subprocess
+
+import pytest
+
+from ansible_collections.adfinis.maintenance.plugins.module_utils.walk import Query, Walker
+
+
+def make_tree(root, files):
+    for name in files:
+        path = os.path.join(str(root), name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w'):
+            pass
+
+
+def find(args):
+    """
+    Matches of find(1) for args, in the order it prints them, regardless of its exit status.
+    """
+    proc = subprocess.run(['find'] + args + ['-print0'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    return proc.stdout.decode('utf-8').split('\0')[:-1]
+
+
+def walk(paths, **kwargs):
+    return [path for path, _ in Walker(**kwargs).walk(paths)]
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = str(tmp_path)
+    make_tree(root, ['a.log', 'b.txt', 'sub/c.log', 'sub/deep/d.log', 'sub/deep/e.dat', 'skip/f.log', 'other/g.log'])
+    with open(os.path.join(root, 'sub', 'big.log'), 'wb') as f:
+        f.write(b'x' * 3 * 1024 * 1024)
+    os.symlink(os.path.join(root, 'sub'), os.path.join(root, 'link'))
+    os.symlink(root, os.path.join(root, 'sub', 'loop'))
+    return root
+
+
+needs_find = pytest.mark.skipif(shutil.which('find') is None, reason='find is not installed')
+
+
+@needs_find
+@pytest.mark.parametrize('kwargs, args', [
+    (dict(), []),
+    (dict(pattern='*.log'), ['-name', '*.log']),
+    (dict(types=['f']), ['-type', 'f']),
+    (dict(types=['d', 'l']), ['(', '-type', 'd', '-o', '-type', 'l', ')']),
+    (dict(size='+1M'), ['-size', '+1M']),
+    (dict(pattern='*.log', prune=['*/skip']), ['-path', '*/skip', '-prune', '-o', '-name', '*.log']),
+])
+def test_walk_same_as_find(tree, kwargs, args):
+    expected = find([tree] + args)
+    assert walk([tree], **kwargs) == expected
+    assert sorted(walk([tree], parallelism=4, **kwargs)) == sorted(expected)
+
+
+@needs_find
+def test_walk_follow_loop(tree):
+    walker = Walker(pattern='*.log', follow=True)
+    found = [path for path, _ in walker.walk([tree])]
+    assert found == find(['-L', tree, '-name', '*.log'])
+    assert len(walker.errors) == 2
+    assert all('File system loop detected' in error for error in walker.errors)
+
+
+def test_walk_exclude_prunes_directories(tree, monkeypatch):
+    scanned = []
+    scandir = os.scandir
+
+    def tracking_scandir(path):
+        scanned.append(path)
+        return scandir(path)
+    monkeypatch.setattr(os, 'scandir', tracking_scandir)
+    found = walk([tree], pattern='*.log', exclude=[tree + '/sub/', '.*/other/g\\.log$'])
+    assert sorted(found) == [tree + p for p in ['/a.log', '/skip/f.log']]
+    assert tree + '/sub' not in scanned
+    # Only the match is excluded, the directory is still read
+    assert tree + '/other' in scanned
+
+
+def test_walk_with_stat(tree):
+    found = dict(Walker(pattern='big.log', with_stat=True).walk([tree]))
+    assert found[tree + '/sub/big.log'].st_size == 3 * 1024 * 1024
+
+
+def test_walk_missing_start_point(tmp_path):
+    walker = Walker()
+    assert list(walker.walk([str(tmp_path / 'missing')])) == []
+    assert len(walker.errors) == 1
+
+
+def walk_queries(queries, parallelism=1, ordered=True):
+    found = [[] for _ in queries]
+    adds = [lambda path, st, i=i: found[i].append(path) for i in range(len(queries))]
+    Walker(queries=queries, parallelism=parallelism).walk_queries(adds, ordered)
+    return found
+
+
+@pytest.mark.parametrize('parallelism, ordered', [(1, True), (4, True), (4, False)])
+def test_walk_queries_nested_start_points(tmp_path, parallelism, ordered):
+    make_tree(tmp_path, ['a', 'x/b', 'x/y/c', 'x/y/z/f'])
+    root = str(tmp_path)
+    found = walk_queries([
+        Query(paths=[root], pattern='?'),
+        Query(paths=[root + '/x/y'], pattern='?'),
+        Query(paths=[root + '/x/y/z'], pattern='?'),
+    ], parallelism, ordered)
+    # The inner start points are walked as part of the outer one, and every match is returned once per query
+    assert sorted(found[0]) == [root + p for p in ['/a', '/x', '/x/b', '/x/y', '/x/y/c', '/x/y/z', '/x/y/z/f']]
+    assert sorted(found[1]) == [root + p for p in ['/x/y', '/x/y/c', '/x/y/z', '/x/y/z/f']]
+    assert sorted(found[2]) == [root + p for p in ['/x/y/z', '/x/y/z/f']]
+
+
+@pytest.mark.parametrize('parallelism, ordered', [(1, True), (4, True), (4, False)])
+def test_walk_queries_nested_pruned_start_points(tmp_path, parallelism, ordered):
+    make_tree(tmp_path, ['x/y/z/f'])
+    root = str(tmp_path)
+    found = walk_queries([
+        Query(paths=[root], prune=[root + '/x']),
+        Query(paths=[root + '/x/y']),
+        Query(paths=[root + '/x/y/z']),
+    ], parallelism, ordered)
+    assert found[0] == [root]
+    assert found[1] == [root + '/x/y', root + '/x/y/z', root + '/x/y/z/f']
+    assert found[2] == [root + '/x/y/z', root + '/x/y/z/f']
+
+
+def test_walk_queries_start_point_pruned_twice(tmp_path):
+    make_tree(tmp_path, ['x/y/z/f'])
+    root = str(tmp_path)
+    found = walk_queries([
+        Query(paths=[root], prune=[root + '/x']),
+        Query(paths=[root + '/x/y'], prune=[root + '/x/y/z']),
+        Query(paths=[root + '/x/y/z']),
+    ])
+    assert found == [[root], [root + '/x/y'], [root + '/x/y/z', root + '/x/y/z/f']]
+
+
+@pytest.mark.parametrize('parallelism, ordered', [(1, True), (4, True), (4, False)])
+def test_walk_queries_follow_per_query(tree, parallelism, ordered):
+    found = walk_queries([
+        Query(paths=[tree], pattern='*.log', follow=True),
+        Query(paths=[tree], pattern='*.log'),
+        Query(paths=[tree + '/link'], types=['d']),
+    ], parallelism, ordered)
+    # Each query returns the same as a walk of its own
+    assert sorted(found[0]) == sorted(walk([tree], pattern='*.log', follow=True))
+    assert sorted(found[1]) == sorted(walk([tree], pattern='*.log'))
+    assert found[2] == []
+    assert tree + '/link/c.log' in found[0]
+    assert tree + '/link/c.log' not in found[1]
+
+
+def test_walk_queries_stat_per_query(tree):
+    found = [{}, {}]
+    Walker(queries=[
+        Query(paths=[tree], pattern='link', follow=True),
+        Query(paths=[tree], pattern='link'),
+    ], with_stat=True).walk_queries([found[0].__setitem__, found[1].__setitem__])
+    assert stat.S_ISDIR(found[0][tree + '/link'].st_mode)
+    assert stat.S_ISLNK(found[1][tree + '/link'].st_mode)
@@ -0,0 +1,33 @@
+# Copyright: (c) 2026, Adfinis AG <support@adfinis.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+import pytest
+
+from ansible_collections.adfinis.maintenance.plugins.modules.find import make_collector
+
+
+def params(**kwargs):
+    result = dict(max_results=None, top_n=None, sort_by='size', summary=False, get_stat=False)
+    result.update(kwargs)
+    return result
+
+
+@pytest.mark.parametrize('options, message', [
+    (dict(top_n=0), 'top_n must be at least 1'),
+    (dict(top_n=-1), 'top_n must be at least 1'),
+    (dict(max_results=-1), 'max_results must not be negative'),
+    (dict(top_n=1, summary=True), 'max_results, top_n and summary are mutually exclusive'),
+])
+def test_make_collector_invalid(options, message):
+    with pytest.raises(ValueError, match=message):
+        make_collector(params(**options))
+
+
+def test_make_collector_max_results_zero():
+    collector = make_collector(params(max_results=0))
+    collector.add('/var/log/a', None)
+    assert collector.result() == dict(found=[], matched=1, truncated=True)